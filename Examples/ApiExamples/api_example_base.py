@@ -127,13 +127,9 @@ class ApiExampleBase(unittest.TestCase):
 
         :param filename: Local file system filename of the image file."""
 
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-
-        raise Exception("The image from \"" + filename + "\" does not contain any transparency.")
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception("The image from \"" + filename + "\" does not contain any transparency.")
 
     def verify_web_response_status_code(self, expected_http_status_code: int, web_address: str):
         """Checks whether an HTTP request sent to the specified address produces an expected web response.
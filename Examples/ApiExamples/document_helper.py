@@ -3,6 +3,7 @@
 # This file is part of Aspose.Words. The source code in this file
 # is only intended as a supplement to the documentation, and is provided
 # "as is", without warranty of any kind, either expressed or implied.
+from typing import Optional
 import aspose.words as aw
 from api_example_base import ApiExampleBase, TEMP_DIR
 
@@ -1143,4 +1144,35 @@ class DocumentHelper(ApiExampleBase):
         for module in doc.vba_project.modules:
             if module.name == module_name:
                 return module
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def create_merge_source(text: str, heading_size: float, custom_style_size: Optional[float] = None) -> aw.Document:
+        """Create a document with a heading and a numbered list, to be merged with other such documents.
+
+        :param text: Text of the heading.
+        :param heading_size: Font size of the "Heading 1" style of the document.
+        :param custom_style_size: Font size of the "Custom" style. If given, a paragraph with this style is added before the heading."""
+        builder = aw.DocumentBuilder()
+        builder.document.styles.get_by_name('Heading 1').font.size = heading_size
+        if custom_style_size is not None:
+            builder.document.styles.add(aw.StyleType.PARAGRAPH, 'Custom').font.size = custom_style_size
+            builder.paragraph_format.style_name = 'Custom'
+            builder.writeln(f'{text} custom style.')
+        builder.paragraph_format.style_identifier = aw.StyleIdentifier.HEADING1
+        builder.writeln(text)
+        builder.paragraph_format.style_identifier = aw.StyleIdentifier.NORMAL
+        builder.list_format.apply_number_default()
+        builder.writeln('List item.')
+        builder.writeln('List item.')
+        return builder.document
+
+    @staticmethod
+    def get_merge_summary(doc: aw.Document) -> tuple:
+        """Get the numbers of styles, lists and sections, and the text, style, style font size and list label of every paragraph.
+
+        :param doc: Merged document. Its list labels are updated."""
+        doc.update_list_labels()
+        paragraphs = [(paragraph.get_text(), paragraph.paragraph_format.style_name, paragraph.paragraph_format.style.font.size, paragraph.list_label.label_string)
+                      for paragraph in map(aw.Node.as_paragraph, doc.get_child_nodes(aw.NodeType.PARAGRAPH, True))]
+        return doc.styles.count, doc.lists.count, doc.sections.count, paragraphs
\ No newline at end of file
@@ -20,6 +20,7 @@ import aspose.words.notes
 import aspose.words.saving
 import datetime
 import document_helper
+import field_dependency_helper
 import io
 import system_helper
 import test_util
@@ -154,6 +155,88 @@ class ExField(ApiExampleBase):
                     self.assertTrue(field.is_dirty)
             #ExEnd
 
+    def test_field_dependency_graph(self):
+        # Only the fields whose inputs changed since the last update are updated again, and the graph tells why.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc=doc)
+        doc.built_in_document_properties.author = 'John Doe'
+        builder.start_bookmark('Name')
+        builder.write('Jane')
+        builder.end_bookmark('Name')
+        builder.writeln()
+        ref = builder.insert_field(field_code=' REF Name ')
+        builder.writeln()
+        author = builder.insert_field(field_code=' DOCPROPERTY "Author" ')
+        builder.writeln()
+        sequence = []
+        for _ in range(3):
+            builder.write('Figure ')
+            sequence.append(builder.insert_field(field_code=' SEQ Figure '))
+            builder.writeln()
+        builder.write('Page count: ')
+        num_pages = builder.insert_field(field_code=' NUMPAGES ')
+        graph = field_dependency_helper.FieldDependencyGraph(doc)
+        # The first update updates all fields, the next one has nothing to update.
+        self.assertEqual(doc.range.fields.count, graph.update_fields())
+        self.assertEqual(0, graph.update_fields())
+        self.assertEqual([' REF Name '], [field.get_field_code() for field in graph.get_dependents((field_dependency_helper.BOOKMARK, 'Name'))])
+        self.assertEqual([' NUMPAGES '], [field.get_field_code() for field in graph.get_dependents((field_dependency_helper.LAYOUT,))])
+        # A changed document property updates the DOCPROPERTY field only, the pages of the document stay the same.
+        doc.built_in_document_properties.author = 'John & Jane Doe'
+        self.assertEqual(1, graph.update_fields())
+        self.assertEqual('John & Jane Doe', author.result)
+        self.assertEqual(["document property 'Author' changed"], graph.explain(author))
+        self.assertEqual([], graph.explain(num_pages))
+        self.assertEqual([], graph.explain(ref))
+        # A new page updates the NUMPAGES field.
+        builder.insert_break(aw.BreakType.PAGE_BREAK)
+        self.assertEqual(1, graph.update_fields())
+        self.assertEqual('2', num_pages.result)
+        self.assertEqual(['page layout changed'], graph.explain(num_pages))
+        # A changed bookmark updates the fields that refer to it.
+        doc.range.bookmarks.get_by_name('Name').text = 'John'
+        graph.update_fields()
+        self.assertEqual('John', ref.result)
+        self.assertEqual(["bookmark 'Name' changed"], graph.explain(ref))
+        self.assertEqual([], graph.explain(author))
+        # A new SEQ field renumbers the SEQ fields with the same identifier.
+        builder.move_to(sequence[0].start)
+        builder.insert_field(field_code=' SEQ Figure ')
+        builder.write(', ')
+        graph.update_fields()
+        self.assertEqual(['2', '3', '4'], [field.result for field in sequence])
+        self.assertEqual(["order of the 'figure' sequence changed"], graph.explain(sequence[2]))
+        expected_doc = doc.clone(True).as_document()
+        expected_doc.update_fields()
+        self.assertEqual(expected_doc.get_text(), doc.get_text())
+        # A copy of a field is a new field, the field it was copied from is not updated.
+        doc.first_section.body.append_child(ref.start.parent_node.clone(True))
+        self.assertEqual(1, graph.update_fields())
+        self.assertEqual(['the field is new'], graph.explain(list(doc.range.fields)[-1]))
+        self.assertEqual([], graph.explain(ref))
+        # All fields can still be updated at once.
+        self.assertEqual(doc.range.fields.count, graph.update_fields(changed_only=False))
+        self.assertEqual(['all fields are updated'], graph.explain(ref))
+
+    def test_field_dependency_graph_moved_sequence(self):
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc=doc)
+        sequence = []
+        for caption in ['A', 'B', 'C']:
+            builder.write('Figure ')
+            sequence.append(builder.insert_field(field_code=' SEQ Figure '))
+            builder.writeln(f' {caption}')
+        graph = field_dependency_helper.FieldDependencyGraph(doc)
+        graph.update_fields()
+        # Moving the paragraph of the last SEQ field to the top renumbers all of them, though no field code changed.
+        body = doc.first_section.body
+        body.prepend_child(body.paragraphs[2])
+        self.assertEqual(3, graph.update_fields())
+        self.assertEqual(['1', '2', '3'], [field.result for field in doc.range.fields])
+        self.assertEqual(['2', '3', '1'], [field.result for field in sequence])
+        self.assertEqual(["order of the 'figure' sequence changed"], graph.explain(sequence[2]))
+        self.assertEqual(0, graph.update_fields())
+
     def test_insert_field_with_field_builder_exception(self):
         doc = aw.Document()
         run = document_helper.DocumentHelper.insert_new_run(doc, ' Hello World!', 0)
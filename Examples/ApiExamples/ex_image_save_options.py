@@ -12,9 +12,10 @@ import aspose.pydrawing
 import aspose.words as aw
 import aspose.words.saving
 import system_helper
+import image_helper
 import test_util
 import unittest
-from api_example_base import ApiExampleBase, ARTIFACTS_DIR, IMAGE_DIR, MY_DIR
+from api_example_base import ApiExampleBase, ARTIFACTS_DIR, GOLDS_DIR, IMAGE_DIR, MY_DIR
 
 class ExImageSaveOptions(ApiExampleBase):
 
@@ -401,4 +402,73 @@ class ExImageSaveOptions(ApiExampleBase):
         doc.save(file_name=ARTIFACTS_DIR + 'ImageSaveOptions.Resolution.300dpi.png', save_options=options)
         #ExEnd
         test_util.TestUtil.verify_image(612, 792, ARTIFACTS_DIR + 'ImageSaveOptions.Resolution.72dpi.png')
-        test_util.TestUtil.verify_image(2550, 3300, ARTIFACTS_DIR + 'ImageSaveOptions.Resolution.300dpi.png')
\ No newline at end of file
+        test_util.TestUtil.verify_image(2550, 3300, ARTIFACTS_DIR + 'ImageSaveOptions.Resolution.300dpi.png')
+
+    def test_verify_images_in_directory(self):
+        # Checks dimensions, transparency and perceptual hashes of a whole directory of rendered pages at once.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc=doc)
+        builder.writeln('Page 1.')
+        builder.insert_break(aw.BreakType.PAGE_BREAK)
+        builder.writeln('Page 2.')
+        builder.insert_image(file_name=IMAGE_DIR + 'Logo.jpg')
+        output_dir = ARTIFACTS_DIR + 'ImageSaveOptions.VerifyImages/'
+        os.makedirs(output_dir, exist_ok=True)
+        options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+        options.paper_color = aspose.pydrawing.Color.transparent
+        for i in range(doc.page_count):
+            options.page_set = aw.saving.PageSet(page=i)
+            doc.save(output_dir + f'Page.{i + 1}.png', options)
+        infos = image_helper.ImageHelper.verify_images(output_dir, pattern='Page.*.png', expected_width=816, expected_height=1056, contains_transparency=True)
+        self.assertEqual(2, len(infos))
+        self.assertNotEqual(infos[0].perceptual_hash, infos[1].perceptual_hash)
+        test_util.TestUtil.verify_image_contains_transparency(infos[0].filename)
+        # Rendering a page again produces the same hash, a different page does not.
+        options.page_set = aw.saving.PageSet(page=1)
+        doc.save(output_dir + 'Page.2.png', options)
+        expected_hashes = {'Page.2.png': infos[1].perceptual_hash}
+        image_helper.ImageHelper.verify_images(output_dir, pattern='Page.2.png', expected_hashes=expected_hashes)
+        with self.assertRaises(AssertionError):
+            image_helper.ImageHelper.verify_images(output_dir, pattern='Page.1.png', expected_hashes={'Page.1.png': infos[1].perceptual_hash})
+        with self.assertRaises(Exception):
+            test_util.TestUtil.verify_image_contains_transparency(IMAGE_DIR + 'Logo.jpg')
+        with self.assertRaises(ValueError):
+            image_helper.ImageHelper.contains_transparency()
+        with self.assertRaises(ValueError):
+            with open(IMAGE_DIR + 'Logo.jpg', 'rb') as stream:
+                image_helper.ImageHelper.contains_transparency(filename=IMAGE_DIR + 'Logo.jpg', image_stream=stream)
+
+    def test_compare_with_golds(self):
+        # Compares rendered pages with gold images tile by tile and saves heatmaps of the pages that differ.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc=doc)
+        builder.writeln('Page 1.')
+        builder.insert_break(aw.BreakType.PAGE_BREAK)
+        builder.writeln('Page 2.')
+        builder.insert_image(file_name=IMAGE_DIR + 'Logo.jpg')
+        comparer = image_helper.GoldenImageComparer(GOLDS_DIR, heatmap_dir=ARTIFACTS_DIR)
+        results = comparer.verify_pages('ImageSaveOptions.CompareWithGolds', doc=doc)
+        self.assertEqual(2, len(results))
+        # The same pages saved to a multi-page TIFF image match the golds.
+        doc.save(ARTIFACTS_DIR + 'ImageSaveOptions.CompareWithGolds.tiff')
+        comparer.verify_pages('ImageSaveOptions.CompareWithGolds', filename=ARTIFACTS_DIR + 'ImageSaveOptions.CompareWithGolds.tiff')
+        builder.writeln('This paragraph is not in the gold image.')
+        results = comparer.compare_pages('ImageSaveOptions.CompareWithGolds', doc=doc)
+        self.assertTrue(results[0].passed)
+        self.assertFalse(results[1].passed)
+        self.assertGreater(len(results[1].tiles), 0)
+        self.assertEqual(ARTIFACTS_DIR + 'ImageSaveOptions.CompareWithGolds.2.Heatmap.png', results[1].heatmap_file)
+        self.verify_image(816, 1056, filename=results[1].heatmap_file)
+        with self.assertRaises(AssertionError):
+            comparer.verify_pages('ImageSaveOptions.CompareWithGolds', doc=doc)
+        # A missing gold image can be created from the page, but the comparison fails until the new gold is checked.
+        golds_dir = ARTIFACTS_DIR + 'ImageSaveOptions.CompareWithGolds/'
+        for filename in glob.glob(golds_dir + '*.png'):
+            os.remove(filename)
+        comparer = image_helper.GoldenImageComparer(golds_dir, create_missing_golds=True)
+        results = comparer.compare_pages('Page', doc=doc)
+        self.assertTrue(all(result.created and not result.passed for result in results))
+        self.assertTrue(os.path.exists(golds_dir + 'Page.2 Gold.png'))
+        comparer.verify_pages('Page', doc=doc)
+        with self.assertRaises(ValueError):
+            next(image_helper.GoldenImageComparer.rasterize())
\ No newline at end of file
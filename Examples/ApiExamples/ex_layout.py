@@ -8,6 +8,7 @@
 import unittest
 import aspose.words as aw
 import aspose.words.layout
+import layout_helper
 from api_example_base import ApiExampleBase, ARTIFACTS_DIR, MY_DIR
 
 class ExLayout(ApiExampleBase):
@@ -188,4 +189,120 @@ class ExLayout(ApiExampleBase):
             print(f'{tabs}   Rectangle dimensions {le_rect.width}x{le_rect.height}, X={le_rect.x} Y={le_rect.y}')
             print(f'{tabs}   Page {layout_enumerator.page_index}')
         #ExEnd
-        layout_enumerator_example()
\ No newline at end of file
+        layout_enumerator_example()
+
+    def test_layout_index_incremental_update(self):
+        # Keep page indexes of the paragraphs between edits and refresh only the ones that could have changed.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        layout_index = layout_helper.LayoutIndex(doc, aw.NodeType.PARAGRAPH)
+        paragraphs = doc.get_child_nodes(aw.NodeType.PARAGRAPH, True)
+        self.assertEqual(doc.page_count, layout_index.page_count)
+        # Change a paragraph in the middle of the document and add a few paragraphs after it.
+        edited_paragraph = paragraphs[paragraphs.count // 2].as_paragraph()
+        edited_paragraph.append_child(aw.Run(doc, ' Edited.'))
+        layout_index.invalidate(edited_paragraph)
+        for i in range(3):
+            inserted_paragraph = aw.Paragraph(doc)
+            inserted_paragraph.append_child(aw.Run(doc, f'Inserted paragraph {i}.'))
+            edited_paragraph.parent_node.insert_after(inserted_paragraph, edited_paragraph)
+            layout_index.invalidate(inserted_paragraph)
+        # Paragraphs before the edit are not queried again, and neither are the ones after pagination settles.
+        queried = layout_index.update()
+        self.assertLess(queried, paragraphs.count)
+        # The answers are the same as the ones of a layout collector that queries every paragraph.
+        layout_collector = aw.layout.LayoutCollector(doc)
+        doc.update_page_layout()
+        self.assertEqual(doc.page_count, layout_index.page_count)
+        for paragraph in paragraphs:
+            self.assertEqual(layout_collector.get_start_page_index(paragraph), layout_index.get_start_page_index(paragraph))
+            self.assertEqual(layout_collector.get_end_page_index(paragraph), layout_index.get_end_page_index(paragraph))
+            self.assertEqual(layout_collector.get_num_pages_spanned(paragraph), layout_index.get_num_pages_spanned(paragraph))
+
+    def test_layout_index_update_with_footnotes(self):
+        # Footnotes can move text to other pages even when pagination seems to settle, so querying does not stop after them.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+        for i in range(150):
+            builder.writeln(f'Paragraph {i}.')
+            if i == 60:
+                builder.insert_footnote(aw.notes.FootnoteType.FOOTNOTE, 'Footnote text.')
+        layout_index = layout_helper.LayoutIndex(doc, aw.NodeType.PARAGRAPH)
+        paragraphs = doc.get_child_nodes(aw.NodeType.PARAGRAPH, True)
+        edited_paragraph = paragraphs[50].as_paragraph()
+        edited_paragraph.append_child(aw.Run(doc, ' Edited.'))
+        layout_index.invalidate(edited_paragraph)
+        self.assertEqual(paragraphs.count - 50, layout_index.update())
+        layout_collector = aw.layout.LayoutCollector(doc)
+        doc.update_page_layout()
+        for paragraph in paragraphs:
+            self.assertEqual(layout_collector.get_start_page_index(paragraph), layout_index.get_start_page_index(paragraph))
+            self.assertEqual(layout_collector.get_end_page_index(paragraph), layout_index.get_end_page_index(paragraph))
+
+    def test_layout_index_nodes_on_page(self):
+        # Find nodes by page with a reverse index that is built once, instead of checking every node for every page.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        layout_index = layout_helper.LayoutIndex(doc, aw.NodeType.ANY)
+        layout_collector = aw.layout.LayoutCollector(doc)
+        doc.update_page_layout()
+        for page in range(1, doc.page_count + 1):
+            paragraphs = layout_index.get_nodes_on_page(page, aw.NodeType.PARAGRAPH)
+            self.assertTrue(len(paragraphs) > 0)
+            for paragraph in paragraphs:
+                self.assertEqual(aw.NodeType.PARAGRAPH, paragraph.node_type)
+                self.assertTrue(layout_collector.get_start_page_index(paragraph) <= page <= layout_collector.get_end_page_index(paragraph))
+            first_paragraph = layout_index.get_first_node_on_page(page, aw.NodeType.PARAGRAPH)
+            self.assertEqual(page, layout_collector.get_start_page_index(first_paragraph))
+            self.assertEqual(first_paragraph, [para for para in paragraphs if layout_collector.get_start_page_index(para) == page][0])
+        self.assertIsNone(layout_index.get_first_node_on_page(doc.page_count + 1))
+
+    def test_layout_index_page_arrays(self):
+        # Get page indexes of all nodes of a type as int32 arrays, instead of querying the layout node by node.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        layout_index = layout_helper.LayoutIndex(doc, aw.NodeType.ANY)
+        start_pages, end_pages, pages_spanned = layout_index.get_page_arrays(node_type=aw.NodeType.PARAGRAPH)
+        # The arrays support the buffer protocol, so they can be wrapped by NumPy without copying.
+        self.assertEqual('i', memoryview(start_pages).format)
+        self.assertEqual(4, memoryview(start_pages).itemsize)
+        paragraphs = doc.get_child_nodes(aw.NodeType.PARAGRAPH, True)
+        self.assertEqual(paragraphs.count, len(start_pages))
+        layout_collector = aw.layout.LayoutCollector(doc)
+        doc.update_page_layout()
+        for i, paragraph in enumerate(paragraphs):
+            self.assertEqual(layout_collector.get_start_page_index(paragraph), start_pages[i])
+            self.assertEqual(layout_collector.get_end_page_index(paragraph), end_pages[i])
+            self.assertEqual(layout_collector.get_num_pages_spanned(paragraph), pages_spanned[i])
+        # A node collection can be passed as well.
+        tables = doc.get_child_nodes(aw.NodeType.TABLE, True)
+        start_pages, end_pages, pages_spanned = layout_index.get_page_arrays(tables)
+        self.assertEqual([layout_collector.get_num_pages_spanned(table) for table in tables], pages_spanned.tolist())
+
+    def test_layout_snapshot(self):
+        # Walk the layout tree once and keep it as columns, so it can be analyzed without moving an enumerator around.
+        doc = aw.Document(file_name=MY_DIR + 'Layout entities.docx')
+        layout_enumerator = aw.layout.LayoutEnumerator(doc)
+        snapshot = layout_helper.LayoutSnapshot.create(layout_enumerator)
+        self.assertEqual(aw.layout.LayoutEntityType.PAGE, layout_enumerator.type)
+        pages = [i for i in range(len(snapshot)) if snapshot.entity_types[i] == int(aw.layout.LayoutEntityType.PAGE)]
+        self.assertEqual(doc.page_count, len(pages))
+        self.assertEqual(list(range(1, doc.page_count + 1)), [snapshot.page_indexes[i] for i in pages])
+        for i in range(len(snapshot)):
+            parent = snapshot.parent_indexes[i]
+            self.assertEqual(parent == -1, i in pages)
+            if parent != -1:
+                self.assertLess(parent, i)
+            if snapshot.entity_types[i] != int(aw.layout.LayoutEntityType.SPAN):
+                self.assertEqual('', snapshot.get_text(i))
+        # The rows are in the same order as the entities visited by moving the enumerator.
+        entities = []
+
+        def traverse_layout_forward(layout_enumerator: aw.layout.LayoutEnumerator):
+            while True:
+                entities.append((int(layout_enumerator.type), layout_enumerator.page_index))
+                if layout_enumerator.move_first_child():
+                    traverse_layout_forward(layout_enumerator)
+                    layout_enumerator.move_parent()
+                if not layout_enumerator.move_next():
+                    break
+
+        traverse_layout_forward(layout_enumerator)
+        self.assertEqual(entities, list(zip(snapshot.entity_types, snapshot.page_indexes)))
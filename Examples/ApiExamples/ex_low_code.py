@@ -10,12 +10,28 @@ import aspose.words as aw
 import aspose.words.comparing
 import aspose.words.loading
 import aspose.words.lowcode
+import aspose.words.mailmerging
 import aspose.words.replacing
 import aspose.words.saving
+import concurrent.futures
 import datetime
+import document_helper
+import io
+import os
+import lazy_docx_helper
+import low_code_helper
+import multiprocessing
 import system_helper
 import unittest
-from api_example_base import ApiExampleBase, ARTIFACTS_DIR, IMAGE_DIR, MY_DIR
+import worker_pool
+from api_example_base import ApiExampleBase, ARTIFACTS_DIR, FONTS_DIR, IMAGE_DIR, LICENSE_PATH, MY_DIR
+
+def create_png_save_options() -> aw.saving.ImageSaveOptions:
+    # Save options of the rendered pages are created in the worker processes, so the factory is a module-level function.
+    save_options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+    save_options.horizontal_resolution = 50
+    save_options.vertical_resolution = 50
+    return save_options
 
 class ExLowCode(ApiExampleBase):
 
@@ -857,4 +873,251 @@ class ExLowCode(ApiExampleBase):
                 options = aw.ImageWatermarkOptions()
                 options.scale = 50
                 aw.lowcode.Watermarker.set_watermark_to_images(input_stream=stream_in, save_options=aw.saving.ImageSaveOptions(aw.SaveFormat.PNG), watermark_image_stream=image_stream, options=options)
-        #ExEnd:WatermarkImageToImagesStream
\ No newline at end of file
+        #ExEnd:WatermarkImageToImagesStream
+
+    def test_convert_many(self):
+        # Convert a batch of documents on a pool of worker processes that apply the license once per process.
+        # A broken input is reported in its own result and the rest of the batch is still converted.
+        # An input whose output name is taken by another input is not converted, so no output is overwritten.
+        input_files = [MY_DIR + 'Document.docx', MY_DIR + 'Big document.docx', MY_DIR + 'Tables.docx', MY_DIR + 'Missing document.docx', MY_DIR + 'Document.doc']
+        output_dir = ARTIFACTS_DIR + 'LowCode.ConvertMany'
+        results = list(low_code_helper.ConverterHelper.convert_many(input_files, output_dir, save_format=aw.SaveFormat.PDF, workers=2,
+                                                                    license_path=LICENSE_PATH if os.path.exists(LICENSE_PATH) else None))
+        self.assertEqual(len(input_files), len(results))
+        failed = sorted(result.input_file for result in results if not result.succeeded)
+        self.assertEqual([MY_DIR + 'Document.doc', MY_DIR + 'Missing document.docx'], failed)
+        for result in results:
+            if result.succeeded:
+                self.assertTrue(system_helper.io.File.exist(result.output_file))
+
+    def test_convert_many_worker_pool(self):
+        # A worker pool starts its processes, applies the license, loads the fonts and warms up the rendering
+        # once per process, so it can be kept alive and reused by several batches.
+        license_path = LICENSE_PATH if os.path.exists(LICENSE_PATH) else None
+        with worker_pool.WorkerPool(workers=2, license_path=license_path, fonts_folders=[FONTS_DIR]) as pool:
+            self.assertEqual(2, pool.workers)
+            self.assertEqual(2, len(multiprocessing.active_children()))
+            self.assertIsInstance(pool.submit(os.getpid).result(), int)
+            for save_format in [aw.SaveFormat.PDF, aw.SaveFormat.XPS]:
+                results = list(low_code_helper.ConverterHelper.convert_many([MY_DIR + 'Document.docx', MY_DIR + 'Tables.docx'], ARTIFACTS_DIR + 'LowCode.ConvertManyWorkerPool', save_format=save_format, pool=pool))
+                self.assertTrue(all(result.succeeded for result in results))
+        # A worker that fails to start, here because of an invalid or a missing license file, fails the pool
+        # when it is created instead of hanging the batch.
+        with open(ARTIFACTS_DIR + 'LowCode.ConvertManyWorkerPool.lic', 'w') as license_file:
+            license_file.write('Not a license.')
+        for license_path in [ARTIFACTS_DIR + 'LowCode.ConvertManyWorkerPool.lic', ARTIFACTS_DIR + 'LowCode.ConvertManyWorkerPool.Missing.lic']:
+            with self.assertRaises(concurrent.futures.process.BrokenProcessPool):
+                worker_pool.WorkerPool(workers=1, license_path=license_path)
+
+    def test_convert_to_images_iter(self):
+        # Render pages one at a time, so only the current page image is kept in memory.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        image_save_options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+        image_save_options.horizontal_resolution = 50
+        image_save_options.vertical_resolution = 50
+        page_indexes = []
+        for page_index, stream in low_code_helper.ConverterHelper.convert_to_images_iter(doc=doc, save_options=image_save_options, pages=range(2, doc.page_count)):
+            self.assertEqual(b'\x89PNG', stream.read(4))
+            page_indexes.append(page_index)
+            # A thumbnail service can stop as soon as it has enough pages, the rest of the pages are not rendered.
+            if len(page_indexes) == 3:
+                break
+        self.assertEqual([2, 3, 4], page_indexes)
+
+    def test_render_pages_in_background(self):
+        # Pages are rendered from one layout on a background thread, while the caller processes the pages rendered before.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        save_options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+        expected = [stream.getvalue() for page_index, stream in low_code_helper.ConverterHelper.convert_to_images_iter(doc=doc, save_options=save_options)]
+        page_indexes = []
+        for page_index, stream in low_code_helper.ConverterHelper.render_pages_in_background(doc, save_options, max_pages_ahead=4):
+            self.assertEqual(expected[page_index], stream.getvalue())
+            page_indexes.append(page_index)
+        self.assertEqual(list(range(doc.page_count)), page_indexes)
+        # The caller can stop early, the rendering thread stops too.
+        for page_index, stream in low_code_helper.ConverterHelper.render_pages_in_background(doc, save_options, pages=[3, 1, 2]):
+            self.assertEqual(3, page_index)
+            break
+
+    def test_render_pages_parallel(self):
+        # Pages are rendered on two worker processes at once, each of them lays the document out once.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        expected = [stream.getvalue() for page_index, stream in low_code_helper.ConverterHelper.convert_to_images_iter(doc=doc, save_options=create_png_save_options())]
+        license_path = LICENSE_PATH if os.path.exists(LICENSE_PATH) else None
+        with worker_pool.WorkerPool(workers=2, license_path=license_path) as pool:
+            page_indexes = []
+            for page_index, stream in low_code_helper.ConverterHelper.render_pages_parallel(MY_DIR + 'Big document.docx', create_png_save_options, pages_per_job=3, pool=pool):
+                self.assertEqual(expected[page_index], stream.getvalue())
+                page_indexes.append(page_index)
+            self.assertEqual(list(range(doc.page_count)), page_indexes)
+            # The document can be passed as bytes, and only the given pages are rendered.
+            with open(MY_DIR + 'Big document.docx', 'rb') as stream:
+                document_bytes = stream.read()
+            pages = [(page_index, stream.getvalue()) for page_index, stream in low_code_helper.ConverterHelper.render_pages_parallel(document_bytes, create_png_save_options, pages=[5, 1], pool=pool)]
+            self.assertEqual([(5, expected[5]), (1, expected[1])], pages)
+        # The benchmark compares the background thread (degree 0) with the worker processes.
+        results = low_code_helper.ConverterHelper.benchmark_render_pages(MY_DIR + 'Big document.docx', create_png_save_options, page_counts=[2],
+                                                                          degrees_of_parallelism=[1, 2], license_path=license_path)
+        self.assertEqual([(2, 0), (2, 1), (2, 2)], sorted(results))
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+    def test_merge_streaming(self):
+        # Inputs are loaded one at a time from a generator, and the result is the same as with Merger.merge.
+        input_files = [MY_DIR + 'Document.docx', MY_DIR + 'Tables.docx', MY_DIR + 'Paragraphs.docx']
+        loaded = []
+
+        def load_inputs():
+            for input_file in input_files:
+                loaded.append(input_file)
+                with open(input_file, 'rb') as stream:
+                    yield io.BytesIO(stream.read())
+
+        for merge_format_mode in [aw.lowcode.MergeFormatMode.KEEP_SOURCE_FORMATTING, aw.lowcode.MergeFormatMode.MERGE_FORMATTING]:
+            loaded.clear()
+            expected = aw.lowcode.Merger.merge(input_files=input_files, merge_format_mode=merge_format_mode)
+            doc = low_code_helper.MergerHelper.merge_streaming(load_inputs(), output_file=ARTIFACTS_DIR + 'LowCode.MergeStreaming.docx', merge_format_mode=merge_format_mode)
+            self.assertEqual(input_files, loaded)
+            self.assertEqual(expected.get_text(), doc.get_text())
+            self.assertEqual(expected.sections.count, doc.sections.count)
+            self.assertEqual(expected.styles.count, doc.styles.count)
+            self.assertEqual(expected.lists.count, doc.lists.count)
+        doc = aw.Document(file_name=ARTIFACTS_DIR + 'LowCode.MergeStreaming.docx')
+        self.assertEqual(expected.sections.count, doc.sections.count)
+        # Documents that keep the source layout can only be merged all at once.
+        loaded.clear()
+        with self.assertRaises(ValueError):
+            low_code_helper.MergerHelper.merge_streaming(load_inputs(), merge_format_mode=aw.lowcode.MergeFormatMode.KEEP_SOURCE_LAYOUT)
+        self.assertEqual([], loaded)
+        with self.assertRaises(ValueError):
+            low_code_helper.MergerHelper.merge_streaming([])
+
+    def test_merge_parallel(self):
+        # Documents are merged in pairs on worker threads, with the same result as Merger.merge_docs in every merge format mode.
+        # Numbered lists of the merged documents continue the same way, and the styles are taken from the same documents.
+        heading_sizes = [20, 30, 30, 20, 25, 31, 26]
+
+        def create_documents():
+            return [document_helper.DocumentHelper.create_merge_source(f'Document {i + 1}', heading_size, heading_size + 1 if i % 2 == 0 else None)
+                    for i, heading_size in enumerate(heading_sizes)]
+
+        for merge_format_mode in [aw.lowcode.MergeFormatMode.MERGE_FORMATTING, aw.lowcode.MergeFormatMode.KEEP_SOURCE_FORMATTING, aw.lowcode.MergeFormatMode.KEEP_SOURCE_LAYOUT]:
+            expected = aw.lowcode.Merger.merge_docs(input_documents=create_documents(), merge_format_mode=merge_format_mode)
+            # With one worker, the documents are merged by Merger.merge_docs instead of in pairs.
+            for max_degree_of_parallelism in [4, 1]:
+                doc = low_code_helper.MergerHelper.merge_parallel(create_documents(), merge_format_mode=merge_format_mode, max_degree_of_parallelism=max_degree_of_parallelism)
+                self.assertEqual(document_helper.DocumentHelper.get_merge_summary(expected), document_helper.DocumentHelper.get_merge_summary(doc))
+
+    def test_split_parts(self):
+        # Parts are cut on the calling thread and saved on a thread pool, with the same parts as Splitter.split.
+        doc = aw.Document(file_name=MY_DIR + 'Paragraphs.docx')
+        for split_criteria in [aw.lowcode.SplitCriteria.PAGE, aw.lowcode.SplitCriteria.SECTION_BREAK, aw.lowcode.SplitCriteria.STYLE]:
+            options = aw.lowcode.SplitOptions()
+            options.split_criteria = split_criteria
+            options.split_style = 'Heading 1'
+            with open(MY_DIR + 'Paragraphs.docx', 'rb') as stream_in:
+                expected = aw.lowcode.Splitter.split(input_stream=stream_in, save_format=aw.SaveFormat.DOCX, options=options)
+            part_count = low_code_helper.SplitterHelper.split(doc, output_file=ARTIFACTS_DIR + 'LowCode.SplitParts.docx', split_criteria=split_criteria, split_style='Heading 1')
+            self.assertEqual(len(expected), part_count)
+            self.assertTrue(os.path.exists(ARTIFACTS_DIR + f'LowCode.SplitParts_{part_count - 1}.docx'))
+        # Parts can be written to streams supplied by a callback, for example one part per pair of pages.
+        streams = {}
+
+        def create_stream(part_index):
+            streams[part_index] = io.BytesIO()
+            return streams[part_index]
+
+        part_count = low_code_helper.SplitterHelper.split(doc, stream_factory=create_stream, save_format=aw.SaveFormat.PDF, page_ranges=[(0, 2), (2, 2), (4, 2)])
+        self.assertEqual(3, part_count)
+        self.assertEqual([0, 1, 2], sorted(streams))
+        self.assertTrue(all(stream.getvalue().startswith(b'%PDF') for stream in streams.values()))
+        headings = [part.first_section.body.first_paragraph.get_text().strip() for part in low_code_helper.SplitterHelper.split_parts(doc, heading_level=1)]
+        self.assertEqual('Heading #1', headings[1])
+
+    def test_lazy_extract_pages(self):
+        # Only the beginning of the body that is needed to lay out the requested pages is parsed.
+        doc = aw.Document(file_name=MY_DIR + 'Big document.docx')
+        with lazy_docx_helper.LazyDocxDocument(file_name=MY_DIR + 'Big document.docx') as lazy_doc:
+            for page_index in range(3):
+                self.assertEqual(doc.extract_pages(page_index, 1).get_text(), lazy_doc.extract_pages(page_index, 1).get_text())
+            self.assertFalse(lazy_doc.is_fully_scanned)
+        # Sections are loaded with their own page setup, headers and footers.
+        doc = aw.Document(file_name=MY_DIR + 'Rendering.docx')
+        with open(MY_DIR + 'Rendering.docx', 'rb') as stream:
+            with lazy_docx_helper.LazyDocxDocument(stream=stream) as lazy_doc:
+                self.assertEqual(doc.sections.count, lazy_doc.get_section_count())
+                for section_index in range(doc.sections.count):
+                    section = doc.sections[section_index].as_section()
+                    lazy_section = lazy_doc.load_sections(section_index, 1).last_section
+                    self.assertTrue(lazy_section.body.get_text().endswith(section.body.get_text()))
+                    self.assertEqual(section.page_setup.orientation, lazy_section.page_setup.orientation)
+                    self.assertEqual(section.headers_footers.count, lazy_section.headers_footers.count)
+
+    def test_replace_many(self):
+        # All terms are replaced in one pass over the document, the same way as one Range.replace call per term.
+        replacements = {'Aspose': 'Company', 'Words': 'Library', 'document': 'file', 'doc': 'DOC', 'text': 'content'}
+        for match_case in [True, False]:
+            for find_whole_words_only in [True, False]:
+                options = aw.replacing.FindReplaceOptions()
+                options.match_case = match_case
+                options.find_whole_words_only = find_whole_words_only
+                expected_doc = aw.Document(file_name=MY_DIR + 'Document.docx')
+                expected_doc.first_section.body.first_paragraph.append_child(aw.Run(expected_doc, ' Aspose.Words document, Document and ASPOSE text; documents.'))
+                doc = expected_doc.clone(True).as_document()
+                expected_count = sum(expected_doc.range.replace(term, replacement, options) for term, replacement in sorted(replacements.items(), key=lambda pair: -len(pair[0])))
+                self.assertEqual(expected_count, low_code_helper.ReplacerHelper.replace_many(doc, replacements, options))
+                self.assertEqual(expected_doc.get_text(), doc.get_text())
+                # The options are left as they were.
+                self.assertIsNone(options.replacing_callback)
+                self.assertEqual(find_whole_words_only, options.find_whole_words_only)
+        # A term can span runs with different formatting.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc=doc)
+        builder.write('Aspose.Wo')
+        builder.font.bold = True
+        builder.write('rds text.')
+        self.assertEqual(3, low_code_helper.ReplacerHelper.replace_many(doc, replacements))
+        self.assertEqual('Company.Library content.', doc.first_section.body.first_paragraph.get_text().strip())
+        # When the case is ignored, terms are matched the same way as by Range.replace, also where case folding changes their length.
+        replacements = [('straße', 'street'), ('STRASSE', 'road'), ('İstanbul', 'Istanbul')]
+        doc = aw.Document()
+        aw.DocumentBuilder(doc=doc).write('Straße STRASSE strasse İstanbul')
+        expected_doc = doc.clone(True).as_document()
+        expected_count = sum(expected_doc.range.replace(term, replacement, aw.replacing.FindReplaceOptions()) for term, replacement in sorted(replacements, key=lambda pair: -len(pair[0])))
+        self.assertEqual(expected_count, low_code_helper.ReplacerHelper.replace_many(doc, replacements))
+        self.assertEqual('street road road Istanbul', doc.get_text().strip())
+        self.assertEqual(expected_doc.get_text(), doc.get_text())
+        count = low_code_helper.ReplacerHelper.replace(MY_DIR + 'Footer.docx', ARTIFACTS_DIR + 'LowCode.ReplaceMany.docx', [('(C) 2006', '(C) 2024'), ('Aspose Pty Ltd.', 'Aspose')])
+        text = aw.Document(file_name=ARTIFACTS_DIR + 'LowCode.ReplaceMany.docx').get_text()
+        self.assertLess(0, count)
+        self.assertIn('(C) 2024 Aspose All rights reserved.', text)
+        self.assertNotIn('(C) 2006', text)
+
+    def test_mail_merge_many(self):
+        # The template is loaded once, every record is merged into a clone of it and the outputs are saved on a thread pool.
+        records = [{'FirstName': name, 'Location': location, 'SpecialCharsInName()': 'Classified'} for name, location in [('James Bond', 'London'), ('Jane Doe', 'Paris'), ('John Smith', 'Rome')]]
+        output_count = low_code_helper.MailMergerHelper.execute_many(records, input_file=MY_DIR + 'Mail merge.doc', output_file=ARTIFACTS_DIR + 'LowCode.MailMergeMany.docx')
+        self.assertEqual(3, output_count)
+        for i, record in enumerate(records):
+            aw.lowcode.MailMerger.execute(input_file_name=MY_DIR + 'Mail merge.doc', output_file_name=ARTIFACTS_DIR + 'LowCode.MailMergeMany.Expected.docx', field_names=list(record), field_values=list(record.values()))
+            expected_text = aw.Document(file_name=ARTIFACTS_DIR + 'LowCode.MailMergeMany.Expected.docx').get_text()
+            self.assertEqual(expected_text, aw.Document(file_name=ARTIFACTS_DIR + f'LowCode.MailMergeMany_{i}.docx').get_text())
+        # Records can come from columns, and many records can be merged into each output saved to a stream named by a callback.
+        columns = {'FirstName': ['James Bond', 'Jane Doe', 'John Smith'], 'Location': ['London', 'Paris', 'Rome']}
+        streams = {}
+
+        def create_stream(output_index, output_records):
+            streams[output_records[0]['FirstName']] = io.BytesIO()
+            return streams[output_records[0]['FirstName']]
+
+        mail_merge_options = aw.lowcode.MailMergeOptions()
+        mail_merge_options.cleanup_options = aw.mailmerging.MailMergeCleanupOptions.REMOVE_UNUSED_FIELDS
+        output_count = low_code_helper.MailMergerHelper.execute_many(columns, input_file=MY_DIR + 'Mail merge.doc', output_factory=create_stream, mail_merge_options=mail_merge_options, records_per_output=2)
+        self.assertEqual(2, output_count)
+        self.assertEqual(['James Bond', 'John Smith'], sorted(streams))
+        text = aw.Document(stream=streams['James Bond']).get_text()
+        self.assertIn('James Bond', text)
+        self.assertIn('Jane Doe', text)
+        self.assertNotIn('MERGEFIELD', text)
+        # Field names are matched regardless of case, the same way as by the mail merge.
+        template = low_code_helper.MailMergeTemplate(aw.Document(file_name=MY_DIR + 'Mail merge.doc'))
+        self.assertIn('James Bond', template.merge({'firstname': 'James Bond'}).get_text())
\ No newline at end of file
@@ -15,6 +15,7 @@ import aspose.words.drawing
 import aspose.words.notes
 import aspose.words.replacing
 import datetime
+import text_index_helper
 import unittest
 from api_example_base import ApiExampleBase, ARTIFACTS_DIR, MY_DIR
 
@@ -358,4 +359,40 @@ class ExRange(ApiExampleBase):
                 #ExEnd
 
     def _test_insert_document_at_replace(self, doc: aw.Document):
-        self.assertEqual('1) At text that can be identified by regex:\rHello World!\r' + '2) At a MERGEFIELD:\r\x13 MERGEFIELD  Document_1  \\* MERGEFORMAT \x14«Document_1»\x15\r' + '3) At a bookmark:', doc.first_section.body.get_text().strip())
\ No newline at end of file
+        self.assertEqual('1) At text that can be identified by regex:\rHello World!\r' + '2) At a MERGEFIELD:\r\x13 MERGEFIELD  Document_1  \\* MERGEFORMAT \x14«Document_1»\x15\r' + '3) At a bookmark:', doc.first_section.body.get_text().strip())
+
+    def test_text_index(self):
+        # Repeated replaces through the index read the text of the document once, then only the paragraphs that changed.
+        builder = aw.DocumentBuilder()
+        for i in range(100):
+            builder.writeln(f'Paragraph {i}: _Name_ lives in _City_.' if i % 10 == 0 else f'Paragraph {i}.')
+        builder.insert_field('PAGE')
+        builder.write(' _Name_')
+        doc = builder.document
+        expected_doc = doc.clone(True).as_document()
+        index = text_index_helper.DocumentTextIndex(doc)
+        options = aw.replacing.FindReplaceOptions()
+        options.match_case = True
+        for pattern, replacement in [('_Name_', 'John Doe'), ('_City_', 'London'), ('_Missing_', 'None'), ('London.', 'Paris&lAgain')]:
+            self.assertEqual(expected_doc.range.replace(pattern, replacement, options), index.replace(pattern, replacement, options))
+            self.assertEqual(expected_doc.get_text(), doc.get_text())
+        self.assertLess(index.read_count, 2 * doc.get_child_nodes(aw.NodeType.PARAGRAPH, True).count)
+        # Matches come with the run and the offset in the run where they start.
+        matches = index.find('john doe')
+        self.assertEqual(11, len(matches))
+        self.assertEqual('John Doe', matches[0].text)
+        self.assertEqual(matches[0].run.text[matches[0].run_offset:matches[0].run_offset + 8], 'John Doe')
+        # Inserted and removed nodes are tracked, in-place edits have to be reported.
+        matches[0].paragraph.remove()
+        run = doc.first_section.body.last_paragraph.runs[0]
+        run.text = 'Jane Doe'
+        index.invalidate(run)
+        self.assertEqual(10, len(index.find('John Doe')))
+        self.assertEqual(1, len(index.find('Jane Doe')))
+        # Paragraph breaks are not a part of the index, such patterns search the whole document.
+        self.assertEqual(1, index.replace('Paris&lAgain&pParagraph 21', 'Rome'))
+        self.assertEqual(1, len(index.find('Rome')))
+        with self.assertRaises(ValueError):
+            index.find('Rome&p')
+        index.close()
+        self.assertIsNone(doc.node_changing_callback)
\ No newline at end of file
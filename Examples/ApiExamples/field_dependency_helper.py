@@ -0,0 +1,285 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+import aspose.words as aw
+import aspose.words.fields
+import aspose.words.layout
+
+# Kinds of the inputs of a field. An input is a tuple of the kind and, for most kinds, a name.
+BOOKMARK = 'bookmark'
+LAYOUT = 'layout'
+SEQUENCE = 'sequence'
+PROPERTY = 'property'
+VARIABLE = 'variable'
+NESTED_FIELD = 'field'
+
+# Fields that show a built-in document property.
+_PROPERTY_FIELD_TYPES = {
+    aw.fields.FieldType.FIELD_AUTHOR: 'Author',
+    aw.fields.FieldType.FIELD_TITLE: 'Title',
+    aw.fields.FieldType.FIELD_SUBJECT: 'Subject',
+    aw.fields.FieldType.FIELD_KEYWORD: 'Keywords',
+    aw.fields.FieldType.FIELD_COMMENTS: 'Comments',
+    aw.fields.FieldType.FIELD_LAST_SAVED_BY: 'LastSavedBy',
+}
+# Fields whose result depends on the pages of the document.
+_LAYOUT_FIELD_TYPES = {aw.fields.FieldType.FIELD_PAGE, aw.fields.FieldType.FIELD_NUM_PAGES,
+                       aw.fields.FieldType.FIELD_SECTION_PAGES, aw.fields.FieldType.FIELD_SECTION}
+# Fields whose result depends on their field code and nested fields only.
+_STATIC_FIELD_TYPES = {aw.fields.FieldType.FIELD_HYPERLINK, aw.fields.FieldType.FIELD_QUOTE, aw.fields.FieldType.FIELD_SYMBOL,
+                       aw.fields.FieldType.FIELD_ADVANCE, aw.fields.FieldType.FIELD_EQUATION, aw.fields.FieldType.FIELD_MERGE_FIELD}
+# Fields whose result depends on the clock, they are updated every time.
+_VOLATILE_FIELD_TYPES = {aw.fields.FieldType.FIELD_DATE, aw.fields.FieldType.FIELD_TIME}
+
+_FIRST_ARGUMENT = re.compile(r'\s*\S+\s+(?:"([^"]*)"|(\S+))')
+
+# Updated fields can change the inputs of other fields, for example, a field in a bookmark changes the text of a REF field.
+# Such changes are followed for no more than this number of passes.
+MAX_UPDATE_PASSES = 8
+
+
+class FieldDependencyGraph(object):
+    """Knows the inputs of every field of a document and updates only the fields whose inputs changed.
+
+    The inputs of a field are its field code, the fields nested in its field code, and by field type:
+    REF, NOTEREF and PAGEREF fields - the text of a bookmark; PAGE, NUMPAGES, SECTIONPAGES and PAGEREF fields -
+    the page layout; SEQ fields - the order of the SEQ fields with the same identifier; DOCPROPERTY, AUTHOR, TITLE
+    and other such fields - a document property; DOCVARIABLE fields - a document variable.
+
+    The state of every input is taken after each update. The page layout is represented by the number of pages,
+    the pages where the sections start, and the pages of the PAGE fields of the main text and of the bookmarks
+    of PAGEREF fields, so taking it lays out the document. Call "invalidate" with an input, or with no input
+    to update all fields, after an edit that the states do not show. Fields of other types, such as IF or formulas,
+    have unknown inputs and are always updated, the same as DATE and TIME fields.
+
+    Fields are told apart by the numbers that the graph gives their starts in "Node.custom_node_id",
+    so the document must not use the custom node identifiers of field starts for anything else."""
+
+    def __init__(self, doc: aw.Document):
+        self.document = doc
+        # The inputs of every field as of the last update by field number, None for the fields whose inputs are not known.
+        self.inputs: Dict[int, Optional[List[Tuple]]] = {}
+        self.reasons: Dict[int, List[str]] = {}
+        self.update_count = 0
+        self._states: Dict[Tuple, object] = {}
+        self._field_codes: Dict[int, str] = {}
+        self._fields: Dict[int, aw.fields.Field] = {}
+        self._last_field_number = 0
+        self._invalidated_inputs: Set[Tuple] = set()
+        self._invalidate_all = True
+
+    def invalidate(self, field_input: Optional[Tuple] = None):
+        """Marks an input, such as ('layout',) or ('bookmark', name), as changed, or all fields when no input is given."""
+
+        if field_input is None:
+            self._invalidate_all = True
+        else:
+            self._invalidated_inputs.add(field_input)
+
+    def get_dependents(self, field_input: Tuple) -> List[aw.fields.Field]:
+        """Gets the fields that depend on an input, as of the last update."""
+        return [self._fields[number] for number, inputs in self.inputs.items() if inputs is not None and field_input in inputs]
+
+    def explain(self, field: aw.fields.Field) -> List[str]:
+        """Gets the reasons why the field was updated by the last update, or an empty list if it was not updated."""
+        return self.reasons.get(field.start.custom_node_id, [])
+
+    def update_fields(self, changed_only: bool = True) -> int:
+        """Updates the fields of the document.
+
+        :param changed_only: Whether to update only the fields whose inputs changed since the last update.
+            The first update, and an update after "invalidate" with no input, update all fields.
+        :return: The number of fields that were updated."""
+
+        fields = self._number_fields()
+        self.reasons = {}
+
+        if not changed_only or self._invalidate_all:
+            self.document.update_fields()
+            fields = self._number_fields()
+            self.reasons = {field.start.custom_node_id: ['all fields are updated'] for field in fields}
+        else:
+            old_states = self._states
+            states = {}
+            for field in fields:
+                reasons = self._get_reasons(field, old_states, states)
+                if reasons:
+                    self.reasons[field.start.custom_node_id] = reasons
+
+            updated_numbers = set()
+            for _ in range(MAX_UPDATE_PASSES):
+                fields_to_update = [field for field in fields
+                                    if field.start.custom_node_id in self.reasons and field.start.custom_node_id not in updated_numbers]
+                if not fields_to_update:
+                    break
+                for field in fields_to_update:
+                    field.update()
+                    updated_numbers.add(field.start.custom_node_id)
+
+                # Updated fields can replace the fields in their results, for example, the PAGEREF fields of a TOC field.
+                # Only the fields that were in the document before the update are checked again.
+                fields = [field for field in self._number_fields()
+                          if field.start.custom_node_id in self._field_codes or field.start.custom_node_id in self.reasons]
+                states = {}
+                for field in fields:
+                    if field.start.custom_node_id not in updated_numbers:
+                        reasons = self._get_reasons(field, old_states, states)
+                        if reasons:
+                            self.reasons[field.start.custom_node_id] = [reason + ' by an updated field' for reason in reasons]
+
+            fields = self._number_fields()
+
+        self._take_states(fields)
+        self._invalidate_all = False
+        self._invalidated_inputs = set()
+        self.update_count += len(self.reasons)
+        return len(self.reasons)
+
+    def _number_fields(self) -> List[aw.fields.Field]:
+        """Gets the fields of the document and gives the new ones, and the copies of other fields, new numbers."""
+
+        fields = list(self.document.range.fields)
+        self._fields = {}
+        for field in fields:
+            number = field.start.custom_node_id
+            if number == 0 or number in self._fields:
+                self._last_field_number += 1
+                number = self._last_field_number
+                field.start.custom_node_id = number
+            self._fields[number] = field
+        return fields
+
+    def _take_states(self, fields: List[aw.fields.Field]):
+        self.inputs = {}
+        self._field_codes = {}
+        self._states = {}
+        for field in fields:
+            inputs = self._get_inputs(field)
+            self.inputs[field.start.custom_node_id] = inputs
+            self._field_codes[field.start.custom_node_id] = field.get_field_code()
+            for field_input in inputs or []:
+                if field_input not in self._states:
+                    self._states[field_input] = self._get_state(field_input)
+
+    def _get_reasons(self, field: aw.fields.Field, old_states: Dict[Tuple, object], states: Dict[Tuple, object]) -> List[str]:
+        number = field.start.custom_node_id
+        if number not in self._field_codes:
+            return ['the field is new']
+        if field.get_field_code() != self._field_codes[number]:
+            return ['the field code changed']
+
+        inputs = self._get_inputs(field)
+        if inputs is None:
+            if field.type in _VOLATILE_FIELD_TYPES:
+                return ['the result depends on the clock']
+            return ['the inputs of the field are not known']
+
+        reasons = []
+        for field_input in inputs:
+            if field_input not in states:
+                states[field_input] = self._get_state(field_input)
+            if field_input in self._invalidated_inputs or states[field_input] != old_states.get(field_input):
+                reasons.append(f'{self._describe(field_input)} changed')
+        return reasons
+
+    def _get_inputs(self, field: aw.fields.Field) -> Optional[List[Tuple]]:
+        """Gets the inputs of a field, or None when they are not known."""
+
+        inputs = [(NESTED_FIELD, nested_field.start.custom_node_id) for nested_field in self._get_nested_fields(field)]
+        field_type = field.type
+        if field_type == aw.fields.FieldType.FIELD_REF:
+            inputs.append((BOOKMARK, field.as_field_ref().bookmark_name))
+        elif field_type == aw.fields.FieldType.FIELD_NOTE_REF:
+            inputs.append((BOOKMARK, field.as_field_note_ref().bookmark_name))
+        elif field_type == aw.fields.FieldType.FIELD_PAGE_REF:
+            inputs.append((BOOKMARK, field.as_field_page_ref().bookmark_name))
+            inputs.append((LAYOUT,))
+        elif field_type in _LAYOUT_FIELD_TYPES:
+            inputs.append((LAYOUT,))
+        elif field_type == aw.fields.FieldType.FIELD_SEQUENCE:
+            inputs.append((SEQUENCE, field.as_field_seq().sequence_identifier.lower()))
+        elif field_type == aw.fields.FieldType.FIELD_DOC_PROPERTY:
+            inputs.append((PROPERTY, self._get_first_argument(field)))
+        elif field_type in _PROPERTY_FIELD_TYPES:
+            inputs.append((PROPERTY, _PROPERTY_FIELD_TYPES[field_type]))
+        elif field_type == aw.fields.FieldType.FIELD_DOC_VARIABLE:
+            inputs.append((VARIABLE, field.as_field_doc_variable().variable_name))
+        elif field_type not in _STATIC_FIELD_TYPES:
+            return None
+        return inputs
+
+    def _get_state(self, field_input: Tuple):
+        kind = field_input[0]
+        if kind == BOOKMARK:
+            bookmark = self.document.range.bookmarks.get_by_name(field_input[1])
+            return None if bookmark is None else bookmark.text
+        if kind == LAYOUT:
+            self.document.update_page_layout()
+            layout_collector = aw.layout.LayoutCollector(self.document)
+            nodes = list(self.document.sections)
+            for field in self.document.range.fields:
+                if field.type == aw.fields.FieldType.FIELD_PAGE and field.start.get_ancestor(aw.NodeType.HEADER_FOOTER) is None:
+                    nodes.append(field.start)
+                elif field.type == aw.fields.FieldType.FIELD_PAGE_REF:
+                    bookmark = self.document.range.bookmarks.get_by_name(field.as_field_page_ref().bookmark_name)
+                    if bookmark is not None:
+                        nodes.append(bookmark.bookmark_start)
+            return self.document.page_count, tuple(layout_collector.get_start_page_index(node) for node in nodes)
+        if kind == SEQUENCE:
+            # A SEQ field counts the SEQ fields with the same identifier before it, so moving a field changes the order of the numbers.
+            return tuple((field.start.custom_node_id, field.get_field_code()) for field in self.document.range.fields
+                         if field.type == aw.fields.FieldType.FIELD_SEQUENCE and field.as_field_seq().sequence_identifier.lower() == field_input[1])
+        if kind == PROPERTY:
+            document_property = self.document.custom_document_properties.get_by_name(field_input[1])
+            if document_property is None:
+                document_property = self.document.built_in_document_properties.get_by_name(field_input[1])
+            return None if document_property is None else str(document_property.value)
+        if kind == VARIABLE:
+            return self.document.variables.get_by_name(field_input[1]) if self.document.variables.contains(field_input[1]) else None
+        if kind == NESTED_FIELD:
+            nested_field = self._fields.get(field_input[1])
+            return None if nested_field is None else nested_field.result
+        raise ValueError(f'Unknown field input: {field_input}')
+
+    def _describe(self, field_input: Tuple) -> str:
+        kind = field_input[0]
+        if kind == BOOKMARK:
+            return f"bookmark '{field_input[1]}'"
+        if kind == LAYOUT:
+            return 'page layout'
+        if kind == SEQUENCE:
+            return f"order of the '{field_input[1]}' sequence"
+        if kind == PROPERTY:
+            return f"document property '{field_input[1]}'"
+        if kind == VARIABLE:
+            return f"document variable '{field_input[1]}'"
+        nested_field = self._fields.get(field_input[1])
+        return 'nested field' if nested_field is None else f"nested field '{nested_field.get_field_code()}'"
+
+    @staticmethod
+    def _get_first_argument(field: aw.fields.Field) -> str:
+        match = _FIRST_ARGUMENT.match(field.get_field_code())
+        return '' if match is None else match.group(1) if match.group(1) is not None else match.group(2)
+
+    @staticmethod
+    def _get_nested_fields(field: aw.fields.Field) -> List[aw.fields.Field]:
+        """Gets the fields nested in the field code of a field, but not in the fields nested in them."""
+
+        nested_fields = []
+        end = field.separator if field.separator is not None else field.end
+        depth = 0
+        node = field.start.next_sibling
+        while node is not None and node != end:
+            if node.node_type == aw.NodeType.FIELD_START:
+                if depth == 0:
+                    nested_fields.append(node.as_field_start().get_field())
+                depth += 1
+            elif node.node_type == aw.NodeType.FIELD_END:
+                depth -= 1
+            node = node.next_sibling
+        return nested_fields
@@ -0,0 +1,396 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import array
+import functools
+import glob
+import io
+import os
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import aspose.pydrawing as drawing
+import aspose.words as aw
+if not platform.python_version().startswith('3.7') and not platform.python_version().startswith('3.6'):
+    from PIL import Image, ImageChops, ImageSequence
+
+# Number of pixel rows whose alpha values are checked at once.
+ALPHA_BAND_HEIGHT = 64
+
+# Number of decoded gold images kept in memory between comparisons.
+GOLD_CACHE_SIZE = 256
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff')
+
+
+class ImageInfo(object):
+    """Properties of a single image file checked in a batch."""
+
+    def __init__(self, filename: str, width: int, height: int, contains_transparency: bool, perceptual_hash: int):
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.contains_transparency = contains_transparency
+        self.perceptual_hash = perceptual_hash
+
+
+class ImageHelper(object):
+    """Image checks that work on whole pixel buffers instead of reading pixels one by one.
+
+    Pixel data is decoded and scanned by Pillow in native code. Pillow is not used with Python 3.6 and 3.7,
+    where the single image checks fall back to aspose.pydrawing and the batch checks are not available."""
+
+    @staticmethod
+    def uses_pillow() -> bool:
+        return not platform.python_version().startswith('3.7') and not platform.python_version().startswith('3.6')
+
+    @staticmethod
+    def check_pillow():
+        """Raises an error that names the missing dependency if the batch checks cannot run with this Python version."""
+        if not ImageHelper.uses_pillow():
+            raise RuntimeError(f'Pillow is not used with Python {platform.python_version()}, '
+                               'check the images one by one with ImageHelper.contains_transparency.')
+
+    @staticmethod
+    def contains_transparency(filename: Optional[str] = None, image_stream: Optional[io.BytesIO] = None) -> bool:
+        """Checks whether an image has at least one pixel that is not fully opaque.
+
+        :param filename: Local file system filename of the image file.
+        :param image_stream: Stream that contains the image."""
+
+        if filename is not None and image_stream is not None:
+            raise ValueError('Only one of filename and image_stream can be given.')
+        if filename is None and image_stream is None:
+            raise ValueError('Either filename or image_stream must be given.')
+
+        if not ImageHelper.uses_pillow():
+            if filename is not None:
+                image = drawing.Image.from_file(filename)
+            else:
+                image = drawing.Image.from_stream(image_stream)
+            with image:
+                for x in range(image.width):
+                    for y in range(image.height):
+                        if image.get_pixel(x, y).a != 255:
+                            return True
+            return False
+
+        with Image.open(filename if filename is not None else image_stream) as image:
+            return ImageHelper._image_contains_transparency(image)
+
+    @staticmethod
+    def get_perceptual_hash(image: 'Image.Image', hash_size: int = 8) -> int:
+        """Calculates the difference hash of an image: a "hash_size" × "hash_size" bit fingerprint of its brightness gradients.
+
+        Images that look the same produce the same or a close hash, even when they differ in size,
+        compression artifacts or anti-aliasing. Compare hashes with "get_hash_distance"."""
+
+        ImageHelper.check_pillow()
+        pixels = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS).tobytes()
+        result = 0
+        for row in range(hash_size):
+            for column in range(hash_size):
+                offset = row * (hash_size + 1) + column
+                result = (result << 1) | (pixels[offset] > pixels[offset + 1])
+        return result
+
+    @staticmethod
+    def get_hash_distance(hash1: int, hash2: int) -> int:
+        """Gets the number of bits that differ between two perceptual hashes. 0 means the images look the same."""
+        return bin(hash1 ^ hash2).count('1')
+
+    @staticmethod
+    def get_image_info(filename: str) -> ImageInfo:
+        """Decodes an image once and collects its dimensions, transparency and perceptual hash."""
+        ImageHelper.check_pillow()
+        with Image.open(filename) as image:
+            image.load()
+            return ImageInfo(filename, image.width, image.height,
+                             ImageHelper._image_contains_transparency(image),
+                             ImageHelper.get_perceptual_hash(image))
+
+    @staticmethod
+    def get_image_infos(directory: str, pattern: str = '*.png', workers: Optional[int] = None) -> List[ImageInfo]:
+        """Checks all images in a directory at once. Images are decoded on a thread pool,
+        because Pillow releases the GIL while decoding and scanning pixels.
+
+        :param directory: Directory with the images, such as ARTIFACTS_DIR.
+        :param pattern: Glob pattern of the image file names in the directory.
+        :param workers: Number of threads, os.cpu_count() by default.
+        :return: Image properties sorted by the file name."""
+
+        ImageHelper.check_pillow()
+        filenames = sorted(glob.glob(os.path.join(directory, pattern)))
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return list(executor.map(ImageHelper.get_image_info, filenames))
+
+    @staticmethod
+    def verify_images(directory: str,
+                      pattern: str = '*.png',
+                      expected_width: Optional[int] = None,
+                      expected_height: Optional[int] = None,
+                      contains_transparency: Optional[bool] = None,
+                      expected_hashes: Optional[Dict[str, int]] = None,
+                      max_hash_distance: int = 0) -> List[ImageInfo]:
+        """Checks all images in a directory at once and reports every image that does not match, not only the first one.
+
+        :param directory: Directory with the images.
+        :param pattern: Glob pattern of the image file names in the directory.
+        :param expected_width: Expected width of every image, in pixels. Not checked if None.
+        :param expected_height: Expected height of every image, in pixels. Not checked if None.
+        :param contains_transparency: Whether every image is expected to contain transparency. Not checked if None.
+        :param expected_hashes: Expected perceptual hashes by file name without the directory.
+            Images that are not in the dictionary are not checked.
+        :param max_hash_distance: Maximum number of bits in which a perceptual hash may differ from the expected one.
+        :return: Properties of the checked images."""
+
+        ImageHelper.check_pillow()
+        infos = ImageHelper.get_image_infos(directory, pattern)
+        if not infos:
+            raise AssertionError(f'No images that match "{pattern}" were found in "{directory}".')
+
+        errors = []
+        for info in infos:
+            name = os.path.basename(info.filename)
+            if expected_width is not None and info.width != expected_width:
+                errors.append(f'{name}: width is {info.width}, expected {expected_width}.')
+            if expected_height is not None and info.height != expected_height:
+                errors.append(f'{name}: height is {info.height}, expected {expected_height}.')
+            if contains_transparency is not None and info.contains_transparency != contains_transparency:
+                errors.append(f'{name}: contains transparency is {info.contains_transparency}, expected {contains_transparency}.')
+            if expected_hashes is not None and name in expected_hashes:
+                distance = ImageHelper.get_hash_distance(info.perceptual_hash, expected_hashes[name])
+                if distance > max_hash_distance:
+                    errors.append(f'{name}: perceptual hash differs in {distance} bits, at most {max_hash_distance} allowed.')
+
+        if errors:
+            raise AssertionError('\n'.join(errors))
+        return infos
+
+    @staticmethod
+    def _image_contains_transparency(image: 'Image.Image') -> bool:
+        if 'A' not in image.getbands():
+            # Palette and grayscale images can still have a transparent color.
+            if 'transparency' not in image.info:
+                return False
+            image = image.convert('RGBA')
+
+        alpha = image.getchannel('A')
+        # Most transparent renders have transparent pixels near the top, so the alpha channel is checked band by band.
+        for top in range(0, alpha.height, ALPHA_BAND_HEIGHT):
+            band = alpha.crop((0, top, alpha.width, min(top + ALPHA_BAND_HEIGHT, alpha.height)))
+            if band.getextrema()[0] != 255:
+                return True
+        return False
+
+
+@functools.lru_cache(maxsize=GOLD_CACHE_SIZE)
+def _load_gold(filename: str, modified_time: int) -> 'Image.Image':
+    # The modification time is a part of the key, so a regenerated gold is decoded again.
+    with Image.open(filename) as image:
+        return image.convert('L')
+
+
+class TileDifference(object):
+    """Area of a page that differs from the gold image."""
+
+    def __init__(self, x: int, y: int, width: int, height: int, score: float):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.score = score
+
+
+class GoldComparison(object):
+    """Result of comparing one rendered page with its gold image."""
+
+    def __init__(self, page_index: int, gold_file: str, error: Optional[str] = None, hash_distance: int = 0,
+                 max_tile_score: float = 0.0, tiles: Optional[List[TileDifference]] = None, heatmap_file: Optional[str] = None,
+                 created: bool = False):
+        self.page_index = page_index
+        self.gold_file = gold_file
+        self.error = error
+        # Whether the gold image was missing and was created from the page. Such a comparison does not pass.
+        self.created = created
+        self.hash_distance = hash_distance
+        self.max_tile_score = max_tile_score
+        self.tiles = tiles or []
+        self.heatmap_file = heatmap_file
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and not self.tiles
+
+
+class GoldenImageComparer(object):
+    """Compares rendered pages with gold images, tile by tile.
+
+    Both images are converted to grayscale and their absolute difference is averaged per tile in one native
+    downscale, so a page costs a few Pillow calls regardless of its resolution. A tile fails when its mean
+    difference is above "tile_threshold", and a page fails when any tile fails or its perceptual hash is too far
+    from the gold one. For failed pages, a heatmap of the failed tiles over the gold image is saved to "heatmap_dir".
+
+    Decoded gold images are cached for the whole test run, so suites that compare many outputs
+    with the same golds decode each gold file once."""
+
+    def __init__(self,
+                 golds_dir: str,
+                 tile_size: int = 32,
+                 tile_threshold: float = 8.0,
+                 max_hash_distance: int = 6,
+                 heatmap_dir: Optional[str] = None,
+                 create_missing_golds: bool = False):
+        """:param golds_dir: Directory with the gold images, such as GOLDS_DIR.
+        :param tile_size: Width and height of a tile, in pixels.
+        :param tile_threshold: Maximum mean difference of a tile, from 0 (same pixels) to 255 (black instead of white).
+        :param max_hash_distance: Maximum number of bits in which the perceptual hash of a page may differ from the gold one.
+        :param heatmap_dir: Directory where heatmaps of the failed pages are saved. Heatmaps are not saved if None.
+        :param create_missing_golds: Whether to save a rendered page as the gold image when there is no gold image yet.
+            The comparison of such a page fails, so a new gold image is checked before it is used."""
+
+        self.golds_dir = golds_dir
+        self.tile_size = tile_size
+        self.tile_threshold = tile_threshold
+        self.max_hash_distance = max_hash_distance
+        self.heatmap_dir = heatmap_dir
+        self.create_missing_golds = create_missing_golds
+
+    @staticmethod
+    def clear_cache():
+        """Releases the decoded gold images."""
+        _load_gold.cache_clear()
+
+    @staticmethod
+    def rasterize(filename: Optional[str] = None, doc: Optional[aw.Document] = None, resolution: float = 96) -> Iterator['Image.Image']:
+        """Yields the pages of an output as images, one at a time.
+
+        Image files are decoded frame by frame, for example every page of a multi-page TIFF.
+        Other files, such as PDF or DOCX, are loaded as documents and rendered to PNG page by page.
+
+        :param filename: Local file system filename of the output.
+        :param doc: Document to render. Ignored when filename is given.
+        :param resolution: Resolution of rendered document pages, in dots per inch."""
+
+        if filename is None and doc is None:
+            raise ValueError('Either filename or doc must be given.')
+        ImageHelper.check_pillow()
+
+        if filename is not None and filename.lower().endswith(IMAGE_EXTENSIONS):
+            with Image.open(filename) as image:
+                for frame in ImageSequence.Iterator(image):
+                    yield frame.convert('L')
+            return
+
+        # The converter is only needed to render documents, so it is imported here.
+        from low_code_helper import ConverterHelper
+
+        save_options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+        save_options.horizontal_resolution = resolution
+        save_options.vertical_resolution = resolution
+        for page_index, stream in ConverterHelper.convert_to_images_iter(input_file=filename, doc=doc if filename is None else None, save_options=save_options):
+            with Image.open(stream) as image:
+                yield image.convert('L')
+
+    def compare(self, image: 'Image.Image', gold_name: str, page_index: int = 0) -> GoldComparison:
+        """Compares a rendered page with a gold image.
+
+        :param image: Rendered page.
+        :param gold_name: File name of the gold image in the golds directory.
+        :param page_index: Zero-based index of the page, used in reports."""
+
+        gold_file = os.path.join(self.golds_dir, gold_name)
+        actual = image if image.mode == 'L' else image.convert('L')
+
+        if not os.path.exists(gold_file):
+            if not self.create_missing_golds:
+                return GoldComparison(page_index, gold_file, error='The gold image does not exist.')
+            os.makedirs(os.path.dirname(gold_file), exist_ok=True)
+            actual.save(gold_file)
+            return GoldComparison(page_index, gold_file, error='The gold image did not exist and was created from the page.', created=True)
+
+        gold = _load_gold(gold_file, os.stat(gold_file).st_mtime_ns)
+        if gold.size != actual.size:
+            return GoldComparison(page_index, gold_file, error=f'The size is {actual.size}, the gold size is {gold.size}.')
+
+        hash_distance = ImageHelper.get_hash_distance(ImageHelper.get_perceptual_hash(actual), ImageHelper.get_perceptual_hash(gold))
+
+        # Tiles at the right and bottom edges can be partial, the padding is not counted in their mean difference.
+        width, height = gold.size
+        columns = -(-width // self.tile_size)
+        rows = -(-height // self.tile_size)
+        difference = Image.new('F', (columns * self.tile_size, rows * self.tile_size))
+        difference.paste(ImageChops.difference(actual, gold).convert('F'))
+        tile_means = array.array('f', difference.reduce(self.tile_size).tobytes())
+
+        tiles = []
+        max_tile_score = 0.0
+        for i, mean in enumerate(tile_means):
+            if mean == 0:
+                continue
+            x = (i % columns) * self.tile_size
+            y = (i // columns) * self.tile_size
+            tile_width = min(self.tile_size, width - x)
+            tile_height = min(self.tile_size, height - y)
+            score = mean * self.tile_size * self.tile_size / (tile_width * tile_height)
+            max_tile_score = max(max_tile_score, score)
+            if score > self.tile_threshold:
+                tiles.append(TileDifference(x, y, tile_width, tile_height, score))
+
+        error = None
+        if hash_distance > self.max_hash_distance:
+            error = f'The perceptual hash differs in {hash_distance} bits, at most {self.max_hash_distance} allowed.'
+
+        result = GoldComparison(page_index, gold_file, error, hash_distance, max_tile_score, tiles)
+        if not result.passed and self.heatmap_dir is not None:
+            heatmap_name = os.path.splitext(gold_name)[0]
+            if heatmap_name.endswith(' Gold'):
+                heatmap_name = heatmap_name[:-len(' Gold')]
+            result.heatmap_file = self._save_heatmap(gold, result, heatmap_name + '.Heatmap.png')
+        return result
+
+    def compare_pages(self, gold_prefix: str, filename: Optional[str] = None, doc: Optional[aw.Document] = None,
+                      resolution: float = 96) -> List[GoldComparison]:
+        """Compares every page of an output with the gold images named "<gold_prefix>.<page number> Gold.png".
+
+        :param gold_prefix: Common part of the gold file names, relative to the golds directory.
+        :param filename: Local file system filename of the output, an image or a document.
+        :param doc: Document to render. Ignored when filename is given.
+        :param resolution: Resolution of rendered document pages, in dots per inch."""
+
+        return [self.compare(image, f'{gold_prefix}.{page_index + 1} Gold.png', page_index)
+                for page_index, image in enumerate(GoldenImageComparer.rasterize(filename, doc, resolution))]
+
+    def verify_pages(self, gold_prefix: str, filename: Optional[str] = None, doc: Optional[aw.Document] = None,
+                     resolution: float = 96) -> List[GoldComparison]:
+        """Compares every page of an output with the gold images and reports all failed pages at once."""
+
+        results = self.compare_pages(gold_prefix, filename, doc, resolution)
+        errors = []
+        for result in results:
+            if result.passed:
+                continue
+            message = result.error or f'{len(result.tiles)} tiles differ, the maximum difference is {result.max_tile_score:.1f}.'
+            if result.heatmap_file is not None:
+                message += f' See "{result.heatmap_file}".'
+            errors.append(f'Page {result.page_index + 1} ({os.path.basename(result.gold_file)}): {message}')
+
+        if errors:
+            raise AssertionError('\n'.join(errors))
+        return results
+
+    def _save_heatmap(self, gold: 'Image.Image', result: GoldComparison, heatmap_name: str) -> str:
+        overlay = Image.new('L', gold.size)
+        for tile in result.tiles:
+            overlay.paste(min(255, int(tile.score * 4) + 64), (tile.x, tile.y, tile.x + tile.width, tile.y + tile.height))
+
+        heatmap = gold.convert('RGB')
+        heatmap.paste((255, 0, 0), mask=overlay)
+
+        heatmap_file = os.path.join(self.heatmap_dir, heatmap_name)
+        os.makedirs(os.path.dirname(heatmap_file), exist_ok=True)
+        heatmap.save(heatmap_file)
+        return heatmap_file
@@ -0,0 +1,260 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import array
+from typing import Iterable, Optional, Tuple
+
+import aspose.words as aw
+import aspose.words.layout
+
+
+class LayoutIndex(object):
+    """Keeps the page indexes of the document nodes of one type between layout passes.
+
+    Besides node to page lookups, the index answers which nodes are on a page. This reverse index is built once per
+    layout pass, so stamping every page (images, headers, watermarks) takes linear time instead of pages × nodes.
+
+    After an edit, call "invalidate" with the changed node and then "update". The layout of the whole document is
+    always rebuilt, only the page index queries are saved. The page indexes are queried again only from the first
+    changed node onward, and querying stops as soon as pagination settles back into the old layout: when a node after
+    the edit starts a page in both layouts, all the following nodes keep their old page indexes. Footnotes, endnotes and
+    floating shapes can move content to other pages even when a page starts at the same node, so querying does not stop
+    once such a node is reached after the edit."""
+
+    def __init__(self, doc: aw.Document, node_type: aw.NodeType = aw.NodeType.PARAGRAPH):
+        self.document = doc
+        self.node_type = node_type
+        self.layout_collector = aw.layout.LayoutCollector(doc)
+        self.page_count = 0
+        self._nodes = []
+        self._positions = {}
+        self._start_pages = array.array('i')
+        self._end_pages = array.array('i')
+        self._node_types = []
+        self._page_nodes = {}
+        self._invalidated_nodes = []
+        self.update()
+
+    def invalidate(self, node: aw.Node):
+        """Marks a node as changed. For a removed node, pass its previous sibling that is still in the document."""
+        self._invalidated_nodes.append(node)
+
+    def update(self) -> int:
+        """Rebuilds the document layout and refreshes the page indexes that could have changed.
+
+        :return: The number of nodes whose page indexes were queried from the layout."""
+
+        self.layout_collector.clear()
+        self.document.update_page_layout()
+
+        node_collection = self.document.get_child_nodes(self.node_type, True)
+        nodes = list(node_collection.to_array())
+
+        first_changed, last_changed = 0, len(nodes) - 1
+        if self._nodes:
+            positions = [node_collection.index_of(node) for node in self._invalidated_nodes]
+            if positions and min(positions) >= 0:
+                first_changed, last_changed = min(positions), max(positions)
+        self._invalidated_nodes = []
+
+        old_nodes, old_start_pages, old_end_pages = self._nodes, self._start_pages, self._end_pages
+        # Nodes after the last changed node are the same as before, but shifted by the number of inserted or removed nodes.
+        shift = len(nodes) - len(old_nodes)
+
+        node_positions = {node: i for i, node in enumerate(nodes)}
+        # Pagination is not known to settle after a footnote or a floating shape, so querying can only stop before it.
+        first_unsettling = self._get_first_unsettling_position(node_positions, first_changed)
+
+        start_pages = old_start_pages[:first_changed]
+        end_pages = old_end_pages[:first_changed]
+        queried = 0
+        for i in range(first_changed, len(nodes)):
+            queried += 1
+            start_pages.append(self.layout_collector.get_start_page_index(nodes[i]))
+            end_pages.append(self.layout_collector.get_end_page_index(nodes[i]))
+
+            old = i - shift
+            if i <= last_changed or i >= first_unsettling or old < 1 or old >= len(old_nodes) or old_nodes[old] != nodes[i]:
+                continue
+            starts_page = end_pages[i - 1] < start_pages[i]
+            started_page = old_end_pages[old - 1] < old_start_pages[old]
+            if starts_page and started_page and start_pages[i] == old_start_pages[old] and end_pages[i] == old_end_pages[old]:
+                start_pages.extend(old_start_pages[old + 1:])
+                end_pages.extend(old_end_pages[old + 1:])
+                break
+
+        self._nodes = nodes
+        self._positions = node_positions
+        self._start_pages = start_pages
+        self._end_pages = end_pages
+        self.page_count = self.document.page_count
+
+        if self.node_type == aw.NodeType.ANY:
+            self._node_types = [node.node_type for node in nodes]
+        self._page_nodes = {}
+        for i in range(len(nodes)):
+            for page in range(start_pages[i], end_pages[i] + 1):
+                self._page_nodes.setdefault(page, []).append(i)
+
+        return queried
+
+    def _get_first_unsettling_position(self, positions: dict, first_changed: int) -> int:
+        """Gets the position of the first indexed node from "first_changed" onward that is or contains a footnote,
+        an endnote or a floating shape, the number of indexed nodes if there is no such node."""
+
+        unsettling_nodes = list(self.document.get_child_nodes(aw.NodeType.FOOTNOTE, True))
+        unsettling_nodes.extend(shape for shape in self.document.get_child_nodes(aw.NodeType.SHAPE, True)
+                                if not shape.as_shape().is_inline)
+        first_position = len(positions)
+        for node in unsettling_nodes:
+            while node is not None and node not in positions:
+                node = node.parent_node
+            if node is None:
+                # The node is not in an indexed node, so it cannot be traced.
+                return first_changed
+            if first_changed <= positions[node] < first_position:
+                first_position = positions[node]
+        return first_position
+
+    def get_start_page_index(self, node: aw.Node) -> int:
+        """Gets the 1-based index of the page where the node begins, 0 if the node is not found."""
+        position = self._positions.get(node)
+        return self._start_pages[position] if position is not None else 0
+
+    def get_end_page_index(self, node: aw.Node) -> int:
+        """Gets the 1-based index of the page where the node ends, 0 if the node is not found."""
+        position = self._positions.get(node)
+        return self._end_pages[position] if position is not None else 0
+
+    def get_num_pages_spanned(self, node: aw.Node) -> int:
+        """Gets the number of pages the node spans, counted the same way as LayoutCollector.get_num_pages_spanned."""
+        position = self._positions.get(node)
+        return self._end_pages[position] - self._start_pages[position] if position is not None else 0
+
+    def get_nodes_on_page(self, page: int, node_type: aw.NodeType = aw.NodeType.ANY) -> list:
+        """Gets the nodes that begin, end or continue on the 1-based page, in document order.
+
+        :param page: 1-based page index.
+        :param node_type: Type of the nodes to return. Only needed when the index was built for NodeType.ANY."""
+
+        positions = self._page_nodes.get(page, [])
+        if node_type != aw.NodeType.ANY and self.node_type == aw.NodeType.ANY:
+            positions = [i for i in positions if self._node_types[i] == node_type]
+        return [self._nodes[i] for i in positions]
+
+    def get_first_node_on_page(self, page: int, node_type: aw.NodeType = aw.NodeType.ANY) -> aw.Node:
+        """Gets the first node that begins on the 1-based page, None if no node begins there."""
+        for i in self._page_nodes.get(page, []):
+            if self._start_pages[i] != page:
+                continue
+            if node_type == aw.NodeType.ANY or self.node_type != aw.NodeType.ANY or self._node_types[i] == node_type:
+                return self._nodes[i]
+        return None
+
+    def get_page_arrays(self, nodes: Optional[Iterable[aw.Node]] = None,
+                        node_type: aw.NodeType = aw.NodeType.ANY) -> Tuple[array.array, array.array, array.array]:
+        """Gets start pages, end pages and numbers of pages spanned of many nodes at once.
+
+        The values come from the index, so no layout queries are made. The result arrays hold 32-bit integers
+        and support the buffer protocol, for example numpy.frombuffer(start_pages, dtype=numpy.int32).
+
+        :param nodes: Nodes to get the page indexes for, such as a NodeCollection. All indexed nodes by default.
+        :param node_type: Type of the indexed nodes to return when no nodes are given."""
+
+        if nodes is None:
+            if node_type == aw.NodeType.ANY or self.node_type != aw.NodeType.ANY:
+                start_pages = array.array('i', self._start_pages)
+                end_pages = array.array('i', self._end_pages)
+            else:
+                positions = [i for i in range(len(self._nodes)) if self._node_types[i] == node_type]
+                start_pages = array.array('i', (self._start_pages[i] for i in positions))
+                end_pages = array.array('i', (self._end_pages[i] for i in positions))
+        else:
+            start_pages = array.array('i')
+            end_pages = array.array('i')
+            for node in nodes:
+                position = self._positions.get(node)
+                start_pages.append(self._start_pages[position] if position is not None else 0)
+                end_pages.append(self._end_pages[position] if position is not None else 0)
+
+        pages_spanned = array.array('i', (end - start for start, end in zip(start_pages, end_pages)))
+        return start_pages, end_pages, pages_spanned
+
+
+class LayoutSnapshot(object):
+    """Whole layout tree of a document stored as columns, one row per layout entity.
+
+    Rows are in depth-first, visual order. Column values of the row "i" describe the same entity: "entity_types[i]",
+    "parent_indexes[i]" (-1 for pages), "page_indexes[i]", the rectangle "x[i]", "y[i]", "widths[i]", "heights[i]",
+    and for spans "text[text_starts[i]:text_starts[i] + text_lengths[i]]". Numeric columns are arrays that support
+    the buffer protocol, so analytics can run on them vectorized, for example with NumPy.
+
+    Creating a snapshot reads every property of every entity, which takes about four times as long as a walk
+    that reads only the type and page of each entity. A snapshot pays off when the layout is queried many times,
+    or when rectangles and text of most entities are needed anyway. For a single pass, walk the enumerator."""
+
+    def __init__(self):
+        self.entity_types = array.array('i')
+        self.kinds = []
+        self.parent_indexes = array.array('i')
+        self.page_indexes = array.array('i')
+        self.x = array.array('d')
+        self.y = array.array('d')
+        self.widths = array.array('d')
+        self.heights = array.array('d')
+        self.text_starts = array.array('i')
+        self.text_lengths = array.array('i')
+        self.text = ''
+
+    def __len__(self) -> int:
+        return len(self.entity_types)
+
+    def get_text(self, index: int) -> str:
+        """Gets the text of a span entity, an empty string for other entities."""
+        return self.text[self.text_starts[index]:self.text_starts[index] + self.text_lengths[index]]
+
+    @staticmethod
+    def create(layout_enumerator: aw.layout.LayoutEnumerator) -> 'LayoutSnapshot':
+        """Walks the layout of the enumerator's document once and stores every entity. The enumerator is reset."""
+
+        snapshot = LayoutSnapshot()
+        text_parts = []
+        text_length = 0
+
+        def add_current_entity(parent_index: int) -> int:
+            nonlocal text_length
+            entity_type = layout_enumerator.type
+            rectangle = layout_enumerator.rectangle
+            snapshot.entity_types.append(int(entity_type))
+            snapshot.kinds.append(layout_enumerator.kind)
+            snapshot.parent_indexes.append(parent_index)
+            snapshot.page_indexes.append(layout_enumerator.page_index)
+            snapshot.x.append(rectangle.x)
+            snapshot.y.append(rectangle.y)
+            snapshot.widths.append(rectangle.width)
+            snapshot.heights.append(rectangle.height)
+            # Only spans can contain text.
+            text = (layout_enumerator.text or '') if entity_type == aw.layout.LayoutEntityType.SPAN else ''
+            snapshot.text_starts.append(text_length)
+            snapshot.text_lengths.append(len(text))
+            text_parts.append(text)
+            text_length += len(text)
+            return len(snapshot.entity_types) - 1
+
+        def add_entities(parent_index: int):
+            while True:
+                index = add_current_entity(parent_index)
+                if layout_enumerator.move_first_child():
+                    add_entities(index)
+                    layout_enumerator.move_parent()
+                if not layout_enumerator.move_next():
+                    break
+
+        layout_enumerator.reset()
+        add_entities(-1)
+        layout_enumerator.reset()
+
+        snapshot.text = ''.join(text_parts)
+        return snapshot
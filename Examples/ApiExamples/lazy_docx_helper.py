@@ -0,0 +1,259 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import io
+import posixpath
+import re
+import zipfile
+from typing import List, Optional, Tuple
+
+import aspose.words as aw
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+
+# Number of top-level body elements loaded first when looking for a page.
+INITIAL_BLOCK_COUNT = 64
+
+_ELEMENT = re.compile(rb'<([A-Za-z][\w.-]*:[A-Za-z][\w.-]*)[^>]*?(/?)>')
+_BODY_END = re.compile(rb'</w:body>')
+_SECTION_PROPERTIES = re.compile(rb'<w:sectPr(?=[\s>/])')
+_RELATIONSHIP = re.compile(rb'<Relationship\b[^>]*/>')
+_RELATIONSHIP_ID = re.compile(rb'\bId="([^"]+)"')
+_RELATIONSHIP_TARGET = re.compile(rb'\bTarget="([^"]+)"')
+_RELATIONSHIP_TYPE = re.compile(rb'\bType="([^"]+)"')
+_RELATIONSHIP_EXTERNAL = re.compile(rb'\bTargetMode="External"')
+_REFERENCED_ID = re.compile(rb'\br:[A-Za-z]+="([^"]+)"')
+
+# Parts that belong to the content, not to the whole document. Those that are not referenced by the loaded content are left out.
+_CONTENT_RELATIONSHIP_TYPES = (b'/image', b'/hyperlink', b'/oleObject', b'/package', b'/chart', b'/header', b'/footer',
+                               b'/diagramData', b'/diagramLayout', b'/diagramQuickStyle', b'/diagramColors', b'/diagramDrawing',
+                               b'/control', b'/video', b'/audio', b'/media', b'/subDocument', b'/aFChunk')
+
+
+class LazyDocxDocument(object):
+    """DOCX document whose body is kept as unparsed XML and turned into a Document only as far as it is needed.
+
+    The body of the main document part is split into its top-level elements (paragraphs, tables, structured document
+    tags and so on) lazily: elements are located only up to the one that was requested. Loading a part of the body
+    builds a small DOCX package in memory with only those elements, the section properties they belong to,
+    and only the images, headers, footers and other parts they reference. So loading the first pages of a huge file
+    costs about as much as loading a small file, apart from decompressing the main document part.
+
+    The package stays open and other parts are read only when a part of the body is loaded. Call "close" or use
+    the document as a context manager to release the file.
+
+    Documents that are not DOCX (DOC, RTF, PDF and others) have to be loaded with the Document constructor,
+    PdfLoadOptions.page_index and page_count already limit loading of PDF documents."""
+
+    def __init__(self, file_name: Optional[str] = None, stream: Optional[io.BytesIO] = None):
+        """:param file_name: Local file system filename of the DOCX document.
+        :param stream: Stream that contains the DOCX document. Ignored when file_name is given.
+            The stream must stay open until the document is closed."""
+
+        if file_name is None and stream is None:
+            raise ValueError('Either file_name or stream must be given.')
+
+        self._package = zipfile.ZipFile(file_name if file_name is not None else stream)
+        self._xml = self._package.read(DOCUMENT_PART)
+        self._rels_xml = self._package.read(DOCUMENT_RELS_PART)
+        body_start = self._xml.index(b'>', self._xml.index(b'<w:body')) + 1
+        body_end = _BODY_END.search(self._xml, body_start).start()
+
+        self._body_start = body_start
+        self._body_end = body_end
+
+        # The properties of the last section are the last child of the body.
+        self._last_section_properties = b''
+        last_section_start = self._xml.rfind(b'<w:sectPr', body_start, body_end)
+        while last_section_start >= 0 and not _SECTION_PROPERTIES.match(self._xml, last_section_start):
+            last_section_start = self._xml.rfind(b'<w:sectPr', body_start, last_section_start)
+        if last_section_start >= 0:
+            last_section_end = self._find_element_end(b'w:sectPr', last_section_start)
+            if not self._xml[last_section_end:body_end].strip():
+                self._last_section_properties = self._xml[last_section_start:last_section_end]
+                self._body_end = last_section_start
+
+        self._scan_position = body_start
+        self._blocks: List[Tuple[int, int]] = []
+        self._section_ends: List[int] = []
+
+    def close(self):
+        """Closes the package. Parts of the body cannot be loaded afterwards."""
+        self._package.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_fully_scanned(self) -> bool:
+        """Whether all top-level body elements have been located."""
+        return self._scan_position >= self._body_end
+
+    def get_block_count(self) -> int:
+        """Gets the number of top-level body elements. Locates all of them, but does not parse them."""
+        self._scan(None)
+        return len(self._blocks)
+
+    def get_section_count(self) -> int:
+        """Gets the number of sections. Locates all top-level body elements, but does not parse them."""
+        self._scan(None)
+        return len(self._section_ends) + (1 if not self._section_ends or self._section_ends[-1] < len(self._blocks) else 0)
+
+    def load_blocks(self, start: int, count: int) -> aw.Document:
+        """Loads a range of top-level body elements as a document.
+
+        :param start: Zero-based index of the first element.
+        :param count: Number of elements. Fewer are loaded if the body ends earlier."""
+
+        self._scan(start + count)
+        end = min(start + count, len(self._blocks))
+        return self._load(start, end)
+
+    def load_sections(self, start_section_index: int, section_count: int) -> aw.Document:
+        """Loads a range of sections as a document. Only the elements up to the end of the last requested section are located.
+
+        :param start_section_index: Zero-based index of the first section.
+        :param section_count: Number of sections."""
+
+        start = self._get_section_start(start_section_index)
+        end = self._get_section_start(start_section_index + section_count)
+        return self._load(start, end)
+
+    def extract_pages(self, start_page_index: int, page_count: int) -> aw.Document:
+        """Extracts pages the same way Document.extract_pages does, but loads only the beginning of the body
+        that is needed to lay out the pages.
+
+        Loading starts with INITIAL_BLOCK_COUNT top-level elements and doubles until the layout has more pages than
+        requested, so the last requested page cannot be changed by the content that follows it. Every step loads and
+        lays out the whole prefix again, because a layout cannot be extended with more content. The prefixes double,
+        so all steps together lay out at most about twice as many elements as the last one.
+        Fields that depend on the whole document, such as NUMPAGES, are calculated for the loaded part only.
+
+        :param start_page_index: Zero-based index of the first page.
+        :param page_count: Number of pages."""
+
+        count = INITIAL_BLOCK_COUNT
+        while True:
+            self._scan(count)
+            doc = self._load(0, min(count, len(self._blocks)))
+            if doc.page_count > start_page_index + page_count or self.is_fully_scanned and count >= len(self._blocks):
+                return doc.extract_pages(start_page_index, min(page_count, doc.page_count - start_page_index))
+            count *= 2
+
+    def _scan(self, block_count: Optional[int]):
+        """Locates top-level body elements until there are "block_count" of them or the body ends."""
+
+        xml = self._xml
+        while self._scan_position < self._body_end and (block_count is None or len(self._blocks) < block_count):
+            match = _ELEMENT.search(xml, self._scan_position, self._body_end)
+            if match is None:
+                self._scan_position = self._body_end
+                break
+
+            name = match.group(1)
+            if match.group(2):
+                end = match.end()
+            else:
+                end = self._find_element_end(name, match.start())
+
+            self._blocks.append((match.start(), end))
+            self._scan_position = end
+
+            if name == b'w:p':
+                properties_end = xml.find(b'</w:pPr>', match.start(), end)
+                if properties_end >= 0 and _SECTION_PROPERTIES.search(xml, match.start(), properties_end):
+                    self._section_ends.append(len(self._blocks))
+
+    def _find_element_end(self, name: bytes, position: int) -> int:
+        # Elements can contain elements with the same name, for example paragraphs in text boxes or nested tables.
+        tags = re.compile(b'<(/?)' + re.escape(name) + rb'(?=[\s>/])[^>]*?(/?)>')
+        depth = 0
+        for tag in tags.finditer(self._xml, position):
+            if tag.group(1):
+                depth -= 1
+            elif not tag.group(2):
+                depth += 1
+            if depth == 0:
+                return tag.end()
+        raise ValueError(f'The "{name.decode()}" element is not closed.')
+
+    def _get_section_start(self, section_index: int) -> int:
+        while len(self._section_ends) < section_index and not self.is_fully_scanned:
+            self._scan(len(self._blocks) + INITIAL_BLOCK_COUNT)
+        if section_index == 0:
+            return 0
+        if section_index <= len(self._section_ends):
+            return self._section_ends[section_index - 1]
+        return len(self._blocks)
+
+    def _get_section_properties(self, end: int) -> bytes:
+        """Gets the properties of the section that contains the element before "end"."""
+
+        for section_end in self._section_ends:
+            if section_end >= end:
+                return self._get_block_section_properties(section_end - 1)
+
+        # Section properties are stored in the last paragraph of a section, so the first ones after the located
+        # elements belong to the section of the element before "end". Finding them does not need the elements located.
+        match = _SECTION_PROPERTIES.search(self._xml, self._scan_position, self._body_end)
+        if match is None:
+            return self._last_section_properties
+        return self._xml[match.start():self._find_element_end(b'w:sectPr', match.start())]
+
+    def _get_block_section_properties(self, index: int) -> bytes:
+        block_start, block_end = self._blocks[index]
+        match = _SECTION_PROPERTIES.search(self._xml, block_start, block_end)
+        return self._xml[match.start():self._find_element_end(b'w:sectPr', match.start())]
+
+    def _load(self, start: int, end: int) -> aw.Document:
+        xml = self._xml
+        content = [xml[block_start:block_end] for block_start, block_end in self._blocks[start:end]]
+
+        # The last loaded section becomes the last section of the document, its properties are moved to the body.
+        section_properties = self._get_section_properties(end) if end > start else self._last_section_properties
+        if end > start and end in self._section_ends:
+            content[-1] = content[-1].replace(section_properties, b'', 1)
+
+        body = b''.join(content) + section_properties
+        document_xml = xml[:self._body_start] + body + xml[self._body_end + len(self._last_section_properties):]
+
+        referenced_ids = set(_REFERENCED_ID.findall(body))
+        excluded_parts = set()
+        relationships = []
+        for relationship in _RELATIONSHIP.findall(self._rels_xml):
+            relationship_type = _RELATIONSHIP_TYPE.search(relationship).group(1)
+            relationship_id = _RELATIONSHIP_ID.search(relationship).group(1)
+            if relationship_id not in referenced_ids and relationship_type.endswith(_CONTENT_RELATIONSHIP_TYPES):
+                if not _RELATIONSHIP_EXTERNAL.search(relationship):
+                    target = _RELATIONSHIP_TARGET.search(relationship).group(1).decode()
+                    excluded_parts.add(posixpath.normpath(posixpath.join('word', target)).lstrip('/'))
+                continue
+            relationships.append(relationship)
+
+        rels_xml = self._rels_xml
+        rels_start = rels_xml.index(b'>', rels_xml.index(b'<Relationships')) + 1
+        rels_xml = rels_xml[:rels_start] + b''.join(relationships) + b'</Relationships>'
+
+        # Parts are stored without compression, they are read back right away.
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as package:
+            for info in self._package.infolist():
+                name = info.filename
+                if name in excluded_parts:
+                    continue
+                if name == DOCUMENT_PART:
+                    data = document_xml
+                elif name == DOCUMENT_RELS_PART:
+                    data = rels_xml
+                else:
+                    data = self._package.read(info)
+                package.writestr(name, data)
+
+        stream.seek(0)
+        return aw.Document(stream)
@@ -0,0 +1,914 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import io
+import itertools
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import aspose.words as aw
+from worker_pool import WorkerPool
+
+
+class ConversionResult(object):
+    """Outcome of converting a single input file in a batch."""
+
+    def __init__(self, input_file: str, output_file: str, error: Optional[str] = None):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def _convert_file(input_file: str, output_file: str, save_format: int,
+                  save_options_factory: Optional[Callable[[], aw.saving.SaveOptions]]) -> ConversionResult:
+    try:
+        if save_options_factory is not None:
+            aw.lowcode.Converter.convert(input_file=input_file, output_file=output_file, save_options=save_options_factory())
+        else:
+            aw.lowcode.Converter.convert(input_file=input_file, output_file=output_file, save_format=aw.SaveFormat(save_format))
+        return ConversionResult(input_file, output_file)
+    except Exception as e:
+        return ConversionResult(input_file, output_file, f'{type(e).__name__}: {e}')
+
+
+# The document whose pages a worker process renders, kept between the jobs of one render as (key, document).
+_rendered_document = None
+
+
+def _get_rendered_document(key: str, input_document: Union[str, bytes]) -> aw.Document:
+    global _rendered_document
+    if _rendered_document is None or _rendered_document[0] != key:
+        _rendered_document = None
+        if isinstance(input_document, str):
+            doc = aw.Document(file_name=input_document)
+        else:
+            doc = aw.Document(stream=io.BytesIO(input_document))
+        doc.update_page_layout()
+        _rendered_document = (key, doc)
+    return _rendered_document[1]
+
+
+def _count_pages(key: str, input_document: Union[str, bytes]) -> int:
+    return _get_rendered_document(key, input_document).page_count
+
+
+def _render_pages(key: str, input_document: Union[str, bytes],
+                  save_options_factory: Callable[[], aw.saving.FixedPageSaveOptions], page_indexes: List[int]) -> List[bytes]:
+    doc = _get_rendered_document(key, input_document)
+    save_options = save_options_factory()
+    pages = []
+    for page_index in page_indexes:
+        save_options.page_set = aw.saving.PageSet(page=page_index)
+        with io.BytesIO() as stream:
+            doc.save(stream, save_options)
+            pages.append(stream.getvalue())
+    return pages
+
+
+class ConverterHelper(object):
+
+    @staticmethod
+    def convert_many(input_files: Iterable[str],
+                     output_dir: str,
+                     save_format: aw.SaveFormat = aw.SaveFormat.PDF,
+                     save_options_factory: Optional[Callable[[], aw.saving.SaveOptions]] = None,
+                     workers: Optional[int] = None,
+                     license_path: Optional[str] = None,
+                     pool: Optional[WorkerPool] = None) -> Iterator[ConversionResult]:
+        """Converts many documents on a pool of worker processes and yields results as soon as each file is done.
+
+        Each worker process imports Aspose.Words and applies the license once, then converts files one after another.
+        A file that fails to convert is reported through ConversionResult.error and does not stop the batch.
+        Pass an existing pool to reuse warm workers between batches.
+
+        :param input_files: Local file system filenames of the documents to convert.
+        :param output_dir: Directory where the converted documents are saved, named after the input file.
+            An input whose output name is already taken by another input is not converted and is reported as failed.
+        :param save_format: Format of the output documents.
+        :param save_options_factory: Module-level function that creates the save options in the worker process.
+            Aspose.Words objects cannot be passed between processes, so the options are built on the worker side.
+        :param workers: Number of worker processes, os.cpu_count() by default. Ignored when a pool is given.
+        :param license_path: Path to the license file applied in each worker process. Ignored when a pool is given.
+        :param pool: Worker pool that runs the conversions. It is left running when the batch ends."""
+
+        if save_options_factory is not None:
+            extension = aw.FileFormatUtil.save_format_to_extension(save_options_factory().save_format)
+        else:
+            extension = aw.FileFormatUtil.save_format_to_extension(save_format)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Inputs with the same name, such as "a.docx" and "a.doc" or files of different folders, would overwrite
+        # each other's output. Only the first of them is converted, the others are reported as failed.
+        jobs = []
+        output_inputs = {}
+        for input_file in input_files:
+            output_file = os.path.join(output_dir, os.path.splitext(os.path.basename(input_file))[0] + extension)
+            output_key = os.path.normcase(output_file)
+            if output_key in output_inputs:
+                yield ConversionResult(input_file, output_file, f'ValueError: The output file is also the output of "{output_inputs[output_key]}".')
+                continue
+            output_inputs[output_key] = input_file
+            jobs.append((input_file, output_file, int(save_format), save_options_factory))
+
+        if pool is not None:
+            yield from pool.map_unordered(_convert_file, jobs)
+            return
+
+        with WorkerPool(workers=workers, license_path=license_path) as own_pool:
+            yield from own_pool.map_unordered(_convert_file, jobs)
+
+    @staticmethod
+    def convert_to_images_iter(input_file: Optional[str] = None,
+                               doc: Optional[aw.Document] = None,
+                               save_options: Optional[aw.saving.ImageSaveOptions] = None,
+                               pages: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, io.BytesIO]]:
+        """Renders document pages to images one at a time and yields (page_index, stream) as soon as each page is ready.
+
+        Unlike Converter.convert_to_images, only the page that is currently yielded is held in memory.
+        The document layout is built once, and the caller can stop iterating at any page to skip rendering the rest.
+
+        :param input_file: Local file system filename of the document. Ignored when doc is given.
+        :param doc: Document to render.
+        :param save_options: Image save options. Its page_set is replaced for every page, PNG by default.
+        :param pages: Zero-based indexes of the pages to render, for example range(0, 10). All pages by default."""
+
+        if input_file is None and doc is None:
+            raise ValueError('Either input_file or doc must be given.')
+
+        if doc is None:
+            doc = aw.Document(file_name=input_file)
+        if save_options is None:
+            save_options = aw.saving.ImageSaveOptions(aw.SaveFormat.PNG)
+        else:
+            save_options = save_options.clone()
+
+        doc.update_page_layout()
+        if pages is None:
+            pages = range(doc.page_count)
+
+        for page_index in pages:
+            save_options.page_set = aw.saving.PageSet(page=page_index)
+            stream = io.BytesIO()
+            doc.save(stream, save_options)
+            stream.seek(0)
+            yield page_index, stream
+
+    @staticmethod
+    def render_pages_in_background(doc: aw.Document,
+                                   save_options: aw.saving.FixedPageSaveOptions,
+                                   pages: Optional[Iterable[int]] = None,
+                                   max_pages_ahead: int = 2) -> Iterator[Tuple[int, io.BytesIO]]:
+        """Renders document pages on a background thread and yields (page_index, stream) in page order.
+
+        The layout is built once, and every page is rendered from it. A Document is not thread-safe, so pages are not
+        rendered at the same time: that would need a clone of the document per thread, and a clone lays out the whole
+        document again. Instead, the next pages are rendered while the caller processes the pages already rendered,
+        for example, while it writes them to disk or uploads them. At most "max_pages_ahead" pages wait for the caller,
+        which keeps memory bounded. When the caller stops early, the pages after the ones rendered ahead are not rendered.
+
+        :param doc: Document to render. Its layout is built before the pages are rendered.
+        :param save_options: Fixed page save options, such as ImageSaveOptions, PdfSaveOptions or XpsSaveOptions.
+            Each page is saved as a separate output.
+        :param pages: Zero-based indexes of the pages to render. All pages by default.
+        :param max_pages_ahead: Maximum number of rendered pages that wait for the caller."""
+
+        doc.update_page_layout()
+        if pages is None:
+            pages = range(doc.page_count)
+
+        rendered = queue.Queue(maxsize=max_pages_ahead)
+        stopped = threading.Event()
+
+        def put(item: tuple) -> bool:
+            # The caller can stop at any page, so the queue is not waited on forever.
+            while not stopped.is_set():
+                try:
+                    rendered.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def render_pages():
+            try:
+                page_options = save_options.clone()
+                for page_index in pages:
+                    page_options.page_set = aw.saving.PageSet(page=page_index)
+                    stream = io.BytesIO()
+                    doc.save(stream, page_options)
+                    stream.seek(0)
+                    if not put((page_index, stream, None)):
+                        return
+                put((None, None, None))
+            except Exception as e:
+                put((None, None, e))
+
+        thread = threading.Thread(target=render_pages, daemon=True)
+        thread.start()
+        try:
+            while True:
+                page_index, stream, error = rendered.get()
+                if error is not None:
+                    raise error
+                if page_index is None:
+                    return
+                yield page_index, stream
+        finally:
+            stopped.set()
+            thread.join()
+
+    @staticmethod
+    def render_pages_parallel(input_document: Union[str, bytes],
+                              save_options_factory: Callable[[], aw.saving.FixedPageSaveOptions],
+                              pages: Optional[Iterable[int]] = None,
+                              max_degree_of_parallelism: Optional[int] = None,
+                              pages_per_job: int = 4,
+                              license_path: Optional[str] = None,
+                              pool: Optional[WorkerPool] = None) -> Iterator[Tuple[int, io.BytesIO]]:
+        """Renders document pages on several worker processes at once and yields (page_index, stream) in page order.
+
+        Threads cannot share one Document, so the pages are rendered by processes. Every worker loads the document and
+        builds its layout once, then renders the pages of every job it takes. Since each worker builds the layout again,
+        this pays off only when rendering takes longer than the layout and there are free cores,
+        use benchmark_render_pages to compare it with render_pages_in_background on the target machine.
+        At most two jobs per worker are rendered ahead of the caller, which keeps memory bounded.
+        A worker of the given pool keeps the document until it renders another one or the pool is closed.
+
+        :param input_document: Local file system filename or the bytes of the document to render.
+        :param save_options_factory: Module-level function that creates the fixed page save options in the worker process.
+        :param pages: Zero-based indexes of the pages to render. All pages by default.
+        :param max_degree_of_parallelism: Number of worker processes, os.cpu_count() by default. Ignored when a pool is given.
+        :param pages_per_job: Number of pages that a worker renders in one job.
+        :param license_path: License file applied in the workers. Ignored when a pool is given.
+        :param pool: Existing pool of warm workers to render the pages on."""
+
+        if pages_per_job < 1:
+            raise ValueError('pages_per_job must be positive.')
+
+        if pool is None:
+            with WorkerPool(workers=max_degree_of_parallelism, license_path=license_path) as own_pool:
+                yield from ConverterHelper.render_pages_parallel(input_document, save_options_factory, pages,
+                                                                 pages_per_job=pages_per_job, pool=own_pool)
+            return
+
+        key = uuid.uuid4().hex
+        if pages is None:
+            pages = range(pool.submit(_count_pages, key, input_document).result())
+        pages = list(pages)
+        jobs = iter([pages[i:i + pages_per_job] for i in range(0, len(pages), pages_per_job)])
+
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < 2 * pool.workers:
+                    page_indexes = next(jobs, None)
+                    if page_indexes is None:
+                        break
+                    pending.append((page_indexes, pool.submit(_render_pages, key, input_document, save_options_factory, page_indexes)))
+                if not pending:
+                    return
+                page_indexes, future = pending.popleft()
+                for page_index, page in zip(page_indexes, future.result()):
+                    yield page_index, io.BytesIO(page)
+        finally:
+            # The caller can stop at any page, the jobs that have not started yet are not rendered.
+            for page_indexes, future in pending:
+                future.cancel()
+
+    @staticmethod
+    def benchmark_render_pages(input_file: str,
+                               save_options_factory: Callable[[], aw.saving.FixedPageSaveOptions],
+                               page_counts: Iterable[int],
+                               degrees_of_parallelism: Iterable[int],
+                               license_path: Optional[str] = None) -> Dict[Tuple[int, int], float]:
+        """Measures how long it takes to render the first pages of a document with and without worker processes.
+
+        Returns seconds by (page_count, degree_of_parallelism). Degree 0 stands for render_pages_in_background in
+        this process. The worker pools are started before the measurement, so the numbers compare the steady-state cost:
+        loading, layout and rendering.
+
+        :param input_file: Local file system filename of the document to render.
+        :param save_options_factory: Module-level function that creates the fixed page save options.
+        :param page_counts: Numbers of pages to render, each no greater than the page count of the document.
+        :param degrees_of_parallelism: Numbers of worker processes to compare.
+        :param license_path: License file applied in the workers."""
+
+        page_counts = list(page_counts)
+        results = {}
+        for page_count in page_counts:
+            start = time.perf_counter()
+            doc = aw.Document(file_name=input_file)
+            for page_index, stream in ConverterHelper.render_pages_in_background(doc, save_options_factory(), range(page_count)):
+                pass
+            results[(page_count, 0)] = time.perf_counter() - start
+
+        for degree in degrees_of_parallelism:
+            with WorkerPool(workers=degree, license_path=license_path) as pool:
+                for page_count in page_counts:
+                    pages_per_job = max(1, -(-page_count // degree))
+                    start = time.perf_counter()
+                    for page_index, stream in ConverterHelper.render_pages_parallel(input_file, save_options_factory, range(page_count),
+                                                                                    pages_per_job=pages_per_job, pool=pool):
+                        pass
+                    results[(page_count, degree)] = time.perf_counter() - start
+        return results
+
+
+def _load_document(input_document: Union[str, io.BytesIO, aw.Document], load_options: Optional[aw.loading.LoadOptions] = None) -> aw.Document:
+    if isinstance(input_document, aw.Document):
+        return input_document
+    if isinstance(input_document, str):
+        return aw.Document(file_name=input_document, load_options=load_options) if load_options is not None else aw.Document(file_name=input_document)
+    return aw.Document(stream=input_document, load_options=load_options) if load_options is not None else aw.Document(stream=input_document)
+
+
+class MergerHelper(object):
+
+    @staticmethod
+    def append(dst_doc: aw.Document, src_doc: aw.Document,
+               merge_format_mode: aw.lowcode.MergeFormatMode = aw.lowcode.MergeFormatMode.KEEP_SOURCE_FORMATTING) -> aw.Document:
+        """Appends a document the same way Merger.merge does for the given merge format mode.
+
+        MergeFormatMode.KEEP_SOURCE_LAYOUT has no ImportFormatMode or ImportFormatOptions counterpart, Merger.merge
+        writes the source formatting into every merged node. Such documents can only be merged all at once by Merger.merge_docs.
+
+        :return: The destination document.
+        :raises ValueError: For MergeFormatMode.KEEP_SOURCE_LAYOUT."""
+
+        if merge_format_mode == aw.lowcode.MergeFormatMode.KEEP_SOURCE_LAYOUT:
+            raise ValueError('Documents with MergeFormatMode.KEEP_SOURCE_LAYOUT cannot be appended one by one, use Merger.merge_docs.')
+
+        if merge_format_mode == aw.lowcode.MergeFormatMode.MERGE_FORMATTING:
+            dst_doc.append_document(src_doc, aw.ImportFormatMode.USE_DESTINATION_STYLES)
+        else:
+            dst_doc.append_document(src_doc, aw.ImportFormatMode.KEEP_SOURCE_FORMATTING)
+        return dst_doc
+
+    @staticmethod
+    def merge_streaming(input_files: Iterable[Union[str, io.BytesIO]],
+                        output_file: Optional[str] = None,
+                        output_stream: Optional[io.BytesIO] = None,
+                        save_format: Optional[aw.SaveFormat] = None,
+                        save_options: Optional[aw.saving.SaveOptions] = None,
+                        merge_format_mode: aw.lowcode.MergeFormatMode = aw.lowcode.MergeFormatMode.KEEP_SOURCE_FORMATTING,
+                        load_options: Optional[aw.loading.LoadOptions] = None) -> aw.Document:
+        """Merges documents one at a time: each input is loaded, appended and released before the next one is loaded.
+
+        Merger.merge loads all inputs before appending them, so its peak memory grows with the total size of the inputs.
+        Here the peak memory is the merged document plus one input. Styles and lists are de-duplicated against
+        the style and list tables of the merged document, which grow with every append. The result is the same as
+        Merger.merge with the same merge format mode. MergeFormatMode.KEEP_SOURCE_LAYOUT is not supported,
+        because such documents cannot be appended one by one.
+
+        :param input_files: Local file system filenames or streams of the documents to merge. Can be a generator,
+            it is consumed one input at a time.
+        :param output_file: Local file system filename of the merged document. The document is not saved if None.
+        :param output_stream: Stream to save the merged document to. Ignored when output_file is given.
+        :param save_format: Format of the merged document. Taken from the output file extension by default.
+        :param save_options: Save options of the merged document. Takes precedence over save_format.
+        :param merge_format_mode: How the formatting of the documents is merged.
+        :param load_options: Load options used for all inputs.
+        :return: The merged document.
+        :raises ValueError: For MergeFormatMode.KEEP_SOURCE_LAYOUT, or when there are no inputs."""
+
+        if merge_format_mode == aw.lowcode.MergeFormatMode.KEEP_SOURCE_LAYOUT:
+            raise ValueError('Documents with MergeFormatMode.KEEP_SOURCE_LAYOUT cannot be merged one at a time, use Merger.merge.')
+
+        merged_doc = None
+        for input_file in input_files:
+            doc = _load_document(input_file, load_options)
+            merged_doc = doc if merged_doc is None else MergerHelper.append(merged_doc, doc, merge_format_mode)
+            doc = None
+
+        if merged_doc is None:
+            raise ValueError('There are no documents to merge.')
+
+        output = output_file if output_file is not None else output_stream
+        if output is not None:
+            if save_options is not None:
+                merged_doc.save(output, save_options)
+            elif save_format is not None:
+                merged_doc.save(output, save_format)
+            else:
+                merged_doc.save(output)
+
+        return merged_doc
+
+    @staticmethod
+    def merge_parallel(input_documents: List[Union[str, io.BytesIO, aw.Document]],
+                       merge_format_mode: aw.lowcode.MergeFormatMode = aw.lowcode.MergeFormatMode.MERGE_FORMATTING,
+                       max_degree_of_parallelism: Optional[int] = None,
+                       load_options: Optional[aw.loading.LoadOptions] = None) -> aw.Document:
+        """Merges documents on a thread pool. The result is the same as Merger.merge_docs with the same merge format mode.
+
+        With MergeFormatMode.MERGE_FORMATTING, neighbouring documents are merged in pairs on worker threads,
+        then the pairs are merged in pairs, and so on. Every document is appended about log2(N) times into a small
+        document instead of once into an ever-growing one, and the merges of one level run at the same time.
+        Merging into destination styles gives the same result in any grouping, so the order of documents is all that matters.
+        Numbered lists continue across the documents the same way as with Merger.merge_docs. Every node is copied about
+        log2(N) times, so this pays off only when the merges of one level run on several cores. When only one document
+        can be merged at a time, the loaded documents are merged by one Merger.merge_docs call instead.
+
+        With MergeFormatMode.KEEP_SOURCE_FORMATTING, whether a source style is kept depends on all the documents merged
+        before it, so pairs cannot be merged separately. Documents are then loaded on worker threads and appended in order
+        while the following documents are still loading. With MergeFormatMode.KEEP_SOURCE_LAYOUT, documents are loaded
+        on worker threads and merged by one Merger.merge_docs call.
+
+        :param input_documents: Documents, or local file system filenames or streams of the documents to merge.
+            Documents are modified, the first one can become the merged document.
+        :param merge_format_mode: How the formatting of the documents is merged.
+        :param max_degree_of_parallelism: Maximum number of documents loaded or merged at the same time, os.cpu_count() by default.
+            With 1, the documents are merged by Merger.merge_docs.
+        :param load_options: Load options used for the inputs that are not loaded yet.
+        :raises ValueError: When there are no documents to merge."""
+
+        if not input_documents:
+            raise ValueError('There are no documents to merge.')
+
+        max_degree_of_parallelism = max_degree_of_parallelism or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_degree_of_parallelism) as executor:
+            docs = executor.map(lambda input_document: _load_document(input_document, load_options), input_documents)
+
+            if merge_format_mode == aw.lowcode.MergeFormatMode.KEEP_SOURCE_LAYOUT or (
+                    merge_format_mode == aw.lowcode.MergeFormatMode.MERGE_FORMATTING and max_degree_of_parallelism == 1):
+                return aw.lowcode.Merger.merge_docs(input_documents=list(docs), merge_format_mode=merge_format_mode)
+
+            if merge_format_mode != aw.lowcode.MergeFormatMode.MERGE_FORMATTING:
+                merged_doc = next(docs)
+                for doc in docs:
+                    merged_doc = MergerHelper.append(merged_doc, doc, merge_format_mode)
+                return merged_doc
+
+            docs = list(docs)
+            while len(docs) > 1:
+                merges = [executor.submit(MergerHelper.append, docs[i], docs[i + 1], merge_format_mode) for i in range(0, len(docs) - 1, 2)]
+                odd_doc = [docs[-1]] if len(docs) % 2 else []
+                docs = [merge.result() for merge in merges] + odd_doc
+            return docs[0]
+
+
+class SplitterHelper(object):
+
+    @staticmethod
+    def split_parts(doc: aw.Document,
+                    split_criteria: aw.lowcode.SplitCriteria = aw.lowcode.SplitCriteria.PAGE,
+                    split_style: Optional[str] = None,
+                    heading_level: int = 0,
+                    page_ranges: Optional[Iterable[Tuple[int, int]]] = None) -> Iterator[aw.Document]:
+        """Cuts a document into parts and yields them one at a time, in document order.
+
+        Section and paragraph parts are cut in one traversal of the document body, every node is imported into exactly
+        one part. Page parts are not cut in one pass: the layout is built once for the whole document, but every part is
+        a separate Document.extract_pages call, which looks up the nodes of its pages in the whole document. Splitting
+        a document into a part per page can take time that grows with the number of pages times the size of the document.
+
+        :param doc: Document to split. It is not modified.
+        :param split_criteria: SplitCriteria.PAGE for a part per page, SECTION_BREAK for a part per section,
+            STYLE for a part that starts at each paragraph with "split_style".
+        :param split_style: Name of the paragraph style that starts a part, for SplitCriteria.STYLE.
+        :param heading_level: If greater than zero, a part starts at each paragraph with the "Heading 1" to
+            "Heading <heading_level>" style, the same as DocumentSplitCriteria.HEADING_PARAGRAPH. Overrides split_criteria.
+        :param page_ranges: (start_page_index, page_count) of every part to extract. Overrides split_criteria."""
+
+        if page_ranges is None and heading_level == 0 and split_criteria == aw.lowcode.SplitCriteria.PAGE:
+            doc.update_page_layout()
+            page_ranges = [(page_index, 1) for page_index in range(doc.page_count)]
+
+        if page_ranges is not None:
+            doc.update_page_layout()
+            for start_page_index, page_count in page_ranges:
+                yield doc.extract_pages(start_page_index, page_count)
+            return
+
+        if heading_level > 0:
+            heading_styles = {aw.StyleIdentifier.HEADING1 + level for level in range(heading_level)}
+            starts_part = lambda paragraph: paragraph.paragraph_format.style_identifier in heading_styles
+        elif split_criteria == aw.lowcode.SplitCriteria.STYLE:
+            starts_part = lambda paragraph: paragraph.paragraph_format.style_name == split_style
+        else:
+            starts_part = None
+
+        part_doc = None
+        importer = None
+        part_body = None
+        part_has_content = False
+        for section in doc.sections:
+            section = section.as_section()
+            if starts_part is None and part_doc is not None:
+                yield part_doc
+                part_doc = None
+            part_body = None
+
+            for node in section.body.get_child_nodes(aw.NodeType.ANY, False):
+                is_paragraph = node.node_type == aw.NodeType.PARAGRAPH
+                # Empty paragraphs before the first paragraph that starts a part stay in that part, the same as in Splitter.split.
+                if starts_part is not None and part_has_content and is_paragraph and starts_part(node.as_paragraph()):
+                    yield part_doc
+                    part_doc = None
+                    part_body = None
+
+                if part_doc is None:
+                    # A document without sections, but with the styles, lists and settings of the source.
+                    part_doc = doc.clone(False).as_document()
+                    importer = aw.NodeImporter(doc, part_doc, aw.ImportFormatMode.KEEP_SOURCE_FORMATTING)
+                    part_has_content = False
+
+                if part_body is None:
+                    part_section = importer.import_node(section, False).as_section()
+                    part_body = aw.Body(part_doc)
+                    part_section.append_child(part_body)
+                    for header_footer in section.headers_footers:
+                        part_section.append_child(importer.import_node(header_footer, True))
+                    part_doc.append_child(part_section)
+
+                part_body.append_child(importer.import_node(node, True))
+                if not part_has_content:
+                    part_has_content = not is_paragraph or bool(node.get_text().strip()) or node.as_paragraph().get_child_nodes(aw.NodeType.SHAPE, True).count > 0
+
+        if part_doc is not None:
+            yield part_doc
+
+    @staticmethod
+    def split(doc: aw.Document,
+              output_file: Optional[str] = None,
+              stream_factory: Optional[Callable[[int], io.BytesIO]] = None,
+              save_format: Optional[aw.SaveFormat] = None,
+              save_options: Optional[aw.saving.SaveOptions] = None,
+              split_criteria: aw.lowcode.SplitCriteria = aw.lowcode.SplitCriteria.PAGE,
+              split_style: Optional[str] = None,
+              heading_level: int = 0,
+              page_ranges: Optional[Iterable[Tuple[int, int]]] = None,
+              max_degree_of_parallelism: Optional[int] = None) -> int:
+        """Splits a document and saves the parts on a thread pool while the next parts are being cut.
+
+        Parts are cut on the calling thread, because the source document is not thread-safe. Every part is a separate
+        document, so parts are saved concurrently. At most two parts per thread wait to be saved, which keeps memory bounded.
+
+        :param doc: Document to split.
+        :param output_file: Output file name. Parts are saved next to it with a zero-based part index,
+            the same as Splitter.split does: "Output.docx" becomes "Output_0.docx", "Output_1.docx" and so on.
+        :param stream_factory: Function that returns the stream for the zero-based part index. Ignored when output_file is given.
+            The streams are not closed.
+        :param save_format: Format of the parts. Taken from the output file extension, DOCX for streams by default.
+        :param save_options: Save options of the parts. Takes precedence over save_format.
+        :param split_criteria: See "split_parts".
+        :param split_style: See "split_parts".
+        :param heading_level: See "split_parts".
+        :param page_ranges: See "split_parts".
+        :param max_degree_of_parallelism: Maximum number of parts saved at the same time, os.cpu_count() by default.
+        :return: The number of parts."""
+
+        if output_file is None and stream_factory is None:
+            raise ValueError('Either output_file or stream_factory must be given.')
+
+        if max_degree_of_parallelism is None:
+            max_degree_of_parallelism = os.cpu_count()
+        if save_options is None and save_format is None:
+            save_format = aw.FileFormatUtil.extension_to_save_format(os.path.splitext(output_file)[1]) if output_file is not None else aw.SaveFormat.DOCX
+
+        def save_part(part_doc: aw.Document, part_index: int):
+            if output_file is not None:
+                name, extension = os.path.splitext(output_file)
+                output = f'{name}_{part_index}{extension}'
+            else:
+                output = stream_factory(part_index)
+            if save_options is not None:
+                part_doc.save(output, save_options)
+            else:
+                part_doc.save(output, save_format)
+
+        part_count = 0
+        with ThreadPoolExecutor(max_workers=max_degree_of_parallelism) as executor:
+            pending = []
+            for part_doc in SplitterHelper.split_parts(doc, split_criteria, split_style, heading_level, page_ranges):
+                pending.append(executor.submit(save_part, part_doc, part_count))
+                part_count += 1
+                if len(pending) >= 2 * max_degree_of_parallelism:
+                    pending.pop(0).result()
+
+            for future in pending:
+                future.result()
+
+        return part_count
+
+
+def _get_trie_pattern(terms: Iterable[str]) -> str:
+    """Builds a regular expression that matches any of the terms, longest term first.
+
+    Terms that share a prefix share a branch of the pattern, so the regular expression engine tests each character
+    of the text against one trie node instead of against every term."""
+
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def get_pattern(node: dict) -> str:
+        branches = []
+        for char in sorted(node, reverse=True):
+            if char:
+                branches.append(re.escape(char) + get_pattern(node[char]))
+        if not branches:
+            return ''
+        # The end of a shorter term is tried last, so the longest term wins as with an Aho-Corasick automaton.
+        optional = '?' if '' in node else ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + optional
+
+    return get_pattern(trie)
+
+
+class _MultiReplacingCallback(aw.replacing.IReplacingCallback):
+    """Sets the replacement of each match from the lists of (term, replacement) pairs by the term, case folded if the case is ignored."""
+
+    def __init__(self, terms: dict, matcher, options: aw.replacing.FindReplaceOptions,
+                 replacing_callback: Optional[aw.replacing.IReplacingCallback]):
+        aw.replacing.IReplacingCallback.__init__(self)
+        self.terms = terms
+        self.matcher = matcher
+        self.options = options
+        self.replacing_callback = replacing_callback
+
+    def replacing(self, args: aw.replacing.ReplacingArgs) -> aw.replacing.ReplaceAction:
+        match = self.matcher.match(self._get_match_text(args))
+        if match is None:
+            return aw.replacing.ReplaceAction.SKIP
+
+        args.replacement = self._get_term(match.group())[1]
+        if self.replacing_callback is not None:
+            return self.replacing_callback.replacing(args)
+        return aw.replacing.ReplaceAction.REPLACE
+
+    def _get_term(self, text: str) -> Tuple[str, str]:
+        if self.options.match_case:
+            return self.terms[text][0]
+        # Terms that fold the same way can still match different text, such as "straße" and "STRASSE", and a few characters
+        # match each other when the case is ignored, but are folded differently, such as "İ" and "i".
+        candidates = itertools.chain(self.terms.get(text.casefold(), []), itertools.chain.from_iterable(self.terms.values()))
+        return next(term for term in candidates if re.fullmatch(re.escape(term[0]), text, re.IGNORECASE))
+
+    def _get_match_text(self, args: aw.replacing.ReplacingArgs) -> str:
+        """Gets the text of the matched nodes from the match offset on, the match is at the beginning of it.
+
+        ReplacingArgs has no match value in this API, so the text is taken from the nodes that the engine reports
+        for the match, without the runs that the options make the engine skip."""
+
+        node = args.match_node
+        parts = [node.get_text()[args.match_offset:]]
+        in_field_code, in_field_result = False, False
+        while node != args.match_end_node and node.next_sibling is not None:
+            node = node.next_sibling
+            if node.node_type == aw.NodeType.FIELD_START:
+                in_field_code, in_field_result = True, False
+            elif node.node_type == aw.NodeType.FIELD_SEPARATOR:
+                in_field_code, in_field_result = False, True
+            elif node.node_type == aw.NodeType.FIELD_END:
+                in_field_code, in_field_result = False, False
+            elif node.node_type == aw.NodeType.RUN:
+                run = node.as_run()
+                skipped = (in_field_code and (self.options.ignore_field_codes or self.options.ignore_fields)
+                           or in_field_result and self.options.ignore_fields
+                           or run.is_delete_revision and self.options.ignore_deleted
+                           or run.is_insert_revision and self.options.ignore_inserted)
+                if not skipped:
+                    parts.append(run.text)
+        return ''.join(parts)
+
+
+class ReplacerHelper(object):
+
+    @staticmethod
+    def replace_many(doc: aw.Document,
+                     replacements: Union[dict, Iterable[Tuple[str, str]]],
+                     options: Optional[aw.replacing.FindReplaceOptions] = None) -> int:
+        """Replaces many terms in one pass over the document.
+
+        Replacer.replace and Range.replace look for one pattern per call, so N terms take N passes over the document.
+        Here all terms are compiled into one regular expression shaped like a trie, which is run once by
+        Range.replace_regex, and the replacement of every match is looked up in a dictionary.
+
+        All terms are searched for at the same time, so unlike N sequential calls the text inserted by one replacement
+        is never matched by another term. Where terms overlap, the leftmost and then the longest one is replaced.
+        When the case is ignored, the first of the terms that match the text regardless of case is used.
+
+        :param doc: Document to replace the terms in.
+        :param replacements: Term to replacement dictionary, or term and replacement pairs.
+            Terms are plain text within a paragraph, they are not regular expressions.
+        :param options: Find and replace options. MatchCase, FindWholeWordsOnly, Ignore* options, ApplyFont and the others
+            have the same meaning as for Range.replace. A replacing callback is called for every match after
+            its replacement is set. The options are left unchanged after the call.
+        :return: The number of replacements made."""
+
+        if options is None:
+            options = aw.replacing.FindReplaceOptions()
+
+        terms = {}
+        for term, replacement in (replacements.items() if isinstance(replacements, dict) else replacements):
+            if term:
+                terms.setdefault(term if options.match_case else term.casefold(), []).append((term, replacement))
+        if not terms:
+            return 0
+
+        # The pattern is built from the terms as given, case folding can change their length, such as "ß" to "ss".
+        pattern = _get_trie_pattern(term for term, replacement in itertools.chain.from_iterable(terms.values()))
+        # The whole word check is part of the pattern, so a longer term that is not a whole word gives way to a shorter one.
+        if options.find_whole_words_only:
+            pattern = r'(?<!\w)' + pattern + r'(?!\w)'
+        flags = '' if options.match_case else '(?i)'
+        matcher = re.compile(flags + pattern)
+
+        replacing_callback = options.replacing_callback
+        find_whole_words_only = options.find_whole_words_only
+        options.replacing_callback = _MultiReplacingCallback(terms, matcher, options, replacing_callback)
+        options.find_whole_words_only = False
+        try:
+            return doc.range.replace_regex(flags + pattern, '', options)
+        finally:
+            options.replacing_callback = replacing_callback
+            options.find_whole_words_only = find_whole_words_only
+
+    @staticmethod
+    def replace(input_file: str,
+                output_file: str,
+                replacements: Union[dict, Iterable[Tuple[str, str]]],
+                save_format: Optional[aw.SaveFormat] = None,
+                options: Optional[aw.replacing.FindReplaceOptions] = None) -> int:
+        """Replaces many terms in a document file in one pass, the same way as Replacer.replace does for one term.
+
+        :param input_file: Local file system filename of the input document.
+        :param output_file: Local file system filename of the output document.
+        :param replacements: Term to replacement dictionary, or term and replacement pairs.
+        :param save_format: Format of the output document. Taken from the output file extension by default.
+        :param options: Find and replace options, see "replace_many".
+        :return: The number of replacements made."""
+
+        doc = aw.Document(input_file)
+        count = ReplacerHelper.replace_many(doc, replacements, options)
+        if save_format is not None:
+            doc.save(output_file, save_format)
+        else:
+            doc.save(output_file)
+        return count
+
+
+# Properties of MailMergeOptions that have a MailMerge counterpart with the same name.
+_MAIL_MERGE_OPTIONS = ('cleanup_options', 'cleanup_paragraphs_with_punctuation_marks', 'merge_duplicate_regions', 'merge_whole_document',
+                       'preserve_unused_tags', 'region_end_tag', 'region_start_tag', 'restart_lists_at_each_section', 'retain_first_section_start',
+                       'trim_whitespaces', 'unconditional_merge_fields_and_regions', 'use_non_merge_fields', 'use_whole_paragraph_as_region')
+
+
+def _iter_records(records) -> Iterator[dict]:
+    """Yields the records of an iterable of dictionaries, or of a columnar source: a dictionary of columns or
+    an object with "columns" and column lookup by name, such as a pandas DataFrame."""
+
+    if isinstance(records, dict) or hasattr(records, 'columns'):
+        names = list(records.keys() if isinstance(records, dict) else records.columns)
+        for values in zip(*(records[name] for name in names)):
+            yield dict(zip(names, values))
+        return
+    yield from records
+
+
+class MailMergeTemplate(object):
+    """Mail merge template that is loaded once and merged with one record at a time.
+
+    Every record is merged into a clone of the loaded template, so the template file is not read and parsed again.
+    Only the values of the fields that the template contains are passed to the mail merge. Field names are compared
+    case-insensitively, the same way as the mail merge does."""
+
+    def __init__(self, doc: aw.Document, mail_merge_options: Optional[aw.lowcode.MailMergeOptions] = None):
+        """:param doc: Template document. It is not modified.
+        :param mail_merge_options: Mail merge options applied to every merged document."""
+
+        self.document = doc
+        self.mail_merge_options = mail_merge_options
+        self.field_names = {name.lower() for name in doc.mail_merge.get_field_names()}
+
+    def merge(self, record: dict) -> aw.Document:
+        """Merges a record into a clone of the template.
+
+        :param record: Field name to value dictionary."""
+
+        doc = self.document.clone()
+        if self.mail_merge_options is not None:
+            for name in _MAIL_MERGE_OPTIONS:
+                setattr(doc.mail_merge, name, getattr(self.mail_merge_options, name))
+
+        names = [name for name in record if name.lower() in self.field_names]
+        doc.mail_merge.execute(names, [record[name] for name in names])
+        return doc
+
+
+class MailMergerHelper(object):
+
+    @staticmethod
+    def execute_many(records,
+                     input_file: Optional[str] = None,
+                     doc: Optional[aw.Document] = None,
+                     output_file: Optional[str] = None,
+                     output_factory: Optional[Callable[[int, List[dict]], Union[str, io.BytesIO]]] = None,
+                     save_format: Optional[aw.SaveFormat] = None,
+                     save_options: Optional[aw.saving.SaveOptions] = None,
+                     mail_merge_options: Optional[aw.lowcode.MailMergeOptions] = None,
+                     records_per_output: int = 1,
+                     max_degree_of_parallelism: Optional[int] = None) -> int:
+        """Merges many records into one template and saves the results on a thread pool.
+
+        MailMerger.execute loads the template for every record. Here the template is loaded once, and every record
+        is merged into a clone of it. The clones are merged and saved concurrently, at most two outputs per thread
+        are in progress at a time, so records can come from a generator of any length.
+
+        :param records: Field name to value dictionaries, or a columnar source: a dictionary of columns or an object
+            with "columns" and column lookup by name, such as a pandas DataFrame.
+        :param input_file: Local file system filename of the template. Ignored when doc is given.
+        :param doc: Template document. It is not modified.
+        :param output_file: Local file system filename the outputs are named after: "name_0.ext", "name_1.ext" and so on.
+        :param output_factory: Function that takes the index of an output and its records, and returns the filename
+            or the stream to save the output to. Used when output_file is None.
+        :param save_format: Format of the outputs. Taken from the output file extension, or DOCX, by default.
+        :param save_options: Save options of the outputs. Takes precedence over save_format.
+        :param mail_merge_options: Mail merge options, the same as in MailMerger.execute.
+        :param records_per_output: Number of records merged into each output. The merged records are appended to each other
+            the same way as MailMerge.execute with many records repeats the whole document.
+        :param max_degree_of_parallelism: Maximum number of outputs merged at the same time, os.cpu_count() by default.
+        :return: The number of outputs."""
+
+        if input_file is None and doc is None:
+            raise ValueError('Either input_file or doc must be given.')
+        if output_file is None and output_factory is None:
+            raise ValueError('Either output_file or output_factory must be given.')
+
+        if doc is None:
+            doc = aw.Document(file_name=input_file)
+        if max_degree_of_parallelism is None:
+            max_degree_of_parallelism = os.cpu_count()
+        if save_options is None and save_format is None:
+            save_format = aw.FileFormatUtil.extension_to_save_format(os.path.splitext(output_file)[1]) if output_file is not None else aw.SaveFormat.DOCX
+
+        # A Document is not thread-safe, so every thread clones the template from its own copy.
+        templates = queue.Queue()
+        templates.put(MailMergeTemplate(doc, mail_merge_options))
+        for _ in range(max_degree_of_parallelism - 1):
+            templates.put(MailMergeTemplate(doc.clone(), mail_merge_options))
+
+        def merge_output(output_records: List[dict], output_index: int):
+            template = templates.get()
+            try:
+                output_doc = None
+                for record in output_records:
+                    record_doc = template.merge(record)
+                    if output_doc is None:
+                        output_doc = record_doc
+                    else:
+                        output_doc.append_document(record_doc, aw.ImportFormatMode.KEEP_SOURCE_FORMATTING)
+            finally:
+                templates.put(template)
+
+            if output_file is not None:
+                name, extension = os.path.splitext(output_file)
+                output = f'{name}_{output_index}{extension}'
+            else:
+                output = output_factory(output_index, output_records)
+            if save_options is not None:
+                output_doc.save(output, save_options)
+            else:
+                output_doc.save(output, save_format)
+
+        output_count = 0
+        with ThreadPoolExecutor(max_workers=max_degree_of_parallelism) as executor:
+            pending = []
+            output_records = []
+            for record in _iter_records(records):
+                output_records.append(record)
+                if len(output_records) < records_per_output:
+                    continue
+                pending.append(executor.submit(merge_output, output_records, output_count))
+                output_records = []
+                output_count += 1
+                if len(pending) >= 2 * max_degree_of_parallelism:
+                    pending.pop(0).result()
+
+            if output_records:
+                pending.append(executor.submit(merge_output, output_records, output_count))
+                output_count += 1
+            for future in pending:
+                future.result()
+
+        return output_count
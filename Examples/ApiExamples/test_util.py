@@ -61,12 +61,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -260,12 +257,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -459,12 +453,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -658,12 +649,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -857,12 +845,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -1058,12 +1043,9 @@ class TestUtil(object):
         """Checks whether an image from the local file system contains any transparency.
 
         :param filename: Local file system filename of the image file."""
-        with drawing.Image.from_file(filename) as image:
-            for x in range(image.width):
-                for y in range(image.height):
-                    if image.get_pixel(x, y).a != 255:
-                        return
-        raise Exception('The image from "' + filename + '" does not contain any transparency.')
+        import image_helper
+        if not image_helper.ImageHelper.contains_transparency(filename=filename):
+            raise Exception('The image from "' + filename + '" does not contain any transparency.')
 
     @staticmethod
     def doc_package_file_contains_string(expected: str, doc_filename: str, doc_part_filename: str):
@@ -1224,4 +1206,4 @@ class TestUtil(object):
         TestUtil.unit_test.assertTrue(inner_field_parent == outer_field.start.parent_node)
         TestUtil.unit_test.assertTrue(inner_field_parent.get_child_nodes(aw.NodeType.ANY, False).index_of(inner_field.start) > inner_field_parent.get_child_nodes(aw.NodeType.ANY, False).index_of(outer_field.start))
         TestUtil.unit_test.assertTrue(inner_field_parent.get_child_nodes(aw.NodeType.ANY, False).index_of(
-            inner_field.end) < inner_field_parent.get_child_nodes(aw.NodeType.ANY, False).index_of(outer_field.end))
\ No newline at end of file
+            inner_field.end) < inner_field_parent.get_child_nodes(aw.NodeType.ANY, False).index_of(outer_field.end))
\ No newline at end of file
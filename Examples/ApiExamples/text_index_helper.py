@@ -0,0 +1,271 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import bisect
+import re
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+
+import aspose.words as aw
+import aspose.words.replacing
+
+# Meta-characters of Range.replace patterns that stand for a character within a paragraph.
+_INLINE_META_CHARACTERS = {'&l': '\x0b', '&m': '\x0c', '&&': '&'}
+# Meta-characters of Range.replace patterns that stand for a break between paragraphs or sections.
+_BREAK_META_CHARACTER = re.compile('&[pb]')
+_META_CHARACTER = re.compile('&[lm&]')
+
+# When more paragraphs than this can contain a match, one Range.replace call on the whole document is faster
+# than a call per paragraph.
+MAX_PARAGRAPH_REPLACES = 32
+
+
+class ParagraphText(object):
+    """Text of the runs of one paragraph and the offset of every run in it."""
+
+    def __init__(self, paragraph: aw.Paragraph):
+        self.paragraph = paragraph
+        self.runs = []
+        self.run_starts = []
+        parts = []
+        length = 0
+        has_revisions = False
+        for run in paragraph.get_child_nodes(aw.NodeType.RUN, True):
+            run = run.as_run()
+            # Runs of shapes in the paragraph belong to the paragraphs of the shapes.
+            if run.parent_paragraph != paragraph:
+                continue
+            self.runs.append(run)
+            self.run_starts.append(length)
+            parts.append(run.text)
+            length += len(run.text)
+            has_revisions = has_revisions or run.is_insert_revision or run.is_delete_revision
+        self.text = ''.join(parts)
+
+        self.has_revisions = has_revisions
+        self.has_fields = paragraph.get_child_nodes(aw.NodeType.FIELD_START, True).count > 0
+        self.has_office_math = paragraph.get_child_nodes(aw.NodeType.OFFICE_MATH, True).count > 0
+        self.in_shape = paragraph.get_ancestor(aw.NodeType.SHAPE) is not None
+        self.in_footnote = paragraph.get_ancestor(aw.NodeType.FOOTNOTE) is not None
+
+    def get_run(self, offset: int) -> Tuple[Optional[aw.Run], int]:
+        """Gets the run that contains the character at the offset, and the offset of the character in the run."""
+        index = bisect.bisect_right(self.run_starts, offset) - 1
+        if index < 0 or offset >= len(self.text):
+            return None, 0
+        return self.runs[index], offset - self.run_starts[index]
+
+    def can_match(self, matcher, options: Optional[aw.replacing.FindReplaceOptions]) -> bool:
+        """Whether Range.replace with the options can find the pattern in the paragraph.
+
+        Fields, revisions and office math can be skipped by the search, so the text around them joins up and can match
+        even though the run text does not. Such paragraphs are always searched when the options skip them."""
+
+        if options is not None:
+            if options.ignore_shapes and self.in_shape or options.ignore_footnotes and self.in_footnote:
+                return False
+            if (self.has_fields and (options.ignore_fields or options.ignore_field_codes)
+                    or self.has_revisions and (options.ignore_deleted or options.ignore_inserted)
+                    or self.has_office_math and options.ignore_office_math):
+                return True
+        return matcher.search(self.text) is not None
+
+
+class TextMatch(object):
+    """A match of a pattern in the run text of a paragraph."""
+
+    def __init__(self, paragraph_text: ParagraphText, start: int, end: int):
+        self.paragraph = paragraph_text.paragraph
+        self.start = start
+        self.end = end
+        self.text = paragraph_text.text[start:end]
+        self.run, self.run_offset = paragraph_text.get_run(start)
+
+
+class DocumentTextIndex(aw.INodeChangingCallback):
+    """Keeps the run text of every paragraph of a document, so repeated finds do not collect the text again.
+
+    The index is built on first use. It is set as the node changing callback of the document and marks a paragraph
+    as changed when nodes are inserted into it or removed from it. Only the changed paragraphs are read again before
+    the next find. A callback that was set on the document before is still called.
+
+    Setting Run.text or other properties of a node in place does not notify the callback. Call "invalidate"
+    with the changed node after such an edit, or with no node to re-read the whole document.
+
+    Finds and replaces through the index use the index to skip the paragraphs that cannot contain the pattern,
+    and call Range.replace on the others only."""
+
+    def __init__(self, doc: aw.Document):
+        aw.INodeChangingCallback.__init__(self)
+        self.document = doc
+        self.node_changing_callback = doc.node_changing_callback
+        self.paragraph_texts: List[ParagraphText] = []
+        self.read_count = 0
+        self._cache: Dict[aw.Paragraph, ParagraphText] = {}
+        self._changed_paragraphs = []
+        self._paragraphs_changed = True
+        doc.node_changing_callback = self
+
+    def close(self):
+        """Stops tracking the changes of the document and restores its previous node changing callback."""
+        self.document.node_changing_callback = self.node_changing_callback
+        self._cache = {}
+        self.paragraph_texts = []
+
+    def invalidate(self, node: Optional[aw.Node] = None):
+        """Marks the paragraph of a node, or all paragraphs when no node is given, as changed."""
+
+        if node is None:
+            self._cache = {}
+            self._paragraphs_changed = True
+            return
+        if node.node_type == aw.NodeType.PARAGRAPH:
+            self._changed_paragraphs.append(node)
+        else:
+            paragraph = node.get_ancestor(aw.NodeType.PARAGRAPH)
+            if paragraph is not None:
+                self._changed_paragraphs.append(paragraph)
+
+    @staticmethod
+    def _contains_paragraphs(node: aw.Node) -> bool:
+        if node.node_type == aw.NodeType.PARAGRAPH:
+            return True
+        return node.is_composite and node.as_composite_node().get_child_nodes(aw.NodeType.PARAGRAPH, True).count > 0
+
+    def update(self) -> int:
+        """Reads the text of the changed paragraphs again.
+
+        :return: The number of paragraphs whose text was read."""
+
+        read_count = 0
+        for paragraph in self._changed_paragraphs:
+            self._cache.pop(paragraph, None)
+        self._changed_paragraphs = []
+
+        if self._paragraphs_changed:
+            paragraph_texts = []
+            for paragraph in self.document.get_child_nodes(aw.NodeType.PARAGRAPH, True):
+                paragraph = paragraph.as_paragraph()
+                paragraph_text = self._cache.get(paragraph)
+                if paragraph_text is None:
+                    paragraph_text = ParagraphText(paragraph)
+                    read_count += 1
+                paragraph_texts.append(paragraph_text)
+            self.paragraph_texts = paragraph_texts
+            self._cache = {paragraph_text.paragraph: paragraph_text for paragraph_text in paragraph_texts}
+            self._paragraphs_changed = False
+        else:
+            for i, paragraph_text in enumerate(self.paragraph_texts):
+                if paragraph_text.paragraph not in self._cache:
+                    self.paragraph_texts[i] = ParagraphText(paragraph_text.paragraph)
+                    self._cache[paragraph_text.paragraph] = self.paragraph_texts[i]
+                    read_count += 1
+
+        self.read_count += read_count
+        return read_count
+
+    def find(self, pattern: Union[str, Pattern], match_case: bool = False) -> List[TextMatch]:
+        """Finds all matches of a pattern in the run text of the paragraphs, in document order.
+
+        :param pattern: Text to find, the same as in Range.replace, or a compiled regular expression.
+            Matches are found within a paragraph, so "&p" and "&b" are not supported.
+        :param match_case: Whether a text pattern is case-sensitive. Ignored for a compiled regular expression.
+        :raises ValueError: When a text pattern contains a paragraph or section break."""
+
+        matcher = self._get_matcher(pattern, match_case)
+        self.update()
+        matches = []
+        for paragraph_text in self.paragraph_texts:
+            for match in matcher.finditer(paragraph_text.text):
+                matches.append(TextMatch(paragraph_text, match.start(), match.end()))
+        return matches
+
+    def replace(self, pattern: str, replacement: str, options: Optional[aw.replacing.FindReplaceOptions] = None) -> int:
+        """Replaces all occurrences of a text pattern the same way as Document.range.replace, searching only
+        the paragraphs that can contain it.
+
+        :return: The number of replacements made."""
+
+        # Breaks between paragraphs and sections are not a part of the index, so such patterns search the whole document.
+        if _BREAK_META_CHARACTER.search(pattern.replace('&&', '')):
+            self.invalidate()
+            return self._replace(self.document.range, pattern, replacement, options, False)
+
+        match_case = options is not None and options.match_case
+        return self._replace_in_paragraphs(self._get_matcher(pattern, match_case), pattern, replacement, options, False)
+
+    def replace_regex(self, pattern: str, replacement: str, options: Optional[aw.replacing.FindReplaceOptions] = None) -> int:
+        """Replaces all matches of a regular expression the same way as Document.range.replace_regex, searching only
+        the paragraphs that can contain a match. Range.replace_regex does not match across paragraphs either.
+
+        :return: The number of replacements made."""
+
+        flags = 0 if options is not None and options.match_case else re.IGNORECASE
+        try:
+            matcher = re.compile(pattern, flags)
+        except re.error:
+            # The pattern uses a .NET feature that Python does not support, the document is searched as a whole.
+            self.invalidate()
+            return self._replace(self.document.range, pattern, replacement, options, True)
+        return self._replace_in_paragraphs(matcher, pattern, replacement, options, True)
+
+    def _replace_in_paragraphs(self, matcher, pattern: str, replacement: str,
+                               options: Optional[aw.replacing.FindReplaceOptions], is_regex: bool) -> int:
+        self.update()
+        candidates = [paragraph_text for paragraph_text in self.paragraph_texts if paragraph_text.can_match(matcher, options)]
+        if not candidates:
+            return 0
+
+        # Only the candidates can change, whether they are searched one by one or as a part of the whole document.
+        for paragraph_text in candidates:
+            self._changed_paragraphs.append(paragraph_text.paragraph)
+        if len(candidates) > MAX_PARAGRAPH_REPLACES:
+            return self._replace(self.document.range, pattern, replacement, options, is_regex)
+        return sum(self._replace(paragraph_text.paragraph.range, pattern, replacement, options, is_regex) for paragraph_text in candidates)
+
+    @staticmethod
+    def _replace(text_range: aw.Range, pattern: str, replacement: str,
+                 options: Optional[aw.replacing.FindReplaceOptions], is_regex: bool) -> int:
+        if is_regex:
+            if options is not None:
+                return text_range.replace_regex(pattern, replacement, options)
+            return text_range.replace_regex(pattern, replacement)
+        if options is not None:
+            return text_range.replace(pattern, replacement, options)
+        return text_range.replace(pattern, replacement)
+
+    @staticmethod
+    def _get_matcher(pattern: Union[str, Pattern], match_case: bool):
+        # re.Pattern is not available in Python 3.6.
+        if not isinstance(pattern, str):
+            return pattern
+        if _BREAK_META_CHARACTER.search(pattern.replace('&&', '')):
+            raise ValueError('Paragraph and section breaks cannot be found in the index.')
+        text = _META_CHARACTER.sub(lambda match: _INLINE_META_CHARACTERS[match.group()], pattern)
+        return re.compile(re.escape(text), 0 if match_case else re.IGNORECASE)
+
+    def node_inserting(self, args: aw.NodeChangingArgs):
+        if self.node_changing_callback is not None:
+            self.node_changing_callback.node_inserting(args)
+
+    def node_inserted(self, args: aw.NodeChangingArgs):
+        # A node that contains paragraphs changes the list of paragraphs.
+        if self._contains_paragraphs(args.node):
+            self._paragraphs_changed = True
+        self.invalidate(args.node)
+        if self.node_changing_callback is not None:
+            self.node_changing_callback.node_inserted(args)
+
+    def node_removing(self, args: aw.NodeChangingArgs):
+        if self.node_changing_callback is not None:
+            self.node_changing_callback.node_removing(args)
+
+    def node_removed(self, args: aw.NodeChangingArgs):
+        # The node is no longer in the document, its old parent tells which paragraph changed.
+        if self._contains_paragraphs(args.node):
+            self._paragraphs_changed = True
+        elif args.old_parent is not None:
+            self.invalidate(args.old_parent)
+        if self.node_changing_callback is not None:
+            self.node_changing_callback.node_removed(args)
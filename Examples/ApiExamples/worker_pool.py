@@ -0,0 +1,135 @@
+# Copyright (c) 2001-2025 Aspose Pty Ltd. All Rights Reserved.
+#
+# This file is part of Aspose.Words. The source code in this file
+# is only intended as a supplement to the documentation, and is provided
+# "as is", without warranty of any kind, either expressed or implied.
+import concurrent.futures
+import io
+import os
+import multiprocessing
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import aspose.words as aw
+
+# Seconds that the pool waits for all its workers to start.
+START_TIMEOUT = 300
+
+_start_barrier = None
+
+
+def _init_worker(license_path: Optional[str], fonts_folders: List[str], font_search_cache: Optional[bytes], start_barrier):
+    """Prepares a worker process: applies the license, loads the font settings and warms up the layout and rendering code."""
+    global _start_barrier
+    _start_barrier = start_barrier
+
+    if license_path is not None:
+        if not os.path.exists(license_path):
+            raise ValueError(f'The license file {license_path} does not exist.')
+        lic = aw.License()
+        lic.set_license(license_path)
+
+    if fonts_folders:
+        # The search cache was saved by the parent process, so the worker does not scan the font files again.
+        font_sources = WorkerPool.create_font_sources(fonts_folders)
+        if font_search_cache is not None:
+            with io.BytesIO(font_search_cache) as cache_stream:
+                aw.fonts.FontSettings.default_instance.set_fonts_sources(font_sources, cache_stream)
+        else:
+            aw.fonts.FontSettings.default_instance.set_fonts_sources(font_sources)
+
+    # The first document that goes through loading, layout and rendering pays most of the startup cost.
+    doc = aw.Document()
+    builder = aw.DocumentBuilder(doc)
+    builder.writeln('Warm-up')
+    with io.BytesIO() as stream:
+        doc.save(stream, aw.SaveFormat.PDF)
+
+
+def _wait_for_workers():
+    """Holds a worker until every worker of the pool runs this job, so each of them takes exactly one."""
+    _start_barrier.wait(START_TIMEOUT)
+
+
+class WorkerPool(object):
+    """Pool of worker processes that are ready to process documents.
+
+    Every worker applies the license, loads the font settings and renders a small document once, when the pool starts.
+    The constructor starts all workers and returns when they are ready, so the first jobs do not pay the startup cost.
+    Jobs are module-level functions (load, transform, save) that run in the workers at the steady-state cost.
+    Aspose.Words objects cannot be passed between processes, so jobs take and return file names, bytes or plain values.
+
+    If a worker fails to start, for example when the license or the fonts cannot be loaded, the constructor raises
+    concurrent.futures.process.BrokenProcessPool. If a worker dies later, the results of the jobs raise it
+    instead of waiting forever."""
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 license_path: Optional[str] = None,
+                 fonts_folders: Optional[List[str]] = None):
+        """:param workers: Number of worker processes, os.cpu_count() by default.
+        :param license_path: Path to the license file applied in each worker process. A missing file is an error,
+            so the workers never run in evaluation mode unnoticed.
+        :param fonts_folders: Folders with fonts that are scanned once and shared with every worker."""
+
+        fonts_folders = list(fonts_folders or [])
+        font_search_cache = None
+        if fonts_folders:
+            font_settings = aw.fonts.FontSettings()
+            font_settings.set_fonts_sources(WorkerPool.create_font_sources(fonts_folders))
+            with io.BytesIO() as cache_stream:
+                font_settings.save_search_cache(cache_stream)
+                font_search_cache = cache_stream.getvalue()
+
+        self.workers = workers if workers is not None else os.cpu_count()
+
+        # .NET runtime does not survive a fork, so the workers are always started from scratch.
+        context = multiprocessing.get_context('spawn')
+        start_barrier = context.Barrier(self.workers)
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                                                                initargs=(license_path, fonts_folders, font_search_cache, start_barrier))
+
+        # The executor starts processes only for submitted jobs. One job per worker, which waits for all the others,
+        # starts every worker and returns when all of them have been initialized.
+        try:
+            for future in [self._executor.submit(_wait_for_workers) for _ in range(self.workers)]:
+                future.result()
+        except BaseException:
+            self._executor.shutdown(wait=True)
+            raise
+
+    @staticmethod
+    def create_font_sources(fonts_folders: List[str]) -> list:
+        font_sources = [aw.fonts.SystemFontSource()]
+        for folder in fonts_folders:
+            font_sources.append(aw.fonts.FolderFontSource(folder, True))
+        return font_sources
+
+    def submit(self, job: Callable, *args) -> concurrent.futures.Future:
+        """Runs a job in one of the workers. The result is available through Future.result()."""
+        return self._executor.submit(job, *args)
+
+    def map_unordered(self, job: Callable, args_list: Iterable[tuple]) -> Iterator[Any]:
+        """Runs a job for every tuple of arguments and yields the results in the order in which the jobs finish.
+
+        At most two jobs per worker are submitted ahead, so the arguments can come from a generator of any length."""
+
+        pending = set()
+        for args in args_list:
+            pending.add(self._executor.submit(job, *args))
+            if len(pending) >= 2 * self.workers:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+    def close(self):
+        """Waits for the submitted jobs and stops the workers."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
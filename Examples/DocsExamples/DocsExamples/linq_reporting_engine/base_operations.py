@@ -1,7 +1,9 @@
+import concurrent.futures
 import io
 
 import aspose.words as aw
 from docs_examples_base import DocsExamplesBase, MY_DIR, ARTIFACTS_DIR, JSON_DIR
+from linq_reporting_engine import reporting_helper as helper
 
 class BaseOperations(DocsExamplesBase):
 
@@ -33,6 +35,192 @@ class BaseOperations(DocsExamplesBase):
         doc.save(ARTIFACTS_DIR + "ReportingEngine.single_row.docx")
         #ExEnd:SingleRow
 
+    def test_report_template_cache(self):
+
+        # Load the template once, every report is built on a clone of it.
+        report = helper.ReportTemplateCache.create(aw.Document(MY_DIR + "Reporting engine template - Table row.docx"))
+
+        def build_report(index):
+            return report.build_report(aw.reporting.JsonDataSource(JSON_DIR + "managers.json"), "Managers")
+
+        # Reports can be built from several threads at once, each with its own data source.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            docs = list(executor.map(build_report, range(8)))
+
+        docs[0].save(ARTIFACTS_DIR + "ReportingEngine.report_template_cache.docx")
+
+        foreach_tag = report.get_tags("foreach")[0]
+        self.assertEqual("m in Managers", foreach_tag.expression)
+        self.assertEqual(["m.Name"], [tag.expression for tag in foreach_tag.children])
+
+        expected_doc = aw.Document(MY_DIR + "Reporting engine template - Table row.docx")
+        aw.reporting.ReportingEngine().build_report(expected_doc, aw.reporting.JsonDataSource(JSON_DIR + "managers.json"), "Managers")
+        for doc in docs[1:]:
+            self.assertEqual(expected_doc.get_text(), doc.get_text())
+
+        # The clones of the template kept by the threads are released, a thread clones the template again when it needs it.
+        thread_template = report.get_thread_template()
+        self.assertIs(thread_template, report.get_thread_template())
+        report.clear()
+        self.assertIsNot(thread_template, report.get_thread_template())
+
+        # Templates with unbalanced tags are rejected when they are cached.
+        with self.assertRaises(ValueError):
+            helper.parse_tag_tree("<<foreach [m in Managers]>><<[m.Name]>><</if>>")
+
+        # A list of data sources needs a name for every data source.
+        with self.assertRaises(ValueError):
+            report.build_report([aw.reporting.JsonDataSource(JSON_DIR + "managers.json")])
+
+    def test_streaming_json_data_source(self):
+
+        report = helper.ReportTemplateCache.create(aw.Document(MY_DIR + "Reporting engine template - Nested data table.docx"))
+
+        # Find the members that the tags of the template use, such as "Managers[].Contracts[].Price".
+        member_paths = report.get_member_paths("Managers")
+
+        # The JSON file is read chunk by chunk and only the used members are passed on to JsonDataSource,
+        # so photos and other members that the template does not use are never loaded.
+        data_source = helper.StreamingJsonDataSource(JSON_DIR + "managers.json", member_paths, chunk_size=4096)
+
+        doc = report.build_report(data_source.data_source, "Managers")
+        doc.save(ARTIFACTS_DIR + "ReportingEngine.streaming_json_data_source.docx")
+
+        self.assertEqual({("name",), ("contracts", "price"), ("contracts", "client", "name")}, member_paths.whole_paths)
+        self.assertLess(data_source.projected_size * 100, data_source.source_size)
+
+        expected_doc = report.build_report(aw.reporting.JsonDataSource(JSON_DIR + "managers.json"), "Managers")
+        self.assertEqual(expected_doc.get_text(), doc.get_text())
+
+        # Members of contextual foreach tags and lambda parameters are found too.
+        member_paths = helper.ReportTemplateCache.create(aw.Document(MY_DIR + "Reporting engine template - Table with filtering.docx")).get_member_paths("contracts")
+        self.assertEqual({("date",), ("date", "year"), ("manager",), ("key",), ("price",)}, member_paths.whole_paths)
+
+        # Members of a variable whose value is not a member cannot be found, the whole data source is used then.
+        doc = aw.Document()
+        aw.DocumentBuilder(doc).write("<<var [m = Managers.First()]>><<[m.Name]>>: <<[m.Age]>>")
+        report = helper.ReportTemplateCache.create(doc)
+        member_paths = report.get_member_paths("Managers")
+        self.assertIn((), member_paths.whole_paths)
+        data_source = helper.StreamingJsonDataSource(JSON_DIR + "managers.json", member_paths)
+        doc = report.build_report(data_source.data_source, "Managers")
+        self.assertEqual(report.build_report(aw.reporting.JsonDataSource(JSON_DIR + "managers.json"), "Managers").get_text(), doc.get_text())
+
+        # Strings and numbers that span several chunks are read whole.
+        text = '{"Photo": "' + r'ab\\\"' * 1000 + '", "Age": -12.75e2}'
+        events = list(helper.iter_json_events(helper.JsonTokenReader(io.StringIO(text), 7)))
+        self.assertIn(("string", "ab\\\"" * 1000), events)
+        self.assertIn(("number", "-12.75e2"), events)
+
+    def test_data_source_schema(self):
+
+        template_md = b"<<foreach [in persons]>><<[Name]>>: <<[Age + 1]>>, <<[Birth]:\"dd.MM.yyyy\">>\n<</foreach>>"
+        load_options = aw.loading.LoadOptions()
+        load_options.load_format = aw.LoadFormat.MARKDOWN
+        xml = (b"<Persons><Person><Name>John Doe</Name><Age>30</Age><Birth>1989-04-01T16:00:00</Birth></Person>"
+            b"<Person><Name>Jane Doe</Name><Age>27</Age><Birth>1992-01-31T07:00:00</Birth></Person></Persons>")
+
+        # Infer the types of the elements from a sample once and keep them on disk.
+        schema = helper.DataSourceSchema.infer_xml(io.BytesIO(xml))
+        schema.save(ARTIFACTS_DIR + "ReportingEngine.data_source_schema.json")
+
+        # Data sources that are created with the schema take the types from its XSD schema instead of inferring them.
+        schema = helper.DataSourceSchema.load(ARTIFACTS_DIR + "ReportingEngine.data_source_schema.json")
+        doc = aw.Document(io.BytesIO(template_md), load_options)
+        engine = aw.reporting.ReportingEngine()
+        engine.build_report(doc, schema.create_xml_data_source(io.BytesIO(xml)), "persons")
+
+        doc.save(ARTIFACTS_DIR + "ReportingEngine.data_source_schema.docx")
+
+        self.assertEqual({"type": "date", "formats": ["yyyy-MM-ddTHH:mm:ss"]}, schema.members["Persons.Person.Birth"])
+        self.assertEqual({"type": "number", "integer": True}, schema.members["Persons.Person.Age"])
+        expected_doc = aw.Document(io.BytesIO(template_md), load_options)
+        engine.build_report(expected_doc, aw.reporting.XmlDataSource(io.BytesIO(xml)), "persons")
+        self.assertEqual(expected_doc.get_text(), doc.get_text())
+        self.assertIn("John Doe: 31, 01.04.1989", doc.get_text())
+
+        # Only ISO 8601 dates can be typed by an XSD schema.
+        with self.assertRaises(ValueError):
+            helper.DataSourceSchema({"Persons.Person.Birth": {"type": "date", "formats": ["MM/dd/yyyy"]}}).to_xsd()
+
+    def test_build_report_parallel(self):
+
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+
+        builder.writeln("Persons")
+        builder.start_table()
+        builder.insert_cell()
+        builder.write("Name")
+        builder.insert_cell()
+        builder.write("Age")
+        builder.end_row()
+        builder.insert_cell()
+        builder.write("<<foreach [p in persons]>><<[p.Name]>>")
+        builder.insert_cell()
+        builder.write("<<[p.Age]>><</foreach>>")
+        builder.end_row()
+        builder.end_table()
+        builder.writeln("Total age: <<[persons.Sum(p => p.Age)]>>")
+
+        builder.list_format.apply_number_default()
+        builder.writeln("<<foreach [p in persons]>><<[p.Name]>>")
+        builder.list_format.remove_numbers()
+        builder.writeln("<</foreach>>End of list")
+
+        csv = "Name,Age\n" + "".join(f"Person {i},{20 + i}\n" for i in range(12))
+
+        # The rows of the table are built by worker processes, three rows per process, and joined in the order of the data.
+        # The total and the numbered list are built once for all persons.
+        report = helper.build_report_parallel(doc, io.BytesIO(csv.encode("utf-8")), "persons",
+            aw.reporting.CsvDataLoadOptions(True), shard_size=3, max_workers=2)
+        report.save(ARTIFACTS_DIR + "ReportingEngine.build_report_parallel.docx")
+
+        # The report is the same as the one built in one process.
+        expected_doc = doc.clone().as_document()
+        aw.reporting.ReportingEngine().build_report(expected_doc,
+            aw.reporting.CsvDataSource(io.BytesIO(csv.encode("utf-8")), aw.reporting.CsvDataLoadOptions(True)), "persons")
+        expected_doc.save(ARTIFACTS_DIR + "ReportingEngine.build_report_parallel.expected.docx")
+        self.assertEqual(expected_doc.get_text(), report.get_text())
+        self.assertEqual(13, report.first_section.body.tables[0].rows.count)
+
+        # The total is built from the "Age" column only.
+        doc = aw.Document()
+        aw.DocumentBuilder(doc).write("Total age: <<[persons.Sum(p => p.Age)]>>")
+        member_paths = helper.ReportTemplateCache.create(doc).get_member_paths("persons")
+        self.assertEqual([1], helper.get_used_columns(member_paths, ["Name", "Age"]))
+
+        # Paragraphs of numbered lists continue the numbering from shard to shard.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+        builder.list_format.apply_number_default()
+        builder.writeln("<<foreach [p in persons]>><<[p.Name]>>")
+        builder.list_format.remove_numbers()
+        builder.writeln("<</foreach>>Count: <<[persons.Count()]>>")
+
+        with open(ARTIFACTS_DIR + "ReportingEngine.build_report_parallel.csv", "w", encoding="utf-8") as stream:
+            stream.write(csv)
+        report = helper.build_report_parallel(doc, ARTIFACTS_DIR + "ReportingEngine.build_report_parallel.csv", "persons",
+            aw.reporting.CsvDataLoadOptions(True), shard_size=4, max_workers=2)
+
+        expected_doc = doc.clone().as_document()
+        aw.reporting.ReportingEngine().build_report(expected_doc,
+            aw.reporting.CsvDataSource(io.BytesIO(csv.encode("utf-8")), aw.reporting.CsvDataLoadOptions(True)), "persons")
+        self.assertEqual(expected_doc.get_text(), report.get_text())
+
+        report.update_list_labels()
+        expected_doc.update_list_labels()
+        labels = [paragraph.as_paragraph().list_label.label_string for paragraph in report.first_section.body.paragraphs]
+        self.assertEqual([paragraph.as_paragraph().list_label.label_string for paragraph in expected_doc.first_section.body.paragraphs], labels)
+        self.assertIn("12.", labels)
+        self.assertEqual(expected_doc.lists.count, report.lists.count)
+
+        # The foreach tag must repeat whole table rows or whole paragraphs.
+        doc = aw.Document()
+        aw.DocumentBuilder(doc).write("Names: <<foreach [p in persons]>><<[p.Name]>> <</foreach>>")
+        with self.assertRaises(ValueError):
+            helper.build_report_parallel(doc, io.BytesIO(csv.encode("utf-8")), "persons", aw.reporting.CsvDataLoadOptions(True))
+
     def test_common_master_detail(self):
 
         #ExStart:CommonMasterDetail
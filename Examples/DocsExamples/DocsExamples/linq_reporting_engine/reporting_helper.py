@@ -0,0 +1,1176 @@
+import bisect
+import collections
+import concurrent.futures
+import csv
+import datetime
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import uuid
+import xml.etree.ElementTree as ElementTree
+
+import aspose.words as aw
+
+TAG_START = "<<"
+TAG_END = ">>"
+
+# Tags that split a container tag into branches, they are not containers of their own.
+BRANCH_TAG_NAMES = ["else", "elseif"]
+
+# Tokens of a template expression: string literals, member access chains, such as "m.Client.Name", lambdas and brackets.
+EXPRESSION_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|(?P<chain>[A-Za-z_]\w*(?:\s*\.\s*[A-Za-z_]\w*)*)|=>|\S')
+EXPRESSION_KEYWORDS = ["true", "false", "null", "new", "typeof", "is", "as", "in"]
+FOREACH_EXPRESSION = re.compile(r"^\s*(?:(?:[\w.]+\s+)?(\w+)\s+)?in\s+(.+)$", re.S)
+VAR_EXPRESSION = re.compile(r"^\s*(?:[\w.]+\s+)?(\w+)\s*=(?!=)\s*(.+)$", re.S)
+# Simple values of XML elements and JSON arrays are referenced by the element name with this suffix, such as "Child_Text".
+TEXT_MEMBER_SUFFIX = "_text"
+
+JSON_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+# Characters of a number, a chunk that ends with "12." or "1e" is not the end of the number.
+JSON_NUMBER_TEXT = re.compile(r"[-+.\deE]+")
+JSON_NAME = re.compile(r"[A-Za-z_$][\w$]*")
+JSON_WHITESPACE = re.compile(r"\s*")
+# The text of a JSON string up to its closing quote or up to a backslash at the end of the chunk.
+JSON_STRING_TEXT = re.compile(r"(?:[^\"\\]|\\.)*", re.S)
+
+# Formats of date-time values that a schema recognizes in a sample, as .NET formats and the matching Python formats.
+SCHEMA_DATE_FORMATS = [("yyyy-MM-ddTHH:mm:ss", "%Y-%m-%dT%H:%M:%S"), ("yyyy-MM-dd", "%Y-%m-%d"),
+    ("yyyy-MM-dd h:mm:ss tt", "%Y-%m-%d %I:%M:%S %p"), ("MM/dd/yyyy", "%m/%d/%Y")]
+# Only ISO 8601 dates can be typed by an XSD schema.
+XSD_DATE_TYPES = {"yyyy-MM-ddTHH:mm:ss": "xs:dateTime", "yyyy-MM-dd": "xs:date"}
+SCHEMA_NUMBER = re.compile(r"^-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?$")
+SCHEMA_INTEGER = re.compile(r"^-?\d+$")
+
+# A member that is used as a whole is copied with all its content, a member on the way to the used members
+# keeps only its structure: objects keep the used members, arrays keep all their items.
+WHOLE_MEMBER = 2
+MEMBER_STRUCTURE = 1
+
+
+class ReportTag():
+
+    def __init__(self, name: str, expression: str, arguments: str, position: int):
+
+        # An expression tag, such as <<[m.Name]>>, has no name.
+        self.name = name
+        self.expression = expression
+        self.arguments = arguments
+        self.position = position
+        self.end = position
+        self.children = ()
+        # Switches of the closing tag, such as "-greedy" in <</foreach -greedy>>. None for a tag that is not a container.
+        self.closing_arguments = None
+        self.closing_tag = None
+
+    @property
+    def is_container(self):
+
+        return self.closing_arguments is not None
+
+    def walk(self):
+
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def read_bracket(text: str, start: int):
+
+    # Returns the end of the expression in square brackets that starts at "start".
+    # Expressions can contain brackets and string literals, for example, <<[s.Split("[")[0]]>>.
+    depth = 0
+    quote = None
+    i = start
+    while i < len(text):
+        char = text[i]
+        if quote is not None:
+            if char == "\\":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+
+    raise ValueError(f"The expression at {start} is not closed.")
+
+
+def read_tags(text: str):
+
+    # Reads the tags in the order of the template text as pairs of a closing flag and a tag.
+    tags = []
+    position = text.find(TAG_START)
+    while position >= 0:
+        i = position + len(TAG_START)
+        is_closing = text.startswith("/", i)
+        if is_closing:
+            i += 1
+
+        name_start = i
+        while i < len(text) and text[i].isalpha():
+            i += 1
+        name = text[name_start:i]
+        while i < len(text) and text[i] == " ":
+            i += 1
+
+        expression = None
+        if text.startswith("[", i):
+            end = read_bracket(text, i)
+            expression = text[i + 1:end - 1]
+            i = end
+
+        end = text.find(TAG_END, i)
+        if end < 0:
+            raise ValueError(f"The tag at {position} is not closed.")
+
+        # Text between "<<" and ">>" that starts with neither a name nor an expression is not a tag.
+        if name or expression is not None:
+            tag = ReportTag(name, expression, text[i:end].strip(), position)
+            tag.end = end + len(TAG_END)
+            tags.append((is_closing, tag))
+        position = text.find(TAG_START, end + len(TAG_END))
+
+    return tags
+
+
+def parse_tag_tree(text: str, is_chart: bool = False):
+
+    # A tag is a container when the template has its closing tag, such as <</foreach>>.
+    # The other tags, including expression tags and <<else>>, become children of the innermost open container.
+    # A foreach tag in the title of a chart has no closing tag, it is closed at the end of the chart.
+    tags = read_tags(text)
+    container_names = {tag.name for is_closing, tag in tags if is_closing}
+    if is_chart:
+        container_names.add("foreach")
+
+    root = ReportTag("", None, "", -1)
+    root.closing_arguments = ""
+    stack = [(root, [])]
+    for is_closing, tag in tags:
+        if is_closing:
+            container, children = stack[-1]
+            if container is root or container.name != tag.name:
+                raise ValueError(f"The <</{tag.name}>> tag at {tag.position} has no opening tag.")
+            stack.pop()
+            container.children = tuple(children)
+            container.closing_arguments = tag.arguments
+            container.closing_tag = tag
+            continue
+
+        stack[-1][1].append(tag)
+        if tag.name in container_names and tag.name not in BRANCH_TAG_NAMES:
+            stack.append((tag, []))
+
+    while is_chart and len(stack) > 1:
+        container, children = stack.pop()
+        container.children = tuple(children)
+        container.closing_arguments = ""
+
+    if len(stack) > 1:
+        tag = stack[-1][0]
+        raise ValueError(f"The <<{tag.name}>> tag at {tag.position} is not closed.")
+
+    root.children = tuple(stack[0][1])
+    return root
+
+
+class ReportTemplateCache():
+
+    # Keeps a template in memory so that reports are built without loading the template file every time.
+    # ReportingEngine parses the tags of the template again for every report, the cache does not change this.
+    # Its tags are parsed once to reject templates with unbalanced tags early and to find the data members
+    # that the template uses. Every thread that builds reports keeps a clone of the template until the thread ends
+    # or the cache is cleared, call clear() when the threads of a long-lived pool are done with the template.
+
+    def __init__(self, template_doc: aw.Document, tag_tree: ReportTag, options, missing_member_message: str):
+
+        # The cached template is private, every report is built on a clone of it.
+        self._template = template_doc.clone().as_document()
+        self._tag_tree = tag_tree
+        self._options = options
+        self._missing_member_message = missing_member_message
+        # Every thread clones its own copy of the template, so no document is read by two threads at once.
+        self._lock = threading.Lock()
+        self._thread_templates = threading.local()
+
+    @staticmethod
+    def create(template_doc: aw.Document, options=aw.reporting.ReportBuildOptions.NONE, missing_member_message: str = ""):
+
+        # Parse the tags of the template, including the tags in headers and footers.
+        # A template with unbalanced tags fails here, not when the first report is built.
+        tag_tree = parse_tag_tree(template_doc.get_text())
+
+        # Tags of a chart are in its title and series names, they follow the tags of the text.
+        tags = list(tag_tree.children)
+        for shape in template_doc.get_child_nodes(aw.NodeType.SHAPE, True):
+            shape = shape.as_shape()
+            if shape.has_chart:
+                chart = shape.chart
+                text = chart.title.text + "".join(series.name for series in chart.series)
+                tags.extend(parse_tag_tree(text, True).children)
+        tag_tree.children = tuple(tags)
+
+        return ReportTemplateCache(template_doc, tag_tree, options, missing_member_message)
+
+    @property
+    def tag_tree(self):
+
+        return self._tag_tree
+
+    @property
+    def options(self):
+
+        return self._options
+
+    @property
+    def missing_member_message(self):
+
+        return self._missing_member_message
+
+    def get_tags(self, name: str = None):
+
+        # Gets the tags of the template in document order, or only the tags with the given name.
+        return [tag for tag in self._tag_tree.walk() if tag is not self._tag_tree and (name is None or tag.name == name)]
+
+    def get_member_paths(self, data_source_name: str = None):
+
+        # Gets the paths of the data source members that the tags of the template reference.
+        analyzer = MemberPathAnalyzer(data_source_name)
+        analyzer.analyze_tags(self._tag_tree.children, {}, ())
+        return analyzer.paths
+
+    def build_report(self, data_source, data_source_name: str = None):
+
+        # Builds a report on a clone of the cached template. Can be called from several threads at once,
+        # each call has its own document and its own ReportingEngine.
+        # Several data sources are given as a list together with a list of their names.
+        if isinstance(data_source, (list, tuple)):
+            if not isinstance(data_source_name, (list, tuple)) or len(data_source_name) != len(data_source):
+                raise ValueError("A list of data sources needs a list of data source names of the same length.")
+        elif isinstance(data_source_name, (list, tuple)):
+            raise ValueError("A list of data source names needs a list of data sources.")
+
+        doc = self.get_thread_template().clone().as_document()
+
+        engine = aw.reporting.ReportingEngine()
+        engine.options = self._options
+        engine.missing_member_message = self._missing_member_message
+
+        if isinstance(data_source, (list, tuple)):
+            engine.build_report(doc, list(data_source), list(data_source_name))
+        elif data_source_name is None:
+            engine.build_report(doc, data_source)
+        else:
+            engine.build_report(doc, data_source, data_source_name)
+
+        return doc
+
+    def get_thread_template(self):
+
+        template = getattr(self._thread_templates, "template", None)
+        if template is None:
+            with self._lock:
+                template = self._template.clone().as_document()
+            self._thread_templates.template = template
+
+        return template
+
+    def clear(self):
+
+        # Releases the clones of the template kept by the threads. A thread clones the template again
+        # the next time it builds a report. Reports that are being built keep their own documents.
+        with self._lock:
+            self._thread_templates = threading.local()
+
+
+def get_tag_expressions(tag: ReportTag):
+
+    # Some tags have more than one expression, such as <<link [uri] [text]>>, the others are in the arguments.
+    expressions = [] if tag.expression is None else [tag.expression]
+    i = 0
+    while i < len(tag.arguments):
+        char = tag.arguments[i]
+        if char in "\"'":
+            end = tag.arguments.find(char, i + 1)
+            i = len(tag.arguments) if end < 0 else end + 1
+        elif char == "[":
+            end = read_bracket(tag.arguments, i)
+            expressions.append(tag.arguments[i + 1:end - 1])
+            i = end
+        else:
+            i += 1
+
+    return expressions
+
+
+class MemberPathSet():
+
+    def __init__(self):
+
+        # Paths are tuples of lower case member names from the root of the data source. Arrays do not add a name,
+        # so "Managers[].Contracts[].Client.Name" is ("managers", "contracts", "client", "name").
+        self.whole_paths = set()
+        self.prefixes = {()}
+
+    def add(self, path: tuple, is_whole: bool):
+
+        if is_whole:
+            self.whole_paths.add(path)
+        for i in range(len(path) + 1):
+            self.prefixes.add(path[:i])
+
+    def match(self, json_path: tuple):
+
+        # A JSON root object that wraps the data in a single member, such as {"Managers": [...]}, is the data source
+        # of that member, so paths are matched with and without the first member name.
+        # That keeps the structure of the other top-level members, but not their content.
+        result = None
+        for path in (json_path, json_path[1:]) if json_path else (json_path,):
+            if any(path[:i] in self.whole_paths for i in range(len(path) + 1)):
+                return WHOLE_MEMBER
+            if path in self.prefixes:
+                result = MEMBER_STRUCTURE
+
+        return result
+
+
+class MemberPathAnalyzer():
+
+    def __init__(self, data_source_name: str = None):
+
+        self.data_source_name = None if data_source_name is None else data_source_name.lower()
+        self.paths = MemberPathSet()
+
+    def analyze_tags(self, tags, scope: dict, context: tuple):
+
+        # "scope" maps the names of variables to the paths they stand for, "context" is the path of the items
+        # of the innermost <<foreach [in ...]>> without a variable, whose members are referenced by their names.
+        scope = dict(scope)
+        for tag in tags:
+            if tag.name == "foreach" and tag.expression is not None:
+                match = FOREACH_EXPRESSION.match(tag.expression)
+                if match is not None:
+                    item_path = self.analyze_expression(match.group(2), scope, context, True)
+                    if match.group(1) is not None:
+                        self.analyze_tags(tag.children, {**scope, match.group(1).lower(): item_path}, context)
+                    else:
+                        self.analyze_tags(tag.children, scope, context if item_path is None else item_path)
+                    continue
+
+            if tag.name == "var" and tag.expression is not None:
+                match = VAR_EXPRESSION.match(tag.expression)
+                if match is not None:
+                    scope[match.group(1).lower()] = self.analyze_expression(match.group(2), scope, context, False)
+                    continue
+
+            for expression in get_tag_expressions(tag):
+                self.analyze_expression(expression, scope, context, False)
+            self.analyze_tags(tag.children, scope, context)
+
+    def analyze_expression(self, expression: str, scope: dict, context: tuple, is_sequence: bool):
+
+        # Adds the members that the expression references and returns the path of its leading member chain.
+        # Members of a sequence that a foreach tag iterates or a method, such as Sum or Count, is called on are
+        # added as structure only, the members that lambdas take from its items are added separately.
+        tokens = [(match.group(), match.group("chain")) for match in EXPRESSION_TOKEN.finditer(expression)]
+        scope = dict(scope)
+        call_targets = []
+        next_call_target = None
+        last_path = None
+        leading_path = None
+        for i, (token, chain) in enumerate(tokens):
+            previous_token = tokens[i - 1][0] if i > 0 else ""
+            next_token = tokens[i + 1][0] if i + 1 < len(tokens) else ""
+
+            if token in "([":
+                call_targets.append(next_call_target if token == "(" else None)
+                next_call_target = None
+            elif token in ")]":
+                target = call_targets.pop() if call_targets else None
+                last_path = target if token == ")" else last_path
+            elif chain is None:
+                continue
+            elif next_token == "=>":
+                # The parameter of a lambda stands for an item of the sequence that the method is called on.
+                target = next((target for target in reversed(call_targets) if target is not None), None)
+                scope[chain.lower()] = target
+            else:
+                names = [name.strip().lower() for name in chain.split(".")]
+                is_method = next_token == "("
+                if is_method:
+                    names = names[:-1]
+
+                # A chain after "." continues the result of a method call, such as "First().Name".
+                if previous_token == ".":
+                    path = None if last_path is None else last_path + tuple(names)
+                    is_resolved = path is not None or not names
+                else:
+                    # A method without an object, such as Sum in <<foreach [in persons]>><<[Sum(p => p.Age)]>>,
+                    # is called on the current item.
+                    path = self.resolve(names, scope, context) if names else context
+                    is_resolved = path is not None or names[0] in EXPRESSION_KEYWORDS
+
+                # The members of a variable whose value is not a member, such as <<var [m = Managers.First()]>>,
+                # cannot be found, so the whole data source is used.
+                if not is_resolved:
+                    self.paths.add((), True)
+                if path is not None:
+                    self.paths.add(path, not is_method and not (is_sequence and i == 0))
+                if is_method:
+                    next_call_target = path
+                last_path = path
+                # The result of a method is a sequence of the same items only when a foreach tag iterates it, such as Where.
+                if i == 0 and (is_sequence or not is_method):
+                    leading_path = path
+
+        return leading_path
+
+    def resolve(self, names: list, scope: dict, context: tuple):
+
+        first = names[0]
+        if first in scope:
+            return None if scope[first] is None else scope[first] + tuple(self.get_member_names(names[1:]))
+        if first in EXPRESSION_KEYWORDS:
+            return None
+        if first == self.data_source_name:
+            return tuple(self.get_member_names(names[1:]))
+
+        # A name that is neither a variable nor the data source is a member of the current item or of the root object.
+        # Type names, such as "DateTime", are added too, but no JSON member has such a path.
+        return context + tuple(self.get_member_names(names))
+
+    @staticmethod
+    def get_member_names(names: list):
+
+        if names and names[-1].endswith(TEXT_MEMBER_SUFFIX):
+            return names[:-1] + [names[-1][:-len(TEXT_MEMBER_SUFFIX)]]
+
+        return names
+
+
+class JsonTokenReader():
+
+    def __init__(self, stream, chunk_size: int):
+
+        # Only the current chunk of the text is held in memory, a token that does not fit in it is read with the next chunk.
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.read_size = 0
+
+    def read_chunk(self):
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+
+        self.read_size += len(chunk)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def read_match(self, pattern):
+
+        # A number or a name at the end of the chunk can continue in the next chunk.
+        while True:
+            match = pattern.match(self.buffer, self.position)
+            if match.end() < len(self.buffer) or not self.read_chunk():
+                self.position = match.end()
+                return match.group()
+
+    def read_string(self):
+
+        # A string that does not fit in the chunk, such as an image in Base64, is collected chunk by chunk
+        # and decoded once its closing quote is read.
+        text = self.buffer
+        head = self.position
+        start = head + 1
+        parts = []
+        while True:
+            end = JSON_STRING_TEXT.match(text, start).end()
+            if end < len(text) and text[end] == '"':
+                break
+
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                raise ValueError("A string in JSON is not closed.")
+            self.read_size += len(chunk)
+            # Only the backslash at the end of the text, if any, is scanned again.
+            parts.append(text[head:end])
+            text = text[end:] + chunk
+            head = 0
+            start = 0
+
+        if parts:
+            parts.append(text)
+            text = "".join(parts)
+        self.buffer = text
+        value, self.position = json.decoder.scanstring(text, head + 1, False)
+        return value
+
+    def tokens(self):
+
+        while True:
+            self.position = JSON_WHITESPACE.match(self.buffer, self.position).end()
+            if self.position >= len(self.buffer):
+                if not self.read_chunk():
+                    return
+                continue
+
+            char = self.buffer[self.position]
+            if char in "{}[]:,":
+                self.position += 1
+                yield char, None
+            elif char == '"':
+                yield "string", self.read_string()
+            elif char == "-" or char.isdigit():
+                number = self.read_match(JSON_NUMBER_TEXT)
+                if not JSON_NUMBER.fullmatch(number):
+                    raise ValueError(f"Unexpected number '{number}' in JSON.")
+                yield "number", number
+            elif JSON_NAME.match(char):
+                # Names are the "true", "false" and "null" literals or member names without quotes,
+                # which JsonDataSource accepts too.
+                yield "name", self.read_match(JSON_NAME)
+            else:
+                raise ValueError(f"Unexpected character '{char}' in JSON at {self.read_size - len(self.buffer) + self.position}.")
+
+
+def iter_json_events(reader: JsonTokenReader):
+
+    # Reads JSON text as ijson-style events: "start_map", "map_key", "end_map", "start_array", "end_array",
+    # "string", "number", "boolean" and "null". Numbers are returned as their text, so they are copied as they are.
+    containers = []
+    is_key = False
+    for kind, value in reader.tokens():
+        if kind == "{":
+            containers.append(kind)
+            is_key = True
+            yield "start_map", None
+        elif kind == "[":
+            containers.append(kind)
+            yield "start_array", None
+        elif kind in ("}", "]"):
+            containers.pop()
+            is_key = False
+            yield "end_map" if kind == "}" else "end_array", None
+        elif kind == ",":
+            is_key = containers[-1] == "{"
+        elif kind == ":":
+            is_key = False
+        elif is_key:
+            yield "map_key", value
+        elif kind in ("string", "number"):
+            yield kind, value
+        elif value in ("true", "false"):
+            yield "boolean", value == "true"
+        elif value == "null":
+            yield "null", None
+        else:
+            raise ValueError(f"Unexpected name '{value}' in JSON.")
+
+
+def open_text_stream(source, newline=None):
+
+    # "source" is a file name or a binary stream.
+    # Bytes that are not UTF-8 are read as replacement characters, the same as data sources read them.
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8-sig", errors="replace", newline=newline)
+
+    return io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline=newline)
+
+
+def close_text_stream(source, stream):
+
+    # A stream that was passed in is left open.
+    if isinstance(source, str):
+        stream.close()
+    else:
+        stream.detach()
+
+
+class StreamingJsonDataSource():
+
+    def __init__(self, source, member_paths: MemberPathSet = None, options: aw.reporting.JsonDataLoadOptions = None,
+        chunk_size: int = 65536):
+
+        # The JSON text is read chunk by chunk and only the members in "member_paths" are kept, so JsonDataSource
+        # loads and types only the data that the template uses. All members are kept when "member_paths" is None.
+        self.member_paths = member_paths
+        stream = open_text_stream(source)
+        try:
+            reader = JsonTokenReader(stream, chunk_size)
+            events = iter_json_events(reader)
+            parts = []
+            for event, value in events:
+                self.copy_value(events, event, value, (), WHOLE_MEMBER if member_paths is None else member_paths.match(()), parts)
+            self.source_size = reader.read_size
+        finally:
+            close_text_stream(source, stream)
+
+        projected = "".join(parts).encode("utf-8")
+        self.projected_size = len(projected)
+        if options is None:
+            self.data_source = aw.reporting.JsonDataSource(io.BytesIO(projected))
+        else:
+            self.data_source = aw.reporting.JsonDataSource(io.BytesIO(projected), options)
+
+    def copy_value(self, events, event: str, value, path: tuple, match: int, parts: list):
+
+        if event == "start_map":
+            parts.append("{")
+            count = 0
+            for event, key in events:
+                if event == "end_map":
+                    break
+
+                member_path = path + (key.lower(),)
+                member_match = WHOLE_MEMBER if match == WHOLE_MEMBER else self.member_paths.match(member_path)
+                event, value = next(events)
+                if member_match is None:
+                    self.skip_value(events, event)
+                    continue
+
+                if count:
+                    parts.append(",")
+                parts.append(json.dumps(key, ensure_ascii=False) + ":")
+                self.copy_value(events, event, value, member_path, member_match, parts)
+                count += 1
+            parts.append("}")
+
+        elif event == "start_array":
+            parts.append("[")
+            count = 0
+            for event, value in events:
+                if event == "end_array":
+                    break
+
+                if count:
+                    parts.append(",")
+                self.copy_value(events, event, value, path, match, parts)
+                count += 1
+            parts.append("]")
+
+        elif event == "string":
+            parts.append(json.dumps(value, ensure_ascii=False))
+        elif event == "number":
+            parts.append(value)
+        elif event == "boolean":
+            parts.append("true" if value else "false")
+        else:
+            parts.append("null")
+
+    @staticmethod
+    def skip_value(events, event: str):
+
+        # The events of a skipped member are read, but nothing of it is kept.
+        depth = 1 if event in ("start_map", "start_array") else 0
+        while depth:
+            event, value = next(events)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+
+
+def infer_text_type(text: str):
+
+    # Infers the type of a simple value that is given as text, the same way as the data sources do.
+    if text in ("true", "false"):
+        return {"type": "boolean"}
+    if SCHEMA_NUMBER.match(text):
+        return {"type": "number", "integer": SCHEMA_INTEGER.match(text) is not None}
+    for net_format, python_format in SCHEMA_DATE_FORMATS:
+        try:
+            datetime.datetime.strptime(text, python_format)
+            return {"type": "date", "formats": [net_format]}
+        except ValueError:
+            pass
+
+    return {"type": "string"}
+
+
+def merge_member(members: dict, path: str, member: dict):
+
+    # Values of a member with different types in the sample are strings, the same as without a schema.
+    # Empty XML elements do not tell the type, XML elements with child elements are never simple values.
+    known_member = members.get(path)
+    if known_member is None or known_member.get("empty"):
+        members[path] = dict(member, repeated=known_member["repeated"]) if known_member and "repeated" in known_member else member
+    elif member.get("empty"):
+        return
+    elif known_member["type"] != member["type"]:
+        members[path] = {"type": "element" if "element" in (known_member["type"], member["type"]) else "string"}
+        if "repeated" in known_member:
+            members[path]["repeated"] = known_member["repeated"]
+    elif member["type"] == "number":
+        known_member["integer"] = known_member["integer"] and member["integer"]
+    elif member["type"] == "date":
+        known_member["formats"] += [net_format for net_format in member["formats"] if net_format not in known_member["formats"]]
+    elif member["type"] == "element":
+        known_member["repeated"] = known_member["repeated"] or member["repeated"]
+
+
+class DataSourceSchema():
+
+    # Fixes the types of the values of XML data sources, so that they do not depend on the values of every file.
+    # XmlDataSource takes the types from an XSD schema instead of inferring them from the whole file.
+    # JsonDataSource and CsvDataSource have no options that would make loading faster with known types,
+    # so there are no JSON or CSV schemas.
+
+    def __init__(self, members: dict = None):
+
+        # "members" maps the paths of the elements and attributes with simple values, such as "Persons.Person.Name", to their types.
+        # Paths start with the root element, attributes start with "@".
+        self.members = {} if members is None else members
+
+    @staticmethod
+    def infer_xml(sample):
+
+        # Infers the types of the elements and attributes from a sample XML file or stream.
+        schema = DataSourceSchema()
+        path = []
+        child_counts = []
+        for event, element in ElementTree.iterparse(sample, ("start", "end")):
+            if event == "start":
+                path.append(element.tag)
+                child_counts.append({})
+                for name, value in element.attrib.items():
+                    merge_member(schema.members, ".".join(path + ["@" + name]), infer_text_type(value.strip()))
+                continue
+
+            counts = child_counts.pop()
+            if counts:
+                member = {"type": "element", "repeated": False}
+            else:
+                text = (element.text or "").strip()
+                member = infer_text_type(text) if text else {"type": "string", "empty": True}
+            merge_member(schema.members, ".".join(path), member)
+
+            # An element that occurs more than once in its parent is a sequence.
+            for tag, count in counts.items():
+                if count > 1:
+                    schema.members[".".join(path + [tag])]["repeated"] = True
+
+            path.pop()
+            if child_counts:
+                child_counts[-1][element.tag] = child_counts[-1].get(element.tag, 0) + 1
+            element.clear()
+
+        return schema
+
+    def save(self, file_name: str):
+
+        with open(file_name, "w", encoding="utf-8") as stream:
+            json.dump({"members": self.members}, stream, indent=2)
+
+    @staticmethod
+    def load(file_name: str):
+
+        with open(file_name, "r", encoding="utf-8") as stream:
+            data = json.load(stream)
+
+        return DataSourceSchema(data["members"])
+
+    def create_xml_data_source(self, source):
+
+        # XmlDataSource takes the types of the values from an XSD schema instead of inferring them.
+        return aw.reporting.XmlDataSource(source, io.BytesIO(self.to_xsd().encode("utf-8")))
+
+    def to_xsd(self):
+
+        # Builds the tree of the elements from their paths.
+        root = {}
+        for path, member in self.members.items():
+            node = root
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+            node[""] = member
+
+        lines = ['<?xml version="1.0" encoding="utf-8"?>', '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">']
+        for name, node in root.items():
+            self.write_xsd_element(name, node, lines, "  ", True)
+        lines.append("</xs:schema>")
+        return "\n".join(lines)
+
+    def write_xsd_element(self, name: str, node: dict, lines: list, indent: str, is_root: bool = False):
+
+        # Elements can be missing in the data, the root element cannot.
+        member = node.get("", {"type": "element"})
+        occurs = "" if is_root else ' minOccurs="0" maxOccurs="unbounded"' if member.get("repeated") else ' minOccurs="0"'
+        elements = [(child_name, child) for child_name, child in node.items() if child_name and not child_name.startswith("@")]
+        attributes = [(child_name[1:], child[""]) for child_name, child in node.items() if child_name.startswith("@")]
+
+        # A simple element that repeats is a table with a "<name>_Text" column, the same as without a schema.
+        if member["type"] != "element" and not attributes and not member.get("repeated"):
+            lines.append(f'{indent}<xs:element name="{name}" type="{self.get_xsd_type(member)}"{occurs} />')
+            return
+
+        lines.append(f'{indent}<xs:element name="{name}"{occurs}>')
+        lines.append(f'{indent}  <xs:complexType>')
+        if member["type"] != "element":
+            lines.append(f'{indent}    <xs:simpleContent>')
+            lines.append(f'{indent}      <xs:extension base="{self.get_xsd_type(member)}">')
+            for attribute_name, attribute in attributes:
+                lines.append(f'{indent}        <xs:attribute name="{attribute_name}" type="{self.get_xsd_type(attribute)}" />')
+            lines.append(f'{indent}      </xs:extension>')
+            lines.append(f'{indent}    </xs:simpleContent>')
+        else:
+            lines.append(f'{indent}    <xs:sequence>')
+            for child_name, child in elements:
+                self.write_xsd_element(child_name, child, lines, indent + "      ")
+            lines.append(f'{indent}    </xs:sequence>')
+            for attribute_name, attribute in attributes:
+                lines.append(f'{indent}    <xs:attribute name="{attribute_name}" type="{self.get_xsd_type(attribute)}" />')
+        lines.append(f'{indent}  </xs:complexType>')
+        lines.append(f'{indent}</xs:element>')
+
+    @staticmethod
+    def get_xsd_type(member: dict):
+
+        if member["type"] == "number":
+            return "xs:long" if member["integer"] else "xs:decimal"
+        if member["type"] == "boolean":
+            return "xs:boolean"
+        if member["type"] == "date":
+            xsd_types = {XSD_DATE_TYPES.get(net_format) for net_format in member["formats"]}
+            if None in xsd_types:
+                raise ValueError(f"Dates in the {member['formats']} formats cannot be typed by an XSD schema, use ISO 8601 dates.")
+            return "xs:date" if xsd_types == {"xs:date"} else "xs:dateTime"
+
+        return "xs:string"
+
+
+def get_text_paragraphs(doc: aw.Document):
+
+    # Paragraphs of the main text. Paragraphs of text boxes are a part of the text of the paragraphs that contain them.
+    return [paragraph.as_paragraph() for paragraph in doc.get_child_nodes(aw.NodeType.PARAGRAPH, True)
+        if paragraph.get_ancestor(aw.NodeType.SHAPE) is None and paragraph.get_ancestor(aw.NodeType.HEADER_FOOTER) is None]
+
+
+def get_paragraph_text(paragraph: aw.Paragraph):
+
+    return paragraph.get_text().strip("\r\x07\x0c ")
+
+
+def create_csv_load_options(csv_options: dict):
+
+    options = aw.reporting.CsvDataLoadOptions(csv_options["has_headers"])
+    options.delimiter = csv_options["delimiter"]
+    options.quote_char = csv_options["quote_char"]
+    options.comment_char = csv_options["comment_char"]
+    return options
+
+
+class ReportRegion():
+
+    def __init__(self, first_node: aw.Node, last_node: aw.Node, is_table_rows: bool):
+
+        # The table rows or the paragraphs that a foreach tag repeats.
+        self.first_node = first_node
+        self.last_node = last_node
+        self.is_table_rows = is_table_rows
+        self.closing_tag_length = 0
+
+    @staticmethod
+    def find(doc: aw.Document):
+
+        # Finds the first foreach tag of the main text that is not inside another tag.
+        paragraphs = get_text_paragraphs(doc)
+        texts = [paragraph.get_text() for paragraph in paragraphs]
+        starts = []
+        length = 0
+        for text in texts:
+            starts.append(length)
+            length += len(text)
+
+        tag = next((tag for tag in parse_tag_tree("".join(texts)).children if tag.name == "foreach"), None)
+        if tag is None:
+            raise ValueError("The template has no foreach tag outside other tags.")
+
+        opening_index = bisect.bisect_right(starts, tag.position) - 1
+        closing_index = bisect.bisect_right(starts, tag.closing_tag.position) - 1
+        opening_paragraph = paragraphs[opening_index]
+        closing_paragraph = paragraphs[closing_index]
+
+        # A table-row band starts in the first cell of a row and ends in the last cell of the same or another row.
+        opening_cell = opening_paragraph.get_ancestor(aw.NodeType.CELL)
+        closing_cell = closing_paragraph.get_ancestor(aw.NodeType.CELL)
+        if opening_cell is not None and closing_cell is not None and opening_cell != closing_cell:
+            opening_cell = opening_cell.as_cell()
+            closing_cell = closing_cell.as_cell()
+            if (opening_cell.is_first_cell and closing_cell.is_last_cell
+                and opening_cell.parent_row.parent_table == closing_cell.parent_row.parent_table):
+                return ReportRegion(opening_cell.parent_row, closing_cell.parent_row, True)
+
+        # Otherwise the band must consist of whole paragraphs, so the parts of different shards do not share a paragraph.
+        if (opening_paragraph != closing_paragraph and opening_paragraph.parent_node == closing_paragraph.parent_node
+            and tag.position == starts[opening_index] and tag.closing_tag.position == starts[closing_index]):
+            region = ReportRegion(opening_paragraph, closing_paragraph, False)
+            region.closing_tag_length = tag.closing_tag.end - tag.closing_tag.position
+            return region
+
+        raise ValueError("The foreach tag must span table rows, or start a paragraph and be closed at the start of another paragraph.")
+
+    def insert_markers(self, text: str):
+
+        # Marks the region with a node before and a node after it. The markers are not repeated, so they tell
+        # where the items of the region start and end in a built report.
+        self.first_node.parent_node.insert_before(self.create_marker(self.first_node, text + "Start"), self.first_node)
+        self.last_node.parent_node.insert_after(self.create_marker(self.last_node, text + "End"), self.last_node)
+
+    def create_marker(self, node: aw.Node, text: str):
+
+        doc = node.document
+        if self.is_table_rows:
+            row = node.clone(True).as_row()
+            for cell in row.cells:
+                cell = cell.as_cell()
+                cell.remove_all_children()
+                cell.ensure_minimum()
+            row.first_cell.first_paragraph.append_child(aw.Run(doc, text))
+            return row
+
+        paragraph = aw.Paragraph(doc)
+        paragraph.append_child(aw.Run(doc, text))
+        return paragraph
+
+    @staticmethod
+    def find_markers(doc: aw.Document, text: str, is_table_rows: bool):
+
+        markers = {}
+        for paragraph in get_text_paragraphs(doc):
+            paragraph_text = get_paragraph_text(paragraph)
+            if paragraph_text in (text + "Start", text + "End"):
+                markers[paragraph_text] = paragraph.get_ancestor(aw.NodeType.ROW) if is_table_rows else paragraph
+
+        return markers[text + "Start"], markers[text + "End"]
+
+    @staticmethod
+    def get_nodes_between(start_marker: aw.Node, end_marker: aw.Node):
+
+        nodes = []
+        node = start_marker.next_sibling
+        while node is not None and node != end_marker:
+            nodes.append(node)
+            node = node.next_sibling
+
+        return nodes
+
+
+def remove_paragraph_head(paragraph: aw.Paragraph, length: int):
+
+    # Removes the first characters of the runs of a paragraph, for example, a tag the paragraph starts with.
+    for run in paragraph.runs.to_array():
+        if length <= 0:
+            break
+        run = run.as_run()
+        text = run.text
+        run.text = text[length:]
+        length -= len(text)
+        if not run.text:
+            run.remove()
+
+
+def import_part_node(importer: aw.NodeImporter, node: aw.Node, doc: aw.Document):
+
+    # The lists of a part are the lists of the template, the report has them under the same identifiers.
+    # Importing would copy them as new lists, so the paragraphs are linked to the lists of the report instead,
+    # and numbering continues from part to part.
+    paragraphs = [node] if node.node_type == aw.NodeType.PARAGRAPH else node.as_composite_node().get_child_nodes(aw.NodeType.PARAGRAPH, True).to_array()
+    list_items = []
+    for paragraph in paragraphs:
+        list_format = paragraph.as_paragraph().list_format
+        report_list = doc.lists.get_list_by_list_id(list_format.list.list_id) if list_format.is_list_item else None
+        list_items.append((report_list, list_format.list_level_number) if report_list is not None else None)
+        if report_list is not None:
+            list_format.remove_numbers()
+
+    imported_node = importer.import_node(node, True)
+    imported_paragraphs = [imported_node] if imported_node.node_type == aw.NodeType.PARAGRAPH else imported_node.as_composite_node().get_child_nodes(aw.NodeType.PARAGRAPH, True).to_array()
+    for paragraph, list_item in zip(imported_paragraphs, list_items):
+        if list_item is not None:
+            list_format = paragraph.as_paragraph().list_format
+            list_format.list = list_item[0]
+            list_format.list_level_number = list_item[1]
+
+    return imported_node
+
+
+def read_csv_rows(stream, csv_options: dict):
+
+    # Rows are parsed, not split by lines, because quoted values can contain line breaks.
+    lines = (line for line in stream if not line.startswith(csv_options["comment_char"]))
+    return csv.reader(lines, delimiter=csv_options["delimiter"], quotechar=csv_options["quote_char"])
+
+
+def read_csv_shards(rows, shard_size: int):
+
+    # Yields lists of "shard_size" rows, the last one can be shorter. There is one shard at least, even without rows.
+    shard = list(itertools.islice(rows, shard_size))
+    yield shard
+    while len(shard) == shard_size:
+        shard = list(itertools.islice(rows, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def write_csv_rows(rows, csv_options: dict):
+
+    text = io.StringIO()
+    writer = csv.writer(text, delimiter=csv_options["delimiter"], quotechar=csv_options["quote_char"], lineterminator="\n")
+    writer.writerows(rows)
+    return text.getvalue()
+
+
+def get_used_columns(member_paths: MemberPathSet, header: list):
+
+    # Gets the indices of the columns whose members are in "member_paths", or None when all columns are used.
+    # Without headers, columns are named by their positions, such as "Column1", so all of them are kept.
+    if header is None or () in member_paths.whole_paths:
+        return None
+
+    # Rows keep one column at least, so tags such as <<[persons.Count()]>> see all rows.
+    columns = [i for i, name in enumerate(header) if (name.lower(),) in member_paths.prefixes]
+    return columns or [0]
+
+
+def init_report_worker(license_path: str):
+
+    # Every worker process starts its own .NET runtime, the license of the parent process does not apply to it.
+    if license_path is not None:
+        aw.License().set_license(license_path)
+
+
+def build_report_shard(template: bytes, data: bytes, csv_options: dict, data_source_name: str, options: int):
+
+    # Runs in a worker process, so the template, the data and the result are passed as bytes.
+    doc = aw.Document(io.BytesIO(template))
+    engine = aw.reporting.ReportingEngine()
+    engine.options = aw.reporting.ReportBuildOptions(options)
+    engine.build_report(doc, aw.reporting.CsvDataSource(io.BytesIO(data), create_csv_load_options(csv_options)), data_source_name)
+
+    stream = io.BytesIO()
+    doc.save(stream, aw.SaveFormat.DOCX)
+    return stream.getvalue()
+
+
+def build_report_parallel(template_doc: aw.Document, csv_source, data_source_name: str,
+    csv_options: aw.reporting.CsvDataLoadOptions = None, options=aw.reporting.ReportBuildOptions.NONE,
+    shard_size: int = 10000, max_workers: int = None, license_path: str = None):
+
+    # Builds a report from CSV data. The first foreach tag of the template, which repeats table rows or paragraphs,
+    # is built for every shard of "shard_size" rows in a worker process. The rest of the template is built once
+    # for all rows, so totals and other tags outside the foreach tag see all data.
+    # The data is read twice. First, the columns that the tags outside the foreach tag use are copied to a temporary file,
+    # and the rest of the template is built from it. Then the rows are read shard by shard for the workers.
+    # No more than two shards per worker are read ahead, and every part is inserted into the report as soon as
+    # it and the parts before it are built, so only the report itself grows with the number of rows.
+    # "csv_source" is a file name or a seekable binary stream.
+    # The parts are inserted in the order of the shards with the styles and lists of the report,
+    # so numbered lists continue from part to part. Tags inside the foreach tag that use the position of an item,
+    # such as IndexOf, or other items see the items of their shard only.
+    # Workers are new processes, they apply the license from "license_path" before they build their parts.
+    if csv_options is None:
+        csv_options = aw.reporting.CsvDataLoadOptions()
+    csv_options = {"has_headers": csv_options.has_headers, "delimiter": csv_options.delimiter,
+        "quote_char": csv_options.quote_char, "comment_char": csv_options.comment_char}
+    max_workers = max_workers if max_workers is not None else os.cpu_count()
+    start_position = None if isinstance(csv_source, str) else csv_source.tell()
+
+    template = template_doc.clone().as_document()
+    region = ReportRegion.find(template)
+    marker = "ReportShard" + uuid.uuid4().hex
+    region.insert_markers(marker)
+
+    # The workers get a saved copy of the template, the rest of the template is built on this one.
+    template_stream = io.BytesIO()
+    template.clone().as_document().save(template_stream, aw.SaveFormat.DOCX)
+
+    # Of a paragraph band, only the text after the closing tag is kept, its paragraph ends the items.
+    nodes = ReportRegion.get_nodes_between(*ReportRegion.find_markers(template, marker, region.is_table_rows))
+    if not region.is_table_rows:
+        remove_paragraph_head(nodes.pop().as_paragraph(), region.closing_tag_length)
+    for node in nodes:
+        node.remove()
+    member_paths = ReportTemplateCache.create(template).get_member_paths(data_source_name)
+
+    # .NET runtime does not survive a fork, so the workers are always started from scratch.
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers, mp_context=context,
+        initializer=init_report_worker, initargs=(license_path,)) as executor, tempfile.TemporaryFile() as data:
+
+        stream = open_text_stream(csv_source, "")
+        try:
+            rows = read_csv_rows(stream, csv_options)
+            header = next(rows, None) if csv_options["has_headers"] else None
+            columns = get_used_columns(member_paths, header)
+            if header is not None:
+                data.write(write_csv_rows([header if columns is None else [header[i] for i in columns]], csv_options).encode("utf-8"))
+            while True:
+                chunk = list(itertools.islice(rows, shard_size))
+                if not chunk:
+                    break
+                data.write(write_csv_rows(chunk if columns is None else [[row[i] for i in columns if i < len(row)] for row in chunk], csv_options).encode("utf-8"))
+        finally:
+            close_text_stream(csv_source, stream)
+        data.seek(0)
+
+        if start_position is not None:
+            csv_source.seek(start_position)
+        stream = open_text_stream(csv_source, "")
+        try:
+            rows = read_csv_rows(stream, csv_options)
+            if header is not None:
+                next(rows, None)
+            shards = read_csv_shards(rows, shard_size)
+            futures = collections.deque()
+
+            def submit_shard():
+                shard = next(shards, None)
+                if shard is not None:
+                    futures.append(executor.submit(build_report_shard, template_stream.getvalue(),
+                        write_csv_rows(shard if header is None else [header] + shard, csv_options).encode("utf-8"),
+                        csv_options, data_source_name, int(options)))
+
+            for _ in range(2 * max_workers):
+                submit_shard()
+
+            # While the first shards are built, build the rest of the template with all rows.
+            engine = aw.reporting.ReportingEngine()
+            engine.options = options
+            engine.build_report(template, aw.reporting.CsvDataSource(data, create_csv_load_options(csv_options)), data_source_name)
+            start_marker, end_marker = ReportRegion.find_markers(template, marker, region.is_table_rows)
+            next_node = start_marker.next_sibling
+
+            while futures:
+                part = aw.Document(io.BytesIO(futures.popleft().result()))
+                submit_shard()
+                nodes = ReportRegion.get_nodes_between(*ReportRegion.find_markers(part, marker, region.is_table_rows))
+
+                # The paragraph with the text after the closing tag is built from the rows of the shard, the one of the report is kept.
+                if not region.is_table_rows:
+                    nodes.pop()
+
+                importer = aw.NodeImporter(part, template, aw.ImportFormatMode.USE_DESTINATION_STYLES)
+                for node in nodes:
+                    next_node.parent_node.insert_before(import_part_node(importer, node, template), next_node)
+        finally:
+            close_text_stream(csv_source, stream)
+
+    start_marker.remove()
+    end_marker.remove()
+    return template
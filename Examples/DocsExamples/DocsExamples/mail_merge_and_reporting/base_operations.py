@@ -1,5 +1,8 @@
+import sqlite3
+
 import aspose.words as aw
 from docs_examples_base import DocsExamplesBase, MY_DIR, ARTIFACTS_DIR
+from mail_merge_and_reporting import mail_merge_helper as helper
 
 class BaseOperations(DocsExamplesBase):
 
@@ -86,3 +89,87 @@ class BaseOperations(DocsExamplesBase):
 
         return builder.document
     #ExEnd:CreateMailMergeTemplate
+
+    def test_compiled_mail_merge_template(self):
+
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+
+        builder.write("Dear ")
+        builder.insert_field(" MERGEFIELD CustomerName ")
+        builder.writeln(",")
+        builder.write("Your order of ")
+        builder.insert_field(" MERGEFIELD Quantity ")
+        builder.write(" ")
+        builder.insert_field(" MERGEFIELD Item \\* Upper ")
+        builder.writeln(" pizzas is on its way.")
+        builder.insert_field(" MERGEFIELD Coupon \\b \"Your coupon: \" ")
+
+        doc.mail_merge.cleanup_options = aw.mailmerging.MailMergeCleanupOptions.REMOVE_UNUSED_FIELDS
+
+        # Find the merge fields and plan the cleanup once, then merge every record into a clone of the template.
+        template = helper.CompiledMailMergeTemplate.compile(doc)
+
+        field_names = ["CustomerName", "Item", "Quantity"]
+        customers = [["John Doe", "Hawaiian", 2], ["Jane Roe", "Margherita", 1]]
+        for i, field_values in enumerate(customers):
+            merged_doc = template.execute(field_names, field_values)
+
+            # Every record gives the same text as MailMerge.execute on the template.
+            expected_doc = doc.clone().as_document()
+            expected_doc.mail_merge.cleanup_options = aw.mailmerging.MailMergeCleanupOptions.REMOVE_UNUSED_FIELDS
+            expected_doc.mail_merge.execute(field_names, field_values)
+            self.assertEqual(expected_doc.get_text(), merged_doc.get_text())
+
+            merged_doc.save(ARTIFACTS_DIR + f"BaseOperations.compiled_mail_merge_template.{i}.docx")
+
+    def test_streaming_data_source(self):
+
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+
+        builder.insert_field(" MERGEFIELD TableStart:Orders ")
+        builder.write("Order ")
+        builder.insert_field(" MERGEFIELD OrderId ")
+        builder.write(" for ")
+        builder.insert_field(" MERGEFIELD CustomerName ")
+        builder.insert_paragraph()
+        builder.insert_field(" MERGEFIELD TableStart:Items ")
+        builder.insert_field(" MERGEFIELD Quantity ")
+        builder.write(" x ")
+        builder.insert_field(" MERGEFIELD Item ")
+        builder.insert_paragraph()
+        builder.insert_field(" MERGEFIELD TableEnd:Items ")
+        builder.insert_field(" MERGEFIELD TableEnd:Orders ")
+
+        # Orders come from a database cursor, items of each order from a generator.
+        # Rows are fetched in batches of "fetch_size" while the regions are merged, so memory does not grow with the row count.
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE Orders (OrderId INTEGER, CustomerName TEXT)")
+        connection.executemany("INSERT INTO Orders VALUES (?, ?)", [(i, f"Customer {i}") for i in range(1, 21)])
+
+        def get_items(order):
+            return ({"Item": f"Pizza {i}", "Quantity": order["OrderId"] % 3 + 1} for i in range(2))
+
+        data_source = helper.StreamingMailMergeDataSource("Orders", connection.execute("SELECT * FROM Orders"),
+            fetch_size=8, child_sources={"Items": get_items})
+        doc.mail_merge.execute_with_regions(data_source)
+        connection.close()
+
+        self.assertEqual(3, data_source.fetch_count)
+        self.assertEqual(8, data_source.max_batch_size)
+        text = doc.get_text()
+        self.assertEqual(20, text.count("Order "))
+        self.assertIn("Order 20 for Customer 20\r3 x Pizza 0\r\r3 x Pizza 1", text)
+
+        # Column buffers, such as lists or NumPy arrays, are read slice by slice.
+        doc = aw.Document()
+        builder = aw.DocumentBuilder(doc)
+        builder.insert_field(" MERGEFIELD TableStart:Orders ")
+        builder.insert_field(" MERGEFIELD orderid ")
+        builder.insert_paragraph()
+        builder.insert_field(" MERGEFIELD TableEnd:Orders ")
+
+        columns = {"OrderId": list(range(1, 11))}
+        doc.mail_merge.execute_with_regions(helper.StreamingMailMergeDataSourceRoot({"Orders": lambda: columns}, fetch_size=4))
+        self.assertEqual("\r\r".join(str(i) for i in range(1, 11)), doc.get_text().strip())
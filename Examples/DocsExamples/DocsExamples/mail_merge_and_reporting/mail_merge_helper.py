@@ -0,0 +1,309 @@
+import itertools
+
+import aspose.words as aw
+
+# Settings of MailMerge that are copied from the template to every document merged from it.
+MAIL_MERGE_SETTINGS = ["cleanup_options", "cleanup_paragraphs_with_punctuation_marks", "merge_duplicate_regions", "merge_whole_document",
+    "preserve_unused_tags", "region_end_tag", "region_start_tag", "restart_lists_at_each_section", "retain_first_section_start",
+    "trim_whitespaces", "unconditional_merge_fields_and_regions", "use_non_merge_fields", "use_whole_paragraph_as_region",
+    "field_merging_callback", "mail_merge_callback"]
+
+# Cleanup options that are carried out when the slots are filled, without MailMerge.execute.
+SLOT_CLEANUP_OPTIONS = aw.mailmerging.MailMergeCleanupOptions.REMOVE_UNUSED_FIELDS
+
+# Text formats of merge fields that are applied when the slots are filled, without MailMerge.execute.
+SLOT_GENERAL_FORMATS = [aw.fields.GeneralFormat.UPPER, aw.fields.GeneralFormat.LOWER,
+    aw.fields.GeneralFormat.MERGE_FORMAT, aw.fields.GeneralFormat.CHAR_FORMAT]
+
+# Fields that change the course of a mail merge, such as IF or NEXT, and form fields, which are reset by a mail merge,
+# are always merged by MailMerge.execute.
+MAIL_MERGE_FIELD_TYPES = [aw.fields.FieldType.FIELD_IF, aw.fields.FieldType.FIELD_NEXT, aw.fields.FieldType.FIELD_NEXT_IF,
+    aw.fields.FieldType.FIELD_SKIP_IF, aw.fields.FieldType.FIELD_MERGE_REC, aw.fields.FieldType.FIELD_MERGE_SEQ,
+    aw.fields.FieldType.FIELD_MERGE_BARCODE, aw.fields.FieldType.FIELD_ASK, aw.fields.FieldType.FIELD_FILL_IN,
+    aw.fields.FieldType.FIELD_SET, aw.fields.FieldType.FIELD_ADDRESS_BLOCK, aw.fields.FieldType.FIELD_GREETING_LINE,
+    aw.fields.FieldType.FIELD_FORM_TEXT_INPUT, aw.fields.FieldType.FIELD_FORM_CHECK_BOX, aw.fields.FieldType.FIELD_FORM_DROP_DOWN]
+
+REGION_START_PREFIXES = ("TableStart:", "BeginGroup:")
+REGION_END_PREFIXES = ("TableEnd:", "EndGroup:")
+
+
+def get_node_path(node: aw.Node):
+
+    # Indexes of the node and of its ancestors among their siblings, from the document down to the node.
+    path = []
+    while node.parent_node is not None:
+        path.append(node.parent_node.get_child_nodes(aw.NodeType.ANY, False).index_of(node))
+        node = node.parent_node
+    return path[::-1]
+
+
+def get_node_by_path(doc: aw.Document, path):
+
+    node = doc
+    for index in path:
+        node = node.as_composite_node().get_child(aw.NodeType.ANY, index, False)
+    return node
+
+
+class MergeFieldSlot():
+
+    def __init__(self, field_start: aw.fields.FieldStart, field: aw.fields.FieldMergeField):
+
+        # The field is found in a clone of the template by the path to its field start, which is the same in every clone.
+        self.path = get_node_path(field_start)
+        self.field_name = field.field_name
+        self.text_before = field.text_before or ""
+        self.text_after = field.text_after or ""
+        self.general_formats = [general_format for general_format in field.format.general_formats]
+
+
+class CompiledMailMergeTemplate():
+
+    def __init__(self, doc: aw.Document):
+
+        # Mail merge settings are not cloned with the document, so they are kept apart from the template image.
+        self.template = doc.clone().as_document()
+        self.settings = {name: getattr(doc.mail_merge, name) for name in MAIL_MERGE_SETTINGS}
+        self.slots = {}
+        # Names of the merge fields that are merged by MailMerge.execute, for example, fields nested in IF fields.
+        self.executed_field_names = set()
+        self.execute_all = False
+
+    @staticmethod
+    def compile(doc: aw.Document):
+
+        # Find the merge fields, the regions and the cleanup that MailMerge.execute would do, once for all records.
+        # The mail merge settings of the document, such as cleanup options, are taken over by the compiled template.
+        template = CompiledMailMergeTemplate(doc)
+        mail_merge = doc.mail_merge
+
+        # Mustache tags, mapped fields, merging callbacks and most cleanup options need MailMerge.execute for all fields.
+        cleanup_options = mail_merge.cleanup_options
+        template.execute_all = (mail_merge.use_non_merge_fields or mail_merge.merge_whole_document
+            or mail_merge.mapped_data_fields.count > 0 or mail_merge.field_merging_callback is not None
+            or cleanup_options & ~SLOT_CLEANUP_OPTIONS != 0)
+
+        # Walk the field starts and ends in document order to know which fields are nested in other fields.
+        depth = 0
+        open_regions = []
+        for node in template.template.get_child_nodes(aw.NodeType.ANY, True):
+            if node.node_type == aw.NodeType.FIELD_END:
+                depth -= 1
+                continue
+            if node.node_type != aw.NodeType.FIELD_START:
+                continue
+
+            depth += 1
+            field = node.as_field_start().get_field()
+
+            if field.type in MAIL_MERGE_FIELD_TYPES:
+                template.execute_all = template.execute_all or field.type != aw.fields.FieldType.FIELD_IF
+            elif field.type == aw.fields.FieldType.FIELD_MERGE_FIELD:
+                merge_field = field.as_field_merge_field()
+                field_name = merge_field.field_name
+
+                if field_name.startswith(REGION_START_PREFIXES):
+                    # Fields in regions are merged by MailMerge.execute_with_regions, so they are not slots.
+                    open_regions.append(field_name.split(":", 1)[1])
+                elif field_name.startswith(REGION_END_PREFIXES):
+                    if open_regions:
+                        open_regions.pop()
+                elif (depth > 1 or open_regions or merge_field.is_mapped or merge_field.is_vertical_formatting
+                    or field.format.numeric_format or field.format.date_time_format
+                    or any(general_format not in SLOT_GENERAL_FORMATS for general_format in field.format.general_formats)):
+                    template.executed_field_names.add(field_name.lower())
+                else:
+                    slot = MergeFieldSlot(node.as_field_start(), merge_field)
+                    template.slots.setdefault(field_name.lower(), []).append(slot)
+
+        if template.execute_all:
+            for slots in template.slots.values():
+                for slot in slots:
+                    template.executed_field_names.add(slot.field_name.lower())
+            template.slots = {}
+
+        return template
+
+    def execute(self, field_names, field_values):
+
+        # Clone the template image and fill the slots of the record, the fields are not searched for again.
+        doc = self.template.clone().as_document()
+        for name, value in self.settings.items():
+            setattr(doc.mail_merge, name, value)
+
+        # The fields of all slots are found before any of them is changed, the paths are those of the template image.
+        fields = {id(slot): get_node_by_path(doc, slot.path).as_field_start().get_field()
+            for slots in self.slots.values() for slot in slots}
+        executed_names = []
+        executed_values = []
+        merged_keys = set()
+        for field_name, value in zip(field_names, field_values):
+            key = field_name.lower()
+            slots = self.slots.get(key)
+
+            # Values that MailMerge.execute converts to text in its own way are merged by it.
+            if slots and (value is None or isinstance(value, (str, int))) and not (isinstance(value, str) and any(char in value for char in "\r\n\v")):
+                for slot in slots:
+                    self.fill_slot(fields[id(slot)], slot, value)
+            elif slots or self.execute_all or key in self.executed_field_names:
+                executed_names.append(field_name)
+                executed_values.append(value)
+            merged_keys.add(key)
+
+        # Carry out the cleanup of the slots that the record has no value for.
+        remove_unused_fields = self.settings["cleanup_options"] & aw.mailmerging.MailMergeCleanupOptions.REMOVE_UNUSED_FIELDS != 0
+        if remove_unused_fields:
+            for key, slots in self.slots.items():
+                if key not in merged_keys:
+                    for slot in slots:
+                        fields[id(slot)].remove()
+
+        # Only the fields that are not slots are left to MailMerge.execute.
+        if executed_names or self.execute_all or remove_unused_fields and self.executed_field_names:
+            doc.mail_merge.execute(executed_names, executed_values)
+
+        return doc
+
+    def execute_with_regions(self, data_source):
+
+        # Regions are merged by MailMerge.execute_with_regions on a clone of the template image.
+        doc = self.template.clone().as_document()
+        for name, value in self.settings.items():
+            setattr(doc.mail_merge, name, value)
+
+        doc.mail_merge.execute_with_regions(data_source)
+        return doc
+
+    def fill_slot(self, field: aw.fields.Field, slot: MergeFieldSlot, value):
+
+        text = "" if value is None else str(value)
+        if self.settings["trim_whitespaces"]:
+            text = text.strip()
+
+        # The text before and after the field is only inserted when the field is not empty.
+        if text:
+            text = slot.text_before + text + slot.text_after
+
+        for general_format in slot.general_formats:
+            if general_format == aw.fields.GeneralFormat.UPPER:
+                text = text.upper()
+            elif general_format == aw.fields.GeneralFormat.LOWER:
+                text = text.lower()
+
+        field.result = text
+        field.unlink()
+
+
+def fetch_batches(source, fetch_size: int):
+
+    # A DB-API cursor, such as sqlite3.Cursor, returns the rows of a query in batches itself.
+    if hasattr(source, "fetchmany"):
+        columns = [column[0] for column in source.description]
+        while True:
+            rows = source.fetchmany(fetch_size)
+            if not rows:
+                return
+            yield [dict(zip(columns, row)) for row in rows]
+
+    # An Arrow table is cut into record batches of no more than "fetch_size" rows.
+    elif hasattr(source, "to_batches"):
+        for batch in source.to_batches(max_chunksize=fetch_size):
+            yield batch.to_pylist()
+
+    # A dictionary of column buffers, such as lists or NumPy arrays, is read slice by slice.
+    # NumPy values are converted to Python values, which can be passed to Aspose.Words.
+    elif isinstance(source, dict):
+        names = list(source)
+        row_count = len(source[names[0]]) if names else 0
+        for start in range(0, row_count, fetch_size):
+            columns = [source[name][start:start + fetch_size] for name in names]
+            columns = [column.tolist() if hasattr(column, "tolist") else column for column in columns]
+            yield [dict(zip(names, values)) for values in zip(*columns)]
+
+    # Any other source is an iterable of dictionaries, for example, a generator that reads a CSV file.
+    else:
+        rows = iter(source)
+        while True:
+            batch = list(itertools.islice(rows, fetch_size))
+            if not batch:
+                return
+            yield batch
+
+
+class StreamingMailMergeDataSource(aw.mailmerging.IMailMergeDataSource):
+
+    def __init__(self, table_name: str, source, fetch_size: int = 1000, child_sources: dict = None):
+
+        aw.mailmerging.IMailMergeDataSource.__init__(self)
+        self.name = table_name
+        self.fetch_size = fetch_size
+        # Functions that return the source of a nested region for the current row of this region.
+        self.child_sources = {name.lower(): get_source for name, get_source in (child_sources or {}).items()}
+        self.fetch_count = 0
+        self.max_batch_size = 0
+
+        # Only one batch of rows is held in memory, the next one is fetched when the mail merge moves past it.
+        self.batches = fetch_batches(source, fetch_size)
+        self.batch = []
+        self.position = 0
+        self.row = None
+        self.names = {}
+
+    @property
+    def table_name(self):
+
+        return self.name
+
+    def move_next(self):
+
+        self.position += 1
+        if self.position >= len(self.batch):
+            self.batch = next(self.batches, [])
+            self.position = 0
+            if not self.batch:
+                self.row = None
+                return False
+
+            self.fetch_count += 1
+            self.max_batch_size = max(self.max_batch_size, len(self.batch))
+            # Merge field names are not case-sensitive.
+            self.names = {name.lower(): name for name in self.batch[0]}
+
+        self.row = self.batch[self.position]
+        return True
+
+    def get_value(self, field_name: str, field_value):
+
+        # The value is returned through the first item of "field_value".
+        name = field_name if field_name in self.row else self.names.get(field_name.lower())
+        if name is None or name not in self.row:
+            return False
+
+        field_value[0] = self.row[name]
+        return True
+
+    def get_child_data_source(self, table_name: str):
+
+        get_source = self.child_sources.get(table_name.lower())
+        if get_source is None:
+            return None
+
+        return StreamingMailMergeDataSource(table_name, get_source(self.row), self.fetch_size)
+
+
+class StreamingMailMergeDataSourceRoot(aw.mailmerging.IMailMergeDataSourceRoot):
+
+    def __init__(self, sources: dict, fetch_size: int = 1000):
+
+        aw.mailmerging.IMailMergeDataSourceRoot.__init__(self)
+        # Functions that return the source of each top-level region. A source is opened only when its region is merged.
+        self.sources = {name.lower(): get_source for name, get_source in sources.items()}
+        self.fetch_size = fetch_size
+
+    def get_data_source(self, table_name: str):
+
+        get_source = self.sources.get(table_name.lower())
+        if get_source is None:
+            return None
+
+        return StreamingMailMergeDataSource(table_name, get_source(), self.fetch_size)
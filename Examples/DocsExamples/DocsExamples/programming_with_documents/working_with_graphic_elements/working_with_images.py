@@ -12,14 +12,16 @@ class WorkingWithImages(DocsExamplesBase):
 
         # Images in a document are added to paragraphs to add an image to every page we need
         # to find at any paragraph belonging to each page.
-        for page in range(1, doc.page_count):
-            for para in doc.first_section.body.paragraphs:
-                para = para.as_paragraph()
+        # Collect the first paragraph of each page in a single pass, instead of looking through
+        # all paragraphs again for every page.
+        first_paragraphs = {}
+        for para in doc.first_section.body.paragraphs:
+            para = para.as_paragraph()
+            first_paragraphs.setdefault(layout_collector.get_start_page_index(para), para)
 
-                # Check if the current paragraph belongs to the target page.
-                if layout_collector.get_start_page_index(para) == page:
-                    self.add_image_to_page(para, page, IMAGES_DIR)
-                    break
+        for page in range(1, doc.page_count):
+            if page in first_paragraphs:
+                self.add_image_to_page(first_paragraphs[page], page, IMAGES_DIR)
 
         # If we need to save the document as a PDF or image, call UpdatePageLayout() method.
         doc.update_page_layout()